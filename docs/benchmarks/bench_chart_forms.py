@@ -0,0 +1,106 @@
+# Benchmark: drawing the report's bar and line charts with their chrome as form XObjects
+#
+#   python docs/benchmarks/bench_chart_forms.py [--reports 50] [--repeat 3] [--compress-level N] [--check-pixels]
+#
+# Draws --reports documents, each holding the report's membership bar chart
+# and composition line chart with slightly different data (as in a batch of
+# reports), then one document holding every chart of the batch (a chart
+# repeated with different data). Charts are drawn as plain flattened drawings
+# (every shape serialized every time) and as chrome and mark layers
+# (winners_circle/chart_forms.py: chrome serialized once per process and made
+# a form where it repeats in a document). Charts are built before timing, as
+# the chart cache would hand them over, so the times are PDF serialization
+# only. --compress-level passes the documents through the output optimizer
+# before measuring their size; --check-pixels renders every page with PyMuPDF
+# and compares the two.
+import argparse
+import io
+import os
+import sys
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+import numpy as np
+from reportlab.pdfgen.canvas import Canvas
+
+from winners_circle import chart_forms
+from winners_circle.chart_forms import flatten_drawing, layer_drawing
+from winners_circle.optimize import optimize_pdf
+from winners_circle.theme import PRIMARY_COLOR, SECONDARY_COLOR
+from common import load_generator
+
+YEARS = ['Year 1', 'Year 2', 'Year 3', 'Year 4']
+
+
+# The bar and line chart of each report, the baseline numbers varied by up to 3%
+def sample_charts(generator, reports):
+    rng = np.random.default_rng(0)
+    members = np.array([64, 153, 235, 310])
+    upgrades = np.array([40, 85, 120, 150])
+    conversions = np.array([24, 68, 115, 160])
+    scale = lambda values: [int(value) for value in values * rng.uniform(0.97, 1.03, len(values))]
+    return [[generator.create_bar_chart([scale(members)], YEARS, [PRIMARY_COLOR], bar_label_format='%s'),
+             generator.create_line_chart([scale(upgrades), scale(conversions)], YEARS,
+                                         [PRIMARY_COLOR, SECONDARY_COLOR], ['Circle', 'FilledSquare'],
+                                         ['Upgrades from Existing Members', 'New Conversions'])]
+            for _ in range(reports)]
+
+
+def document(drawings):
+    target = io.BytesIO()
+    canv = Canvas(target)
+    for drawing in drawings:
+        drawing.drawOn(canv, 50, 450)
+        canv.showPage()
+    canv.save()
+    return target.getvalue()
+
+
+# Seconds per document and the documents drawn, starting from an empty chrome cache
+def draw(documents):
+    chart_forms._serialized.clear()
+    started = time.perf_counter()
+    pdfs = [document(drawings) for drawings in documents]
+    return (time.perf_counter() - started) / len(documents), pdfs
+
+
+def pixels(pdfs):
+    try:
+        import pymupdf
+    except ImportError:
+        raise ImportError("--check-pixels requires PyMuPDF (pip install pymupdf)") from None
+    return [page.get_pixmap(dpi=60).samples for pdf in pdfs for page in pymupdf.open(stream=pdf)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark chart chrome drawn as form XObjects')
+    parser.add_argument('--reports', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compress-level', type=int, choices=range(10), metavar='0-9',
+                        help='Measure sizes after the output optimizer at this level')
+    parser.add_argument('--check-pixels', action='store_true', help='Check that both modes render identically')
+    args = parser.parse_args()
+
+    charts = sample_charts(load_generator(), args.reports)
+    modes = {'flattened': flatten_drawing, 'layered': layer_drawing}
+    size = len
+    if args.compress_level is not None:
+        size = lambda pdf: len(optimize_pdf(pdf, level=args.compress_level)[0])
+    print(f"{args.reports} reports of {len(charts[0])} charts")
+    print(f"{'mode':<11}{'batch':>16}{'bytes/report':>14}{'one document':>15}{'bytes':>10}")
+    results = {}
+    for mode, prepare in modes.items():
+        reports = [[prepare(chart) for chart in report] for report in charts]
+        combined = [[chart for report in reports for chart in report]]
+        batch_seconds, batch = min((draw(reports) for _ in range(args.repeat)), key=lambda run: run[0])
+        combined_seconds, single = min((draw(combined) for _ in range(args.repeat)), key=lambda run: run[0])
+        results[mode] = batch + single
+        print(f"{mode:<11}{batch_seconds * 1000:>9.2f} ms/doc{sum(map(size, batch)) / len(batch):>14,.0f}"
+              f"{combined_seconds * 1000:>12.1f} ms{size(single[0]):>10,}")
+
+    if args.check_pixels:
+        same = pixels(results['flattened']) == pixels(results['layered'])
+        print("Both modes render identically" if same else "DIFFERENT")
+        sys.exit(0 if same else 1)
@@ -0,0 +1,31 @@
+# Benchmark: cohort retention and lifetime value over a large synthetic member population
+#
+#   python docs/benchmarks/bench_cohorts.py [--members 100000 500000 1000000] [--quarters 16]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from winners_circle.cohorts import synthetic_members, cohort_analysis, WINNERS_CIRCLE, TRADITIONAL
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the cohort/LTV engine')
+    parser.add_argument('--members', type=int, nargs='+', default=[100_000, 500_000, 1_000_000],
+                        help='Members per tier')
+    parser.add_argument('--quarters', type=int, default=16)
+    args = parser.parse_args()
+
+    for members in args.members:
+        started = time.perf_counter()
+        population = synthetic_members(members=members, quarters=args.quarters)
+        sampled = time.perf_counter() - started
+        started = time.perf_counter()
+        cohorts = cohort_analysis(population, horizon=args.quarters)
+        analysed = time.perf_counter() - started
+        total = len(population['join'])
+        member_ltv = cohorts['segments'][(WINNERS_CIRCLE, None)]['expected_ltv']
+        traditional_ltv = cohorts['segments'][(TRADITIONAL, None)]['expected_ltv']
+        print(f"{total:>9,} members: sampled in {sampled:.2f}s, analysed in {analysed:.2f}s "
+              f"({total / analysed / 1e6:.1f}M members/s); LTV ${member_ltv:,.0f} vs ${traditional_ltv:,.0f}")
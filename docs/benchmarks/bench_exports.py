@@ -0,0 +1,102 @@
+# Benchmark: JSON, XLSX and PDF exports of one projection, alone and together
+#
+#   python docs/benchmarks/bench_exports.py [--repeat 5] [--years 4] [--rows 200000]
+#
+# Times each format on its own (the JSON bundle and the XLSX workbook written
+# from a fresh projection, the PDF report as usual) and the report with both
+# data exports attached, which shares its projection with them. --rows then
+# streams a synthetic monthly-style sheet of that many rows through the XLSX
+# writer and reports its speed and the peak memory traced while writing,
+# which stays flat because rows are compressed into the file as they come.
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+import numpy as np
+
+from winners_circle.exports import write_exports
+from winners_circle.projections import project, resolve_assumptions, scenario
+from winners_circle.xlsx import StreamingWorkbook
+from common import load_generator
+
+
+def fastest(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+# A data export on its own: project the assumptions, then write the one format
+def export_alone(name, years):
+    def run():
+        inputs = {key: float(values[0]) for key, values in resolve_assumptions(None).items()}
+        model = scenario(project(None, months=years * 12))
+        write_exports({name: io.BytesIO()}, model, inputs, years)
+    return run
+
+
+# Write the columns as one sheet into a temporary file; returns the bytes written
+def stream_rows(columns):
+    with tempfile.TemporaryFile() as target:
+        with StreamingWorkbook(target) as book:
+            with book.sheet('Monthly') as sheet:
+                sheet.append(['Month', 'Year', 'Revenue', 'Costs', 'Net Cash Flow', 'Cumulative Cash Flow'], 'header')
+                sheet.append_columns(columns, [None, None] + ['currency'] * 4)
+        return target.tell()
+
+
+# Seconds and bytes for one timed run, then the peak memory traced in a second run (tracing slows it down);
+# the input columns exist before tracing starts, so the peak is the writer's own
+def measure_stream(rows):
+    months = np.arange(1, rows + 1)
+    columns = [months, (months - 1) // 12 + 1] + list(np.random.default_rng(0).uniform(0, 100_000, (4, rows)).round(2))
+    started = time.perf_counter()
+    size = stream_rows(columns)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    stream_rows(columns)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the data exports against the PDF')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--years', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=200_000, help='Rows for the streaming XLSX sheet (0 skips it)')
+    args = parser.parse_args()
+
+    generator = load_generator()
+    report = lambda **options: generator.create_winners_circle_report(io.BytesIO(), years=args.years, **options)
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        report()
+        times = {
+            'json': fastest(export_alone('json', args.years), args.repeat),
+            'xlsx': fastest(export_alone('xlsx', args.years), args.repeat),
+            'pdf': fastest(report, args.repeat),
+            'pdf+json+xlsx': fastest(lambda: report(exports={'json': io.BytesIO(), 'xlsx': io.BytesIO()}),
+                                     args.repeat),
+        }
+        sys.stdout = stdout
+
+    slowest = max(times['json'], times['xlsx'], times['pdf'])
+    for name, seconds in times.items():
+        print(f"{name:<15}{seconds * 1000:9.1f} ms")
+    print(f"All formats cost {times['pdf+json+xlsx'] / slowest - 1:+.1%} over the slowest single format")
+
+    if args.rows:
+        elapsed, size, peak = measure_stream(args.rows)
+        print(f"Streamed {args.rows:,} XLSX rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s), "
+              f"{size / 1024 / 1024:.1f} MiB written, {peak / 1024 / 1024:.1f} MiB peak traced memory")
@@ -0,0 +1,49 @@
+# Benchmark: rendering N matplotlib charts to in-memory buffers on 1, 4 and 16 workers
+#
+#   python docs/benchmarks/bench_figures.py [--charts 64] [--workers 1 4 16] [--format png|svg]
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from winners_circle.figures import render_charts
+
+
+def sample_specs(charts, output_format):
+    rng = np.random.default_rng(0)
+    months = np.arange(1, 49)
+    specs = []
+    for _ in range(charts):
+        revenue = np.cumsum(rng.uniform(5_000, 20_000, len(months)))
+        specs.append({
+            'x': months,
+            'series': [
+                {'y': revenue, 'color': '#0284c7', 'label': 'Revenue'},
+                {'y': revenue * rng.uniform(0.3, 0.6), 'color': '#0ea5e9', 'label': 'Costs', 'linestyle': '--'},
+            ],
+            'title': 'Monthly Revenue and Costs',
+            'xlabel': 'Month',
+            'xticks': list(range(0, 49, 6)),
+            'y_format': 'dollars',
+            'format': output_format,
+        })
+    return specs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark parallel chart rendering')
+    parser.add_argument('--charts', type=int, default=64)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--format', choices=['png', 'svg'], default='png')
+    args = parser.parse_args()
+
+    specs = sample_specs(args.charts, args.format)
+    print(f"{os.cpu_count()} CPUs, {args.charts} {args.format.upper()} charts")
+    for workers in args.workers:
+        result = render_charts(specs, workers=workers)
+        size = sum(len(image) for image in result['images'])
+        print(f"{workers:>3} workers: {result['elapsed']:6.2f}s ({args.charts / result['elapsed']:6.1f} charts/s), "
+              f"{size / 1024:,.0f} KiB rendered")
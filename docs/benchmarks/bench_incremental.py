@@ -0,0 +1,72 @@
+# Benchmark and self-check: incremental report rebuilds after a single-assumption change
+#
+#   python docs/benchmarks/bench_incremental.py [--repeat 3] [--monthly]
+#
+# For each tweak the report is built cold (empty build and chart caches, in
+# a process that has already imported everything), then the baseline is
+# built and the tweaked report rebuilt against the warm caches. The rebuilt
+# PDF must be byte-identical to the cold build of the same assumptions
+# (reportlab's invariant mode removes timestamps and IDs); the script exits
+# non-zero otherwise. Every build still lays out and writes all pages, which
+# sets the floor for a rebuild.
+import argparse
+import os
+import sys
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from reportlab import rl_config
+
+from winners_circle.build_graph import BuildGraph, configure_build_cache
+from winners_circle.chart_cache import configure_chart_cache
+from common import load_generator
+
+TWEAKS = [
+    {'accommodation_rate': 350},
+    {'operating_cost': 95000},
+    {'retention_rate': 0.90},
+    {'ongoing_conversion_rate': 0.012},
+]
+
+
+def build(generator, assumptions, monthly):
+    graph = BuildGraph(version=generator.report_version())
+    started = time.perf_counter()
+    pdf = bytes(generator.render_report(assumptions=assumptions, monthly_detail=monthly, build_graph=graph))
+    return pdf, time.perf_counter() - started, graph
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark incremental report rebuilds')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--monthly', action='store_true')
+    args = parser.parse_args()
+
+    rl_config.invariant = 1
+    generator = load_generator()
+    build(generator, None, args.monthly)  # warm imports, styles and the report plan
+    ok = True
+    for tweak in TWEAKS:
+        cold = []
+        for _ in range(args.repeat):
+            configure_build_cache()
+            configure_chart_cache()
+            expected, seconds, _ = build(generator, tweak, args.monthly)
+            cold.append(seconds)
+        rebuilt = []
+        for _ in range(args.repeat):
+            configure_build_cache()
+            configure_chart_cache()
+            build(generator, None, args.monthly)
+            pdf, seconds, graph = build(generator, tweak, args.monthly)
+            rebuilt.append(seconds)
+        same = pdf == expected
+        ok &= same
+        nodes_seconds = sum(graph.seconds[name] for name in graph.recomputed)
+        name, value = next(iter(tweak.items()))
+        print(f"{name}={value}: cold {min(cold) * 1000:6.0f} ms, rebuild {min(rebuilt) * 1000:6.0f} ms "
+              f"({min(rebuilt) / min(cold):.0%}), {'identical' if same else 'DIFFERENT OUTPUT'}")
+        print(f"  {graph.summary()} ({nodes_seconds * 1000:.0f} ms in recomputed nodes)")
+    sys.exit(0 if ok else 1)
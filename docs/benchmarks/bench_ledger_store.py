@@ -0,0 +1,79 @@
+# Benchmark: group-by-member and group-by-quarter over a memory-mapped columnar ledger
+#
+#   python docs/benchmarks/bench_ledger_store.py [--rows 50000000] [--members 100000] [--dir PATH]
+#
+# The store is written in chunks to a temporary directory (about 18 bytes a
+# row) unless --dir names an existing store to reuse. A pure-Python pass over
+# --python-rows dict rows is timed for comparison and extrapolated.
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from winners_circle.ledger_store import LedgerStore, synthetic_columns
+from common import peak_rss_mb
+
+
+def build_store(directory, rows, members, chunk_size=5_000_000):
+    store = LedgerStore.create(directory)
+    store.register_members(f"WC{member:06d}" for member in range(members))
+    for seed, start in enumerate(range(0, rows, chunk_size)):
+        store.append_columns(*synthetic_columns(min(chunk_size, rows - start), members=members, seed=seed))
+    return store
+
+
+def python_group_by(store, rows):
+    member, kind, cents = (store.column(name)[:rows].tolist() for name in ('member', 'kind', 'amount_cents'))
+    started = time.perf_counter()
+    totals = defaultdict(lambda: [0, 0])
+    for code, kind_code, amount in zip(member, kind, cents):
+        totals[code][kind_code] += amount
+    return time.perf_counter() - started
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the columnar ledger store')
+    parser.add_argument('--rows', type=int, default=50_000_000)
+    parser.add_argument('--members', type=int, default=100_000)
+    parser.add_argument('--python-rows', type=int, default=1_000_000)
+    parser.add_argument('--dir', type=str, help='Reuse (or keep) the store in this directory')
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix='ledger-store-')
+    try:
+        if os.path.exists(os.path.join(directory, 'meta.json')):
+            store = LedgerStore(directory)
+            print(f"Reusing {store.rows:,} rows in {directory}")
+        else:
+            store, seconds = timed(lambda: build_store(directory, args.rows, args.members))
+            print(f"Wrote {store.rows:,} rows in {seconds:.1f}s ({store.rows / seconds / 1e6:.1f}M rows/s)")
+        store = LedgerStore(directory)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"Store size {size / 1024 ** 3:.2f} GiB, RSS before aggregation {peak_rss_mb():.0f} MB")
+
+        members, seconds = timed(store.by_member)
+        print(f"by_member:  {seconds:6.2f}s ({store.rows / seconds / 1e6:5.1f}M rows/s), "
+              f"{len(members['member_ids']):,} members, {members['balance'].sum():,.0f} outstanding")
+        quarters, seconds = timed(store.by_quarter)
+        print(f"by_quarter: {seconds:6.2f}s ({store.rows / seconds / 1e6:5.1f}M rows/s), "
+              f"{len(quarters['quarters'])} quarters")
+        print(f"Peak RSS {peak_rss_mb():.0f} MB (includes file-backed pages of the memory-mapped columns)")
+
+        python_rows = min(args.python_rows, store.rows)
+        seconds = python_group_by(store, python_rows)
+        print(f"Pure-Python group-by over {python_rows:,} rows: {seconds:.2f}s "
+              f"(~{seconds * store.rows / python_rows:.0f}s extrapolated to {store.rows:,} rows)")
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory)
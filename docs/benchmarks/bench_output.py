@@ -0,0 +1,84 @@
+# Benchmark: serving a report by writing a temp file and reading it back vs. rendering to memory
+#
+#   python docs/benchmarks/bench_output.py [--repeat 10] [--monthly]
+#
+# Each mode runs in its own process so peak RSS is measured independently.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from common import load_generator, peak_rss_mb
+
+
+# Each mode returns the number of PDF bytes a handler would send
+def serve_file(generator, options):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'report.pdf')
+        generator.create_winners_circle_report(path, **options)
+        with open(path, 'rb') as f:
+            return len(f.read())
+
+
+def serve_buffer(generator, options):
+    return len(generator.render_report(**options))
+
+
+def serve_chunks(generator, options):
+    return sum(len(chunk) for chunk in generator.iter_report(**options))
+
+
+MODES = {'file': serve_file, 'buffer': serve_buffer, 'chunks': serve_chunks}
+
+
+def run_mode(mode, repeat, options):
+    generator = load_generator()
+    # One warm-up render so imports, fonts and styles are not part of the timings
+    MODES[mode](generator, options)
+    baseline_mb = peak_rss_mb()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = MODES[mode](generator, options)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        'mode': mode,
+        'bytes': size,
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'min_ms': timings[0] * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline_mb,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark file vs. in-memory report output')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--monthly', action='store_true', help='Include the monthly detail section')
+    parser.add_argument('--mode', choices=sorted(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    options = {'monthly_detail': args.monthly}
+
+    if args.mode:
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            result = run_mode(args.mode, args.repeat, options)
+            sys.stdout = stdout
+        print(json.dumps(result))
+        sys.exit(0)
+
+    for mode in ('file', 'buffer', 'chunks'):
+        command = [sys.executable, __file__, '--mode', mode, '--repeat', str(args.repeat)]
+        if args.monthly:
+            command.append('--monthly')
+        result = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+        print(f"{mode:>6}: {result['bytes'] / 1024:,.0f} KiB, p50 {result['p50_ms']:.0f} ms "
+              f"(min {result['min_ms']:.0f} ms), peak RSS {result['peak_rss_mb']:.0f} MB "
+              f"(+{result['peak_rss_mb'] - result['baseline_rss_mb']:.1f} MB over warm-up)")
@@ -0,0 +1,87 @@
+# Benchmark: PDF size against build time for each output compression level
+#
+#   python docs/benchmarks/bench_pdf_size.py [--repeat 3] [--levels 0 1 6 9] [--monthly]
+#                                            [--brand-font REGULAR.ttf ...] [--check-pixels]
+#
+# Builds the report with reportlab's own compression and then with
+# compression_level set to each of --levels, which writes the PDF
+# uncompressed and hands it to the output optimizer (winners_circle/optimize.py),
+# and prints bytes, bytes per page, the total build time and the part of it
+# spent optimizing (the 'optimize' profiler phase). --monthly adds the
+# matplotlib figures (images); --brand-font embeds TrueType brand faces.
+# --check-pixels renders every page of every variant with PyMuPDF and
+# compares it with reportlab's output, to confirm the optimizer only changed
+# how the file is stored.
+import argparse
+import io
+import os
+import sys
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from winners_circle.optimize import page_count
+from winners_circle.profiler import start_profiling, stop_profiling
+from winners_circle.theme import register_brand_fonts
+from common import load_generator
+
+
+# The PDF, its build seconds and the seconds spent optimizing it
+def render(generator, options, level):
+    target = io.BytesIO()
+    profiler = start_profiling(trace_allocations=False)
+    started = time.perf_counter()
+    try:
+        generator.create_winners_circle_report(target, compression_level=level, **options)
+    finally:
+        stop_profiling()
+    elapsed = time.perf_counter() - started
+    return target.getvalue(), elapsed, dict(profiler.totals('phase')).get('optimize', 0) / 1000
+
+
+def fastest(generator, options, level, repeat):
+    return min((render(generator, options, level) for _ in range(repeat)), key=lambda run: run[1])
+
+
+def pixels(pdf):
+    try:
+        import pymupdf
+    except ImportError:
+        raise ImportError("--check-pixels requires PyMuPDF (pip install pymupdf)") from None
+    return [page.get_pixmap(dpi=60).samples for page in pymupdf.open(stream=pdf)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark PDF size and build time per compression level')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--levels', type=int, nargs='+', choices=range(10), default=[0, 1, 6, 9])
+    parser.add_argument('--monthly', action='store_true', help='Include the monthly figures')
+    parser.add_argument('--brand-font', type=str, nargs='+', metavar='TTF', help='REGULAR [BOLD [ITALIC]]')
+    parser.add_argument('--check-pixels', action='store_true', help='Check that every variant renders identically')
+    args = parser.parse_args()
+
+    generator = load_generator()
+    if args.brand_font:
+        register_brand_fonts(*args.brand_font)
+    options = {'monthly_detail': args.monthly}
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        render(generator, options, None)
+        variants = [('reportlab', fastest(generator, options, None, args.repeat))]
+        variants += [(f'level {level}', fastest(generator, options, level, args.repeat)) for level in args.levels]
+        sys.stdout = stdout
+
+    reference = variants[0][1][0]
+    pages = page_count(reference)
+    print(f"{pages} pages")
+    print(f"{'output':<12}{'bytes':>11}{'bytes/page':>12}{'size':>9}{'build':>11}{'optimize':>11}")
+    for name, (pdf, seconds, optimizing) in variants:
+        print(f"{name:<12}{len(pdf):>11,}{len(pdf) / pages:>12,.0f}{len(pdf) / len(reference) - 1:>+9.1%}"
+              f"{seconds * 1000:>8.0f} ms{optimizing * 1000:>8.0f} ms")
+
+    if args.check_pixels:
+        expected = pixels(reference)
+        different = [name for name, (pdf, _, _) in variants[1:] if pixels(pdf) != expected]
+        print("Every variant renders identically" if not different else "DIFFERENT: " + ", ".join(different))
+        sys.exit(1 if different else 0)
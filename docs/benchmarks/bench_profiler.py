@@ -0,0 +1,71 @@
+# Benchmark: cost of the --profile instrumentation, on and off
+#
+#   python docs/benchmarks/bench_profiler.py [--repeat 5]
+#
+# Times warm report builds (charts and nodes recomputed, imports and styles
+# already loaded) with profiling off, with timing-only profiling and with
+# allocation tracing, and measures what a disabled span() costs per call.
+# With profiling off the instrumentation amounts to one span() call per
+# recorded span, so its overhead is the call cost times the span count.
+import argparse
+import os
+import sys
+import time
+import timeit
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from winners_circle.build_graph import BuildGraph, configure_build_cache
+from winners_circle.chart_cache import configure_chart_cache
+from winners_circle.profiler import span, start_profiling, stop_profiling
+from common import load_generator
+
+
+def build(generator):
+    configure_build_cache()
+    configure_chart_cache()
+    generator.render_report(build_graph=BuildGraph(version=generator.report_version()))
+
+
+def best_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def profiled(generator, trace_allocations):
+    start_profiling(trace_allocations=trace_allocations)
+    try:
+        build(generator)
+    finally:
+        profiler = stop_profiling()
+    return profiler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the profiler overhead')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    generator = load_generator()
+    build(generator)
+    spans = len(profiled(generator, False).events)
+    off_ms = best_ms(lambda: build(generator), args.repeat)
+    timing_ms = best_ms(lambda: profiled(generator, False), args.repeat)
+    memory_ms = best_ms(lambda: profiled(generator, True), max(1, args.repeat // 2))
+
+    def disabled():
+        with span('noop', 'bench'):
+            pass
+    calls = 200_000
+    span_ns = timeit.timeit(disabled, number=calls) / calls * 1e9
+
+    print(f"profiling off:       {off_ms:7.1f} ms per report")
+    print(f"timing only:         {timing_ms:7.1f} ms ({timing_ms / off_ms - 1:+.1%})")
+    print(f"timing + allocation: {memory_ms:7.1f} ms ({memory_ms / off_ms - 1:+.1%})")
+    print(f"disabled span(): {span_ns:.0f} ns per call x {spans} spans = "
+          f"{span_ns * spans / 1e6:.3f} ms per report ({span_ns * spans / 1e6 / off_ms:.3%})")
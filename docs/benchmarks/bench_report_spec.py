@@ -0,0 +1,88 @@
+# Benchmark: building the spec-driven report sections from scratch vs. from the compiled plan
+#
+#   python docs/benchmarks/bench_report_spec.py [--repeat 50] [--years 4] [--no-chart-cache]
+#
+# "Rebuilt" compiles the spec for every report, so every paragraph is parsed
+# and every static chart drawn again; "compiled" reuses one plan and only
+# evaluates the data-bound blocks. Both lay the flowables out on a page, as a
+# real build would.
+import argparse
+import io
+import os
+import sys
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from winners_circle import report_spec
+from winners_circle.chart_cache import configure_chart_cache
+from winners_circle.projections import project, resolve_assumptions, scenario
+from common import load_generator
+
+
+def growth_context(years):
+    inputs = {name: float(values[0]) for name, values in resolve_assumptions(None).items()}
+    model = scenario(project(None, months=years * 12))
+    return {
+        'year_labels': [f'Year {year}' for year in range(1, years + 1)],
+        'upgrade_rate': [inputs['initial_upgrade_rate']] + [inputs['ongoing_upgrade_rate']] * (years - 1),
+        'conversion_rate': [inputs['initial_conversion_rate']] + [inputs['ongoing_conversion_rate']] * (years - 1),
+        'upgrades': model['upgrades'],
+        'conversions': model['conversions'],
+        'new_members': model['new_members'],
+        'members': model['members'],
+        'member_counts': [round(n) for n in model['members']],
+        'cumulative_upgrades': [round(n) for n in model['upgrades'].cumsum()],
+        'cumulative_conversions': [round(n) for n in model['conversions'].cumsum()],
+        'retention_rate': inputs['retention_rate'],
+    }
+
+
+def render_all(plan, context):
+    width, height = letter[0] - 1.5 * 72, letter[1] - 1.5 * 72
+    page = canvas.Canvas(io.BytesIO(), pagesize=letter)
+    flowables = []
+    for section in plan.sections:
+        flowables += plan.render(section, context if section == 'growth' else None)
+    for flowable in flowables:
+        flowable.wrapOn(page, width, height)
+    return len(flowables)
+
+
+def per_report_ms(function, repeat):
+    function()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the compiled report spec')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--years', type=int, default=4)
+    parser.add_argument('--no-chart-cache', action='store_true', help='Redraw every chart each time it is built')
+    args = parser.parse_args()
+
+    generator = load_generator()
+    spec = report_spec.load_spec(report_spec.DEFAULT_SPEC)
+    context = growth_context(args.years)
+
+    # Without --no-chart-cache both modes share the in-memory chart cache, as report builds do
+    if args.no_chart_cache:
+        configure_chart_cache(max_items=0)
+
+    def rebuilt():
+        return render_all(report_spec.compile_spec(spec, generator.REPORT_CHARTS), context)
+
+    plan = report_spec.compile_spec(spec, generator.REPORT_CHARTS)
+    stats = plan.stats()
+    print(f"{stats['sections']} sections, {stats['blocks']} blocks: {stats['static']} static, {stats['bound']} bound")
+    rebuilt_ms = per_report_ms(rebuilt, args.repeat)
+    compiled_ms = per_report_ms(lambda: render_all(plan, context), args.repeat)
+    print(f"rebuilt per report:  {rebuilt_ms:7.2f} ms")
+    print(f"compiled per report: {compiled_ms:7.2f} ms ({rebuilt_ms / compiled_ms:.1f}x faster)")
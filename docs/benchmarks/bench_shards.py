@@ -0,0 +1,70 @@
+# Benchmark: writing the dashboard's data shards, from scratch and when regenerating
+#
+#   python docs/benchmarks/bench_shards.py [--repeat 20] [--simulate 10000]
+#
+# Writes the content-hashed shards (winners_circle/shards.py) for the baseline
+# projection into an empty directory, then regenerates them unchanged, then
+# with a different annual fee (which moves revenue and ROI but not membership
+# growth), and prints the time per regeneration, how many shards each wrote,
+# and every shard's size raw and precompressed. --simulate adds the scenario
+# bands shard from that many Monte Carlo scenarios.
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from winners_circle.exports import data_bundle
+from winners_circle.projections import project, resolve_assumptions, scenario
+from winners_circle.shards import available_encodings, write_shards
+from winners_circle.simulation import simulate
+
+
+def bundle(assumptions, simulation):
+    inputs = {name: float(values[0]) for name, values in resolve_assumptions(assumptions).items()}
+    return data_bundle(scenario(project(assumptions, months=48)), inputs, 4, simulation)
+
+
+# Mean seconds per write_shards() call and the last call's result, each call in a copy of directory's state
+def regenerate(directory, data, repeat):
+    elapsed = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as copy:
+            shutil.copytree(directory, copy, dirs_exist_ok=True)
+            started = time.perf_counter()
+            result = write_shards(copy, data)
+            elapsed += time.perf_counter() - started
+    return elapsed / repeat, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark writing content-hashed data shards')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--simulate', type=int, default=10_000, help='Scenarios for the bands shard (0 leaves it out)')
+    args = parser.parse_args()
+
+    simulation = simulate(args.simulate, seed=0) if args.simulate else None
+    baseline = bundle(None, simulation)
+    changed = bundle({'annual_fee': 2100}, simulation)
+    print(f"Encodings: {', '.join(available_encodings())}")
+    with tempfile.TemporaryDirectory() as empty, tempfile.TemporaryDirectory() as current:
+        write_shards(current, baseline)
+        for name, directory, data in (('first write', empty, baseline), ('unchanged', current, baseline),
+                                      ('new annual fee', current, changed)):
+            seconds, result = regenerate(directory, data, args.repeat)
+            print(f"{name:<16}{seconds * 1000:7.2f} ms  {len(result['written'])} written "
+                  f"({', '.join(result['written']) or 'none'}), {len(result['unchanged'])} unchanged")
+
+        with tempfile.TemporaryDirectory() as sizes:
+            write_shards(sizes, baseline)
+            print(f"{'shard':<22}{'bytes':>8}" + ''.join(f"{encoding:>8}" for encoding in available_encodings()))
+            for name in sorted(os.listdir(os.path.join(sizes, 'shards'))):
+                if name.endswith('.json'):
+                    path = os.path.join(sizes, 'shards', name)
+                    compressed = [os.path.getsize(path + suffix) for suffix in ('.gz', '.br')
+                                  if os.path.exists(path + suffix)]
+                    print(f"{name.split('.')[0]:<22}{os.path.getsize(path):>8,}"
+                          + ''.join(f"{size:>8,}" for size in compressed))
@@ -0,0 +1,96 @@
+# Benchmark: CLI start-up, import time and time to first PDF, cold and through the warm server
+#
+#   python docs/benchmarks/bench_startup.py [--repeat 3] [--generator PATH] [--no-server]
+#
+# Every measurement is a new `python winners-circle-report-generator.py ...`
+# process timed from the outside:
+#
+#   --help        parse the command line and exit
+#   imports       sum of the top-level entries of `python -X importtime ... --help`
+#   first PDF     render the default report
+#   warm server   render the default report through `--server`, with a
+#                 `--serve` process (started once, not timed) already running
+#
+# --generator points at another copy of the generator, e.g. an older revision
+# (`git show REV:docs/winners-circle-report-generator.py > old.py`), to
+# compare before and after; the server is skipped when that copy has no
+# --serve option.
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+DOCS = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+GENERATOR = os.path.join(DOCS, 'winners-circle-report-generator.py')
+IMPORT_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| (\s*)\S')
+
+
+def environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = DOCS + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def best_seconds(command, repeat, cwd):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, cwd=cwd, env=environment(), stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+# Cumulative microseconds of the modules imported at top level (nested imports are counted inside them)
+def import_seconds(generator, cwd):
+    run = subprocess.run([sys.executable, '-X', 'importtime', generator, '--help'], check=True, cwd=cwd,
+                         env=environment(), capture_output=True, text=True)
+    total = 0
+    for line in run.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(2):
+            total += int(match.group(1))
+    return total / 1e6
+
+
+def supports_server(generator, cwd):
+    usage = subprocess.run([sys.executable, generator, '--help'], check=True, cwd=cwd, env=environment(),
+                           capture_output=True, text=True).stdout
+    return '--serve' in usage
+
+
+def server_seconds(generator, repeat, cwd):
+    socket_path = os.path.join(cwd, 'server.sock')
+    server = subprocess.Popen([sys.executable, generator, '--serve', socket_path], cwd=cwd, env=environment(),
+                              stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 60
+        while not os.path.exists(socket_path):
+            if server.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("The report server did not start")
+            time.sleep(0.05)
+        return best_seconds([sys.executable, generator, '--server', socket_path, '--output', 'served.pdf'],
+                            repeat, cwd)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark CLI start-up and time to first PDF')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--generator', type=str, default=GENERATOR)
+    parser.add_argument('--no-server', action='store_true', help='Skip the warm server measurement')
+    args = parser.parse_args()
+    generator = os.path.abspath(args.generator)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"--help:       {best_seconds([sys.executable, generator, '--help'], args.repeat, tmp) * 1000:7.0f} ms")
+        print(f"imports:      {import_seconds(generator, tmp) * 1000:7.0f} ms (for --help)")
+        first = best_seconds([sys.executable, generator, '--output', 'report.pdf'], args.repeat, tmp)
+        print(f"first PDF:    {first * 1000:7.0f} ms")
+        if not args.no_server and supports_server(generator, tmp):
+            served = server_seconds(generator, args.repeat, tmp)
+            print(f"warm server:  {served * 1000:7.0f} ms ({first / served:.1f}x faster)")
@@ -0,0 +1,30 @@
+# Benchmark: per-member statements rendered from a synthetic ledger into a ZIP archive
+#
+#   python docs/benchmarks/bench_statements.py [--members 10000] [--rows-per-member 24] [--workers 1 4]
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from winners_circle.appendix import synthetic_ledger_rows
+from winners_circle.statements import render_statements
+
+TARGET_PER_CORE = 50
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark member statement rendering')
+    parser.add_argument('--members', type=int, default=10_000)
+    parser.add_argument('--rows-per-member', type=int, default=24)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    for workers in sorted(set(args.workers)):
+        ledger = synthetic_ledger_rows(args.members * args.rows_per_member, rows_per_member=args.rows_per_member)
+        archive = io.BytesIO()
+        run = render_statements(ledger, archive, workers=workers)
+        per_core = run['throughput'] / min(workers, os.cpu_count() or 1)
+        print(f"{workers:>3} workers: {run['statements']:,} statements in {run['elapsed']:.1f}s "
+              f"({run['throughput']:.0f}/s, {per_core:.0f}/s per core, target {TARGET_PER_CORE}), "
+              f"ZIP {archive.tell() / 1024 / 1024:.1f} MiB")
@@ -0,0 +1,70 @@
+# Benchmark: member ledger appendix built from a list vs. streamed from a generator
+#
+#   python docs/benchmarks/bench_streaming.py [--rows 100000]
+#
+# Each mode runs in its own process so peak RSS is measured independently.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from common import peak_rss_mb
+
+
+def run_mode(mode, rows):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
+    from winners_circle.appendix import member_ledger_flowables, synthetic_ledger_rows
+    from winners_circle.streaming import build_streaming
+    from winners_circle.theme import get_styles
+
+    styles = get_styles()
+    baseline_mb = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'ledger.pdf')
+        doc = SimpleDocTemplate(output, pagesize=letter, rightMargin=0.75*inch, leftMargin=0.75*inch,
+                                topMargin=0.75*inch, bottomMargin=0.75*inch)
+        started = time.perf_counter()
+        flowables = member_ledger_flowables(synthetic_ledger_rows(rows), styles)
+        if mode == 'list':
+            doc.build(list(flowables))
+        else:
+            build_streaming(doc, flowables)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(output)
+    return {
+        'mode': mode,
+        'rows': rows,
+        'pages': doc.page,
+        'seconds': elapsed,
+        'pages_per_second': doc.page / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline_mb,
+        'bytes': size,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark streaming ledger appendix builds')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--mode', choices=['list', 'stream'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.rows)))
+        sys.exit(0)
+
+    for mode in ('list', 'stream'):
+        out = subprocess.run([sys.executable, __file__, '--mode', mode, '--rows', str(args.rows)],
+                             check=True, capture_output=True, text=True).stdout
+        result = json.loads(out)
+        print(f"{mode:>6}: {result['rows']:,} rows, {result['pages']:,} pages in {result['seconds']:.1f}s "
+              f"({result['pages_per_second']:.0f} pages/s), peak RSS {result['peak_rss_mb']:.0f} MB "
+              f"(+{result['peak_rss_mb'] - result['baseline_rss_mb']:.0f} MB over baseline)")
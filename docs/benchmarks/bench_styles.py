@@ -0,0 +1,54 @@
+# Micro-benchmark: per-report style setup cost, rebuilt every time vs. the shared theme registry
+#
+#   python docs/benchmarks/bench_styles.py [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from winners_circle import theme
+
+# The table styles one report sets up, as (factory, args, kwargs)
+REPORT_TABLE_STYLES = [
+    (theme.toc_table_style, (), {}),
+    (theme.data_table_style, (), {'header_font_size': 11, 'header_padding': 10}),
+    (theme.data_table_style, (), {'total_column': True}),
+    (theme.resource_table_style, (), {}),
+    (theme.timeline_table_style, (), {}),
+    (theme.data_table_style, (), {}),
+    (theme.data_table_style, ('RIGHT',), {'total_row': True}),
+    (theme.data_table_style, ('RIGHT',), {'total_row': True}),
+]
+
+
+def setup_uncached():
+    theme.build_stylesheet()
+    for factory, args, kwargs in REPORT_TABLE_STYLES:
+        factory.__wrapped__(*args, **kwargs)
+
+
+def setup_cached():
+    theme.get_styles()
+    for factory, args, kwargs in REPORT_TABLE_STYLES:
+        factory(*args, **kwargs)
+
+
+def per_call_us(function, repeat):
+    function()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark per-report style setup')
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    before = per_call_us(setup_uncached, args.repeat)
+    after = per_call_us(setup_cached, args.repeat)
+    print(f"Style setup per report, rebuilt: {before:9.1f} us")
+    print(f"Style setup per report, cached:  {after:9.1f} us  ({before / after:,.0f}x faster)")
@@ -0,0 +1,278 @@
+# Benchmark suite for report generation, with a baseline and regression thresholds
+#
+#   python docs/benchmarks/bench_suite.py [--repeat 3] [--cases cold warm ...] [--output results.json]
+#                                         [--baseline FILE] [--save-baseline] [--threshold 10]
+#                                         [--memory-threshold 10]
+#
+# Cases:
+#
+#   cold         import the generator and render one report in a new process
+#   warm         one report in a process that has already rendered one
+#                (imports, fonts, styles and the report plan loaded; build and
+#                chart caches emptied, so every section and chart is rebuilt)
+#   batch        --batch-size reports through the --batch worker pool, each
+#                with a different annual fee
+#   appendix     one report with a --appendix-rows member ledger appendix
+#   projection   micro: one 48-month projection
+#   tables       micro: build and lay out the financial appendix tables
+#   chart        micro: draw the membership bar chart (reportlab)
+#   chart_png    micro: render the revenue line chart to PNG (matplotlib)
+#
+# Every case runs --repeat times, each in a fresh process so its peak RSS is
+# its own (for the batch, the largest of the parent and its workers); the
+# median time and the median peak RSS are kept. Results are written as JSON
+# together with the environment they were measured in. Cases import what
+# they need themselves, so the cold case pays for every import.
+#
+# With a baseline (by default benchmarks/baseline.json, written by
+# --save-baseline on the machine that runs the suite) the script exits
+# non-zero when any case is more than --threshold percent slower or uses more
+# than --memory-threshold percent more peak memory. Baselines are only
+# comparable on the same machine and library versions, which the results
+# record.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+sys.path.insert(0, DOCS)
+
+from common import load_generator, peak_rss_mb
+
+
+def fresh_caches():
+    from winners_circle.build_graph import configure_build_cache
+    from winners_circle.chart_cache import configure_chart_cache
+    configure_build_cache()
+    configure_chart_cache()
+
+
+# Each case returns the seconds it measured (per operation for micro-benchmarks)
+def case_cold(options):
+    started = time.perf_counter()
+    generator = load_generator()
+    generator.render_report()
+    return time.perf_counter() - started
+
+
+def case_warm(options):
+    generator = load_generator()
+    generator.render_report()
+    fresh_caches()
+    started = time.perf_counter()
+    generator.render_report()
+    return time.perf_counter() - started
+
+
+def case_batch(options):
+    from winners_circle.batch import run_batch
+    generator = load_generator()
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [{'output': os.path.join(tmp, f'report-{number}.pdf'),
+                 'assumptions': {'annual_fee': 1500 + 10 * number}}
+                for number in range(options['batch_size'])]
+        started = time.perf_counter()
+        batch = run_batch(generator.create_winners_circle_report, jobs, workers=options['workers'],
+                          warmup=generator.warm_report)
+        elapsed = time.perf_counter() - started
+    if batch['failed']:
+        raise RuntimeError(f"{batch['failed']} batch reports failed")
+    return elapsed
+
+
+def case_appendix(options):
+    from winners_circle.appendix import synthetic_ledger_rows
+    generator = load_generator()
+    started = time.perf_counter()
+    generator.render_report(ledger=synthetic_ledger_rows(options['appendix_rows']))
+    return time.perf_counter() - started
+
+
+# Mean seconds per call over at least min_seconds of calls, after one warm-up call
+def per_call(function, min_seconds=0.5):
+    function()
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def case_projection(options):
+    from winners_circle.projections import project
+    return per_call(lambda: project(None, months=48))
+
+
+def case_tables(options):
+    import io
+    from reportlab.pdfgen import canvas
+    from winners_circle.projections import project, resolve_assumptions, scenario
+    generator = load_generator()
+    inputs = {name: float(values[0]) for name, values in resolve_assumptions(None).items()}
+    model = scenario(project(None, months=48))
+    page = canvas.Canvas(io.BytesIO())
+
+    def build():
+        for flowable in generator.financial_appendix(4, inputs['beyond_credit_rate'], model):
+            flowable.wrapOn(page, 7 * 72, 9.5 * 72)
+    return per_call(build)
+
+
+def case_chart(options):
+    from winners_circle.theme import PRIMARY_COLOR
+    generator = load_generator()
+    labels = ['Year 1', 'Year 2', 'Year 3', 'Year 4']
+    return per_call(lambda: generator.create_bar_chart([[100, 180, 240, 290]], labels, [PRIMARY_COLOR]))
+
+
+def case_chart_png(options):
+    from winners_circle.figures import render_chart
+    generator = load_generator()
+    spec = generator.revenue_chart_spec((159360, 380970, 585150, 771900))
+    return per_call(lambda: render_chart(spec), min_seconds=2)
+
+
+CASES = {
+    'cold': case_cold,
+    'warm': case_warm,
+    'batch': case_batch,
+    'appendix': case_appendix,
+    'projection': case_projection,
+    'tables': case_tables,
+    'chart': case_chart,
+    'chart_png': case_chart_png,
+}
+
+
+def package_version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=DOCS, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'packages': {name: package_version(name) for name in ('reportlab', 'numpy', 'matplotlib', 'pyarrow')},
+        'commit': commit,
+    }
+
+
+def run_case(name, options):
+    command = [sys.executable, __file__, '--case', name, '--batch-size', str(options['batch_size']),
+               '--appendix-rows', str(options['appendix_rows'])]
+    if options['workers']:
+        command += ['--workers', str(options['workers'])]
+    return json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+# Cases slower or heavier than the baseline by more than the thresholds (in percent)
+def regressions(results, baseline, threshold, memory_threshold):
+    found = []
+    for name, result in results['cases'].items():
+        before = baseline['cases'].get(name)
+        if before is None:
+            continue
+        for metric, limit in (('seconds', threshold), ('peak_rss_mb', memory_threshold)):
+            change = (result[metric] / before[metric] - 1) * 100
+            if change > limit:
+                found.append((name, metric, change))
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the report generation benchmark suite')
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3, help='Processes per case; the median is kept')
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--appendix-rows', type=int, default=20_000, help='Ledger rows in the appendix case')
+    parser.add_argument('--workers', type=int, help='Worker processes for the batch case (defaults to the CPU count)')
+    parser.add_argument('--output', type=str, help='Write the results to this JSON file')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed slowdown per case, in percent')
+    parser.add_argument('--memory-threshold', type=float, default=10.0,
+                        help='Allowed peak memory growth per case, in percent')
+    parser.add_argument('--case', choices=sorted(CASES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    options = {'batch_size': args.batch_size, 'appendix_rows': args.appendix_rows, 'workers': args.workers}
+
+    if args.case:
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            seconds = CASES[args.case](options)
+            sys.stdout = stdout
+        print(json.dumps({'seconds': seconds, 'peak_rss_mb': peak_rss_mb(children=True)}))
+        sys.exit(0)
+
+    results = {'environment': environment(), 'options': options, 'repeat': args.repeat, 'cases': {}}
+    for name in args.cases:
+        runs = [run_case(name, options) for _ in range(args.repeat)]
+        results['cases'][name] = {
+            'seconds': median([run['seconds'] for run in runs]),
+            'peak_rss_mb': median([run['peak_rss_mb'] for run in runs]),
+            'runs': runs,
+        }
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'case':<12}{'time':>12}{'baseline':>12}{'change':>9}{'peak RSS':>12}{'baseline':>12}{'change':>9}")
+    for name, result in results['cases'].items():
+        before = baseline['cases'].get(name) if baseline else None
+        line = f"{name:<12}{result['seconds'] * 1000:>9.2f} ms"
+        line += (f"{before['seconds'] * 1000:>9.2f} ms{(result['seconds'] / before['seconds'] - 1):>+9.1%}"
+                 if before else f"{'':>21}")
+        line += f"{result['peak_rss_mb']:>9.1f} MB"
+        if before:
+            line += f"{before['peak_rss_mb']:>9.1f} MB{(result['peak_rss_mb'] / before['peak_rss_mb'] - 1):>+9.1%}"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        sys.exit(0)
+
+    found = regressions(results, baseline, args.threshold, args.memory_threshold)
+    for name, metric, change in found:
+        limit = args.threshold if metric == 'seconds' else args.memory_threshold
+        print(f"REGRESSION: {name} {metric} {change:+.1f}% (limit {limit:+.0f}%)")
+    sys.exit(1 if found else 0)
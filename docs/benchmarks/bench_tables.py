@@ -0,0 +1,63 @@
+# Benchmark: laying out large projection tables with reportlab's Table vs. ArrayTable
+#
+#   python docs/benchmarks/bench_tables.py [--rows 5000 50000 ...] [--table-max 10000]
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table
+
+from winners_circle.formatting import count, currency
+from winners_circle.tables import ArrayTable
+from winners_circle.theme import data_table_style
+
+HEADER = ["Month", "Members", "Revenue", "Costs", "Cumulative Cash Flow"]
+FORMATS = [str, count, currency, currency, currency]
+
+
+def sample_columns(rows):
+    rng = np.random.default_rng(0)
+    months = np.arange(1, rows + 1)
+    revenue = rng.uniform(10_000, 60_000, rows)
+    costs = rng.uniform(5_000, 9_000, rows)
+    return [months, rng.integers(50, 900, rows), revenue, costs, np.cumsum(revenue - costs)]
+
+
+def build(flowable):
+    started = time.perf_counter()
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=letter)
+    doc.build([flowable])
+    return time.perf_counter() - started, doc.page
+
+
+def array_table(columns):
+    return ArrayTable(HEADER, columns, formats=FORMATS)
+
+
+def reportlab_table(columns):
+    rows = [HEADER] + [[format_value(column[i]) for column, format_value in zip(columns, FORMATS)]
+                       for i in range(len(columns[0]))]
+    return Table(rows, repeatRows=1, style=data_table_style('RIGHT'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark large table layout')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 5000, 10000, 50000])
+    parser.add_argument('--table-max', type=int, default=10000,
+                        help='Largest row count to try with reportlab Table')
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        columns = sample_columns(rows)
+        for name, factory in (('ArrayTable', array_table), ('Table', reportlab_table)):
+            if name == 'Table' and rows > args.table_max:
+                continue
+            seconds, pages = build(factory(columns))
+            print(f"{name:>10}: {rows:>7,} rows, {pages:>5,} pages in {seconds:7.2f}s "
+                  f"({rows / seconds / 1000:6.1f}k rows/s)")
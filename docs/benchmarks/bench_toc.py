@@ -0,0 +1,106 @@
+# Benchmark: cost of the automatic table of contents, outline and links
+#
+#   python docs/benchmarks/bench_toc.py [--repeat 10] [--copies 3] [--max-overhead 0.30]
+#
+# The report's fixed sections (concept, implementation, recommendations) are
+# repeated --copies times behind a title and TOC page, then built three ways:
+#
+#   static     SimpleDocTemplate and a hand-written TOC table, as before
+#   automatic  ReportDocTemplate and TableOfContents (winners_circle/toc.py):
+#              one layout pass, page numbers written as forms at the end
+#   two-pass   reportlab's stock TableOfContents with multiBuild, which lays
+#              the whole document out again until the page numbers settle
+#
+# The script exits non-zero when the automatic TOC adds more than
+# --max-overhead to the static build time.
+import argparse
+import io
+import os
+import sys
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents as TwoPassContents
+
+from winners_circle.theme import get_styles, toc_table_style
+from winners_circle.toc import HEADING_LEVELS, ReportDocTemplate, TableOfContents, collect_toc_entries
+from common import load_generator
+
+MARGINS = dict(pagesize=letter, rightMargin=0.75*inch, leftMargin=0.75*inch, topMargin=0.75*inch,
+               bottomMargin=0.75*inch)
+
+
+class TwoPassTemplate(SimpleDocTemplate):
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and HEADING_LEVELS.get(flowable.style.name) == 0:
+            self.notify('TOCEntry', (0, flowable.getPlainText(), self.page))
+
+
+def body(generator, copies):
+    elements = []
+    for _ in range(copies):
+        elements += generator.club_concept()
+        elements += generator.implementation_strategy()
+        elements += generator.key_recommendations()
+    return elements
+
+
+def front(toc):
+    styles = get_styles()
+    return [Paragraph("Table of Contents", styles['Heading2']), Spacer(1, 0.2*inch), toc, PageBreak()]
+
+
+def build_static(generator, copies):
+    elements = body(generator, copies)
+    titles = [flowable.getPlainText() for flowable in elements
+              if isinstance(flowable, Paragraph) and flowable.style.name == 'Heading2']
+    table = Table([[title, str(page)] for page, title in enumerate(titles, 2)], colWidths=[5*inch, 0.5*inch])
+    table.setStyle(toc_table_style())
+    SimpleDocTemplate(io.BytesIO(), **MARGINS).build(front(table) + elements)
+
+
+def build_automatic(generator, copies):
+    elements = front(TableOfContents()) + body(generator, copies)
+    collect_toc_entries(elements)
+    ReportDocTemplate(io.BytesIO(), **MARGINS).build(elements)
+
+
+def build_two_pass(generator, copies):
+    TwoPassTemplate(io.BytesIO(), **MARGINS).multiBuild(front(TwoPassContents()) + body(generator, copies))
+
+
+# Best time per build in ms; the builds take turns so background load affects each alike
+def best_ms(functions, repeat):
+    timings = {name: [] for name in functions}
+    for _ in range(repeat + 1):
+        for name, function in functions.items():
+            started = time.perf_counter()
+            function()
+            timings[name].append(time.perf_counter() - started)
+    return {name: min(values[1:]) * 1000 for name, values in timings.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the automatic table of contents')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--copies', type=int, default=3, help='Times the fixed sections are repeated')
+    parser.add_argument('--max-overhead', type=float, default=0.30)
+    args = parser.parse_args()
+
+    generator = load_generator()
+    best = best_ms({
+        'static': lambda: build_static(generator, args.copies),
+        'automatic': lambda: build_automatic(generator, args.copies),
+        'two-pass': lambda: build_two_pass(generator, args.copies),
+    }, args.repeat)
+    static_ms, automatic_ms, two_pass_ms = best['static'], best['automatic'], best['two-pass']
+    overhead = automatic_ms / static_ms - 1
+    print(f"static TOC:    {static_ms:7.1f} ms")
+    print(f"automatic TOC: {automatic_ms:7.1f} ms ({overhead:+.1%}, outline and links included)")
+    print(f"two-pass TOC:  {two_pass_ms:7.1f} ms ({two_pass_ms / static_ms - 1:+.1%})")
+    sys.exit(0 if overhead <= args.max_overhead else 1)
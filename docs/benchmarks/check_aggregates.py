@@ -0,0 +1,82 @@
+# Self-check and timing: incremental ledger aggregates vs. a full recompute
+#
+#   python docs/benchmarks/check_aggregates.py [--rows 5000000] [--batches 10] [--members 50000]
+#
+# Appends synthetic transactions in batches, refreshing the incremental
+# aggregates after each one, then appends late-arriving corrections dated in
+# earlier years (reversed grants and refunded redemptions) and checks after
+# every step that the incremental actuals equal a full recompute and that the
+# quarterly and per-member totals equal a scan of the store. Exits non-zero
+# on any mismatch.
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from winners_circle.aggregates import IncrementalAggregates, full_recompute, verify
+from winners_circle.ledger_store import LedgerStore, synthetic_columns
+
+
+# Reverse a random sample of existing rows with negative amounts on their original dates
+def late_corrections(store, count, seed):
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(store.rows, size=min(count, store.rows), replace=False))
+    columns = [np.asarray(store.column(name)[rows]) for name in ('member', 'day', 'kind', 'category')]
+    amount_cents = -np.asarray(store.column('amount_cents')[rows])
+    return (*columns, amount_cents)
+
+
+def check(aggregates, label):
+    started = time.perf_counter()
+    mismatched = verify(aggregates)
+    elapsed = time.perf_counter() - started
+    status = 'OK' if not mismatched else 'MISMATCH in ' + ', '.join(mismatched)
+    print(f"  {label}: {status} (full recompute {elapsed:.2f}s)")
+    return not mismatched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check incremental aggregates against a full recompute and store scans')
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--batches', type=int, default=10)
+    parser.add_argument('--members', type=int, default=50_000)
+    parser.add_argument('--corrections', type=int, default=100_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='ledger-aggregates-')
+    ok = True
+    try:
+        store = LedgerStore.create(directory)
+        store.register_members(f"WC{member:06d}" for member in range(args.members))
+        aggregates = IncrementalAggregates(store)
+        batch = args.rows // args.batches
+        for number in range(args.batches):
+            store.append_columns(*synthetic_columns(batch, members=args.members, seed=number))
+            started = time.perf_counter()
+            new_rows = aggregates.refresh()
+            print(f"batch {number + 1}: folded {new_rows:,} new rows in {time.perf_counter() - started:.2f}s "
+                  f"({store.rows:,} total)")
+        ok &= check(aggregates, 'after batches')
+
+        store.append_columns(*late_corrections(store, args.corrections, seed=args.batches))
+        started = time.perf_counter()
+        new_rows = aggregates.refresh()
+        print(f"corrections: folded {new_rows:,} back-dated rows in {time.perf_counter() - started:.2f}s")
+        ok &= check(aggregates, 'after late corrections')
+
+        # State persisted next to the store picks up where it left off
+        reopened = IncrementalAggregates(LedgerStore(directory))
+        print(f"reopened at watermark {reopened.watermark:,}; {reopened.refresh():,} rows to fold")
+        ok &= check(reopened, 'after reopening')
+
+        actuals = full_recompute(store).actuals()
+        print("members per year:", dict(zip(actuals['years'], actuals['members'].tolist())))
+    finally:
+        shutil.rmtree(directory)
+    sys.exit(0 if ok else 1)
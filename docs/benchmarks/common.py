@@ -0,0 +1,29 @@
+# Helpers shared by the benchmark scripts
+#
+# The scripts run as `python docs/benchmarks/<script>.py`, which puts this
+# directory on sys.path, so they import these with `from common import ...`.
+import importlib.util
+import os
+import resource
+import sys
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+# The report generator script as a module, registered so worker processes can unpickle its render function
+def load_generator():
+    spec = importlib.util.spec_from_file_location('report_generator',
+                                                  os.path.join(DOCS, 'winners-circle-report-generator.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Peak resident memory of this process so far; with children=True, or of its largest finished child process
+def peak_rss_mb(children=False):
+    # ru_maxrss is reported in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / 1024
@@ -0,0 +1,63 @@
+# Load test: many concurrent clients requesting reports from the async service
+#
+#   python docs/benchmarks/load_service.py [--requests 200] [--concurrency 32] [--variants 20] [--workers N]
+#
+# Requests cycle through --variants distinct club names, so concurrent
+# requests for the same report exercise in-flight deduplication.
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+DOCS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DOCS)
+
+from winners_circle.service import ReportService, StubClient
+from common import load_generator
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))]
+
+
+async def run(args):
+    generator = load_generator()
+    service = ReportService(generator.create_winners_circle_report, workers=args.workers, max_queue=args.max_queue)
+    async with service:
+        client = StubClient(service)
+        latencies = []
+        failures = 0
+        limit = asyncio.Semaphore(args.concurrency)
+
+        async def one(number):
+            nonlocal failures
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    await client.render(club_name=f"Winners Circle Club {number % args.variants}")
+                except RuntimeError:
+                    failures += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(number) for number in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        stats = service.stats()
+
+    latencies.sort()
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {service.workers} workers, "
+          f"queue bound {args.max_queue}")
+    print(f"  rendered {stats['done']} reports ({stats['deduplicated']} requests deduplicated), {failures} failed")
+    print(f"  latency p50 {percentile(latencies, 50) * 1000:.0f} ms, p99 {percentile(latencies, 99) * 1000:.0f} ms")
+    print(f"  {args.requests / elapsed:.1f} requests/s, {stats['done'] / elapsed:.1f} renders/s over {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load-test the async report service')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--variants', type=int, default=20)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--max-queue', type=int, default=64)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The winners_circle package lives beside the generator script in docs/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
@@ -0,0 +1,145 @@
+# Incremental ledger aggregates against totals worked out by hand
+import numpy as np
+import pytest
+
+from winners_circle.aggregates import IncrementalAggregates
+from winners_circle.ledger_store import LedgerStore
+
+
+def rows(*entries):
+    return [dict(zip(('member_id', 'date', 'kind', 'category', 'amount'), entry)) for entry in entries]
+
+
+# Two years of activity: A is a member both years and overspends the 2024 credit, B only joins in 2023 Q2
+FIRST_BATCH = rows(
+    ('A', '2023-01-10', 'grant', 'Quarterly credit', 500.00),
+    ('A', '2023-02-20', 'redemption', 'Wine', 120.00),
+    ('B', '2023-04-05', 'grant', 'Quarterly credit', 500.00),
+    ('B', '2023-05-01', 'redemption', 'Staatsburg House', 300.00),
+    ('A', '2024-01-10', 'grant', 'Quarterly credit', 500.00),
+    ('A', '2024-03-01', 'redemption', 'Dining', 650.00),
+)
+
+# B's Staatsburg House stay is refunded on its original date, in a period that is already folded,
+# and C joins in 2024 Q3
+SECOND_BATCH = rows(
+    ('B', '2023-05-01', 'redemption', 'Staatsburg House', -300.00),
+    ('C', '2024-07-01', 'grant', 'Quarterly credit', 500.00),
+    ('C', '2024-08-15', 'redemption', 'Events', 80.00),
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LedgerStore.create(str(tmp_path / 'ledger'))
+    store.append_rows(FIRST_BATCH)
+    return store
+
+
+def assert_fields(found, expected):
+    for name, value in expected.items():
+        np.testing.assert_array_equal(np.asarray(found[name]), np.asarray(value), err_msg=name)
+
+
+def test_actuals_by_year(store):
+    aggregates = IncrementalAggregates(store)
+    assert aggregates.refresh() == 6
+    assert_fields(aggregates.actuals(), {
+        'years': [2023, 2024],
+        'members': [2, 1],
+        'starting_members': [0, 2],
+        'new_members': [2, 0],
+        'retained': [0, 1],
+        'attrition': [0, 1],
+        'net_new': [2, -1],
+        'credits_granted': [1000.0, 500.0],
+        'credits_redeemed': [420.0, 650.0],
+        'beyond_credit_spend': [0.0, 150.0],
+        'accommodation_revenue': [300.0, 0.0],
+        'cohort_size': [2, 0],
+        'cohort_retention': [[1.0, 0.5], [np.nan, np.nan]],
+    })
+
+
+def test_quarters_and_members(store):
+    aggregates = IncrementalAggregates(store)
+    aggregates.refresh()
+    assert_fields(aggregates.by_quarter(), {
+        'quarters': ['2023 Q1', '2023 Q2', '2024 Q1'],
+        'active_members': [1, 1, 1],
+        'granted': [500.0, 500.0, 500.0],
+        'redeemed': [120.0, 300.0, 650.0],
+    })
+    assert_fields(aggregates.by_member(), {
+        'member_ids': ['A', 'B'],
+        'granted': [1000.0, 500.0],
+        'redeemed': [770.0, 300.0],
+        'balance': [230.0, 200.0],
+        'transactions': [4, 2],
+    })
+
+
+def test_back_dated_correction_lands_in_its_folded_period(store):
+    aggregates = IncrementalAggregates(store)
+    aggregates.refresh()
+    store.append_rows(SECOND_BATCH)
+    assert aggregates.refresh() == 3
+    assert aggregates.watermark == 9
+
+    staatsburg = store.categories.index('Staatsburg House')
+    actuals = aggregates.actuals()
+    assert_fields(actuals, {
+        'years': [2023, 2024],
+        'members': [2, 2],
+        'new_members': [2, 1],
+        'attrition': [0, 1],
+        'net_new': [2, 0],
+        'credits_granted': [1000.0, 1000.0],
+        'credits_redeemed': [120.0, 730.0],
+        'beyond_credit_spend': [0.0, 150.0],
+        'accommodation_revenue': [0.0, 0.0],
+        'cohort_size': [2, 1],
+        # Years before a cohort joined count as 0; the report prints them as a dash
+        'cohort_retention': [[1.0, 0.5], [0.0, 1.0]],
+    })
+    assert actuals['redeemed_by_category'][0, staatsburg] == 0
+    quarterly = aggregates.by_quarter()
+    assert_fields(quarterly, {
+        'quarters': ['2023 Q1', '2023 Q2', '2024 Q1', '2024 Q3'],
+        'active_members': [1, 1, 1, 1],
+        'granted': [500.0, 500.0, 500.0, 500.0],
+        'redeemed': [120.0, 0.0, 650.0, 80.0],
+    })
+    assert quarterly['redeemed_by_category'][1, staatsburg] == 0
+    assert_fields(aggregates.by_member(), {
+        'member_ids': ['A', 'B', 'C'],
+        'granted': [1000.0, 500.0, 500.0],
+        'redeemed': [770.0, 0.0, 80.0],
+        'balance': [230.0, 500.0, 420.0],
+        'transactions': [4, 3, 2],
+    })
+
+
+def test_saved_state_resumes_at_the_watermark(store):
+    IncrementalAggregates(store).refresh()
+    store.append_rows(SECOND_BATCH)
+    reopened = IncrementalAggregates(LedgerStore(store.directory))
+    assert reopened.watermark == 6
+    assert reopened.refresh() == 3
+    assert_fields(reopened.by_member(), {'balance': [230.0, 500.0, 420.0]})
+
+
+def test_rebuilt_store_discards_saved_state(store, tmp_path):
+    IncrementalAggregates(store).refresh()
+    saved = (tmp_path / 'ledger' / 'aggregates.npz').read_bytes()
+    # A store rebuilt in the same directory with as many rows holds different transactions
+    for path in (tmp_path / 'ledger').iterdir():
+        path.unlink()
+    rebuilt = LedgerStore.create(str(tmp_path / 'ledger'))
+    rebuilt.append_rows([dict(row, amount=row['amount'] * 2) for row in FIRST_BATCH])
+    (tmp_path / 'ledger' / 'aggregates.npz').write_bytes(saved)
+
+    aggregates = IncrementalAggregates(rebuilt)
+    assert aggregates.watermark == 0
+    assert aggregates.refresh() == 6
+    assert_fields(aggregates.actuals(), {'credits_granted': [2000.0, 1000.0]})
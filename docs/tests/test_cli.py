@@ -0,0 +1,18 @@
+# Counts on the command line are usage errors when they are not positive
+import pytest
+
+from winners_circle.cli import parse_args
+
+
+@pytest.mark.parametrize('option', ['--years', '--workers', '--simulate'])
+@pytest.mark.parametrize('value', ['0', '-2', 'many'])
+def test_counts_must_be_positive(option, value, capsys):
+    with pytest.raises(SystemExit) as exit:
+        parse_args([option, value])
+    assert exit.value.code == 2
+    assert f'argument {option}' in capsys.readouterr().err
+
+
+def test_positive_counts_parse():
+    args = parse_args(['--years', '6', '--workers', '2', '--simulate', '1000'])
+    assert (args.years, args.workers, args.simulate) == (6, 2, 1000)
@@ -0,0 +1,22 @@
+# Cohort survival and the retention the synthetic members realise
+import numpy as np
+import pytest
+
+from winners_circle.cohorts import lifetime_values, survival_curve, synthetic_traditional, synthetic_winners_circle
+
+
+def test_survival_curve_by_hand():
+    # Four members: two leave after 1 and 2 quarters, two are still active after 2 and 3 quarters
+    duration = np.array([1, 2, 2, 3])
+    churned = np.array([True, True, False, False])
+    # Nobody can leave at 0; at 1, 1 of 4 leaves; at 2, 1 of the 2 whose second quarter was seen to end leaves
+    # (the member active for 2 quarters may or may not stay a third, so they are no longer at risk)
+    assert survival_curve(duration, churned).tolist() == pytest.approx([1.0, 0.75, 0.375])
+
+
+@pytest.mark.parametrize('draw, assumed', [(synthetic_winners_circle, 0.92), (synthetic_traditional, 0.80)])
+@pytest.mark.parametrize('quarters', [8, 16])
+def test_realised_retention_matches_the_assumption(draw, assumed, quarters):
+    # Members' own retentions vary around the assumption, yet the cohort section reports the assumed rate
+    members = draw(members=100_000, quarters=quarters)
+    assert lifetime_values(members, horizon=quarters)['annual_retention'] == pytest.approx(assumed, abs=0.005)
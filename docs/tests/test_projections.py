@@ -0,0 +1,45 @@
+# The vectorized projection against the figures the report's appendix printed before it
+import numpy as np
+import pytest
+
+from winners_circle.projections import project, scenario
+
+# Detailed membership, revenue and ROI tables of the original four-year appendix
+BASELINE = {
+    'starting_members': [0, 64, 153, 235],
+    'upgrades': [24, 14, 14, 14],
+    'conversions': [40, 80, 80, 80],
+    'attrition': [0, 5, 12, 19],
+    'net_new': [64, 89, 82, 75],
+    'members': [64, 153, 235, 310],
+    'direct_revenue': [128_000, 306_000, 470_000, 620_000],
+    'beyond_credit_revenue': [25_600, 61_200, 94_000, 124_000],
+    'accommodation_revenue': [5_760, 13_770, 21_150, 27_900],
+    'revenue': [159_360, 380_970, 585_150, 771_900],
+    'investment': [410_000, 0, 0, 0],
+    'operating_costs': [87_500, 90_125, 92_829, 95_613],
+    'net_cash_flow': [-338_140, 290_845, 492_321, 676_287],
+    'cumulative_cash_flow': [-338_140, -47_295, 445_026, 1_121_313],
+}
+
+
+def test_default_projection_matches_the_baseline_appendix():
+    model = scenario(project(None, months=48))
+    for name, expected in BASELINE.items():
+        # The appendix printed whole dollars, some truncated rather than rounded (95,613.61 as $95,613)
+        assert model[name].tolist() == pytest.approx(expected, abs=1), name
+    assert model['revenue'].sum() == 1_897_380
+    assert model['payback_month'] == 26
+
+
+@pytest.mark.parametrize('years', [1, 6, 10])
+def test_longer_horizons_extend_the_same_projection(years):
+    model = scenario(project(None, months=years * 12))
+    baseline = scenario(project(None, months=48))
+    assert len(model['members']) == len(model['revenue']) == years
+    shared = min(years, 4)
+    for name in BASELINE:
+        assert model[name][:shared] == pytest.approx(baseline[name][:shared]), name
+    # Each year starts with the members the previous one ended with
+    assert model['starting_members'][1:] == pytest.approx(model['members'][:-1])
+    assert model['cumulative_cash_flow'] == pytest.approx(np.cumsum(model['net_cash_flow']))
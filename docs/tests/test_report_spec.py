@@ -0,0 +1,56 @@
+# The report's narrative lives in the spec; the generator only binds data to it and builds tables and charts
+import ast
+import os
+
+import pytest
+
+from winners_circle.report_spec import DEFAULT_SPEC, SpecError, compile_spec, load_spec
+
+GENERATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'winners-circle-report-generator.py')
+
+
+def generator_calls(name):
+    with open(GENERATOR) as f:
+        tree = ast.parse(f.read())
+    return [node for node in ast.walk(tree)
+            if isinstance(node, ast.Call) and getattr(node.func, 'id', getattr(node.func, 'attr', None)) == name]
+
+
+# Text fixed in the source: a string literal, or an f-string without placeholders
+def literal(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr) and all(isinstance(value, ast.Constant) for value in node.values):
+        return ''.join(value.value for value in node.values)
+    return None
+
+
+def test_every_spec_section_is_rendered_by_the_generator():
+    rendered = {call.args[0].value for call in generator_calls('render')}
+    assert rendered == set(load_spec(DEFAULT_SPEC)['sections'])
+
+
+def test_bullet_lists_are_declared_in_the_spec():
+    assert not generator_calls('ListFlowable')
+    assert not generator_calls('ListItem')
+
+
+def test_static_prose_is_declared_in_the_spec():
+    # Headings and captions may stay beside the tables and charts they label; sentences belong in the spec
+    texts = [literal(call.args[0]) for call in generator_calls('Paragraph') if call.args]
+    sentences = [' '.join(text.split()) for text in texts
+                 if text is not None and text.rstrip().endswith(('.', ':', '!', '?'))]
+    assert sentences == []
+
+
+def test_formatters_take_a_number_of_digits():
+    spec = {'sections': {'text': [{'paragraph': '{growth:percent.0} and {share:percent}, {fee:currency.2}'}]}}
+    [paragraph] = compile_spec(spec).render('text', {'growth': 3.844, 'share': 0.125, 'fee': 499.5})
+    assert paragraph.text == '384% and 12.5%, $499.50'
+
+
+def test_section_needs_every_value_it_binds():
+    plan = compile_spec({'sections': {'text': [{'paragraph': 'From {first_revenue:currency} by Year {years}'}]}})
+    assert plan.bindings('text') == {'first_revenue', 'years'}
+    with pytest.raises(SpecError, match='missing years'):
+        plan.render('text', {'first_revenue': 1000})
@@ -0,0 +1,98 @@
+# The report service, driven through StubClient with a stand-in render function
+import asyncio
+import os
+import time
+
+import pytest
+
+from winners_circle.service import DONE, FAILED, QUEUED, RUNNING, ReportService, StubClient
+
+
+# Runs in the worker processes: writes a tiny "PDF" naming its options, or fails the way it is told to
+def fake_report(target, title='Report', delay=0.0, fail=False, crash=False):
+    if crash:
+        os._exit(1)
+    if fail:
+        raise ValueError(f"cannot render {title}")
+    time.sleep(delay)
+    target.write(f'%PDF {title}'.encode())
+
+
+def run(scenario, **options):
+    async def main():
+        async with ReportService(fake_report, **options) as service:
+            return await scenario(service, StubClient(service))
+    return asyncio.run(main())
+
+
+def test_identical_requests_share_one_job():
+    async def scenario(service, client):
+        first = await client.request_report(title='A', delay=0.2)
+        second = await client.request_report(title='A', delay=0.2)
+        other = await client.request_report(title='B')
+        assert first == second != other
+        assert await client.download(first) == b'%PDF A'
+        # Once finished, the same options render again under a new id
+        assert await client.request_report(title='A', delay=0.2) != first
+        return service.stats()
+
+    assert run(scenario, workers=2)['deduplicated'] == 1
+
+
+def test_full_queue_sheds_load_without_waiting():
+    async def scenario(service, client):
+        running = await service.submit({'title': 'running', 'delay': 0.5})
+        await asyncio.sleep(0.2)
+        queued = await service.submit({'title': 'queued'})
+        with pytest.raises(asyncio.QueueFull):
+            await service.submit({'title': 'shed'}, wait=False)
+        # The shed job is forgotten, so the same options can be submitted again later
+        assert service.stats()['queued'] == 1
+        assert await client.download(running) == b'%PDF running'
+        assert await client.download(queued) == b'%PDF queued'
+        assert await service.submit({'title': 'shed'}, wait=False)
+
+    run(scenario, workers=1, max_queue=1)
+
+
+def test_status_moves_from_queued_through_running_to_done_or_failed():
+    async def scenario(service, client):
+        job = await client.request_report(title='slow', delay=0.5)
+        assert (await client.get_status(job))['state'] == QUEUED
+        await asyncio.sleep(0.2)
+        assert (await client.get_status(job))['state'] == RUNNING
+        await client.download(job)
+        status = await client.get_status(job)
+        assert status['state'] == DONE
+        assert status['bytes'] == len(b'%PDF slow')
+        assert status['submitted'] <= status['started'] <= status['finished']
+
+        failing = await client.request_report(title='broken', fail=True)
+        with pytest.raises(RuntimeError, match='cannot render broken'):
+            await client.download(failing)
+        status = await client.get_status(failing)
+        assert status['state'] == FAILED
+        assert 'ValueError' in status['error']
+        with pytest.raises(KeyError):
+            await client.get_status('missing')
+
+    run(scenario, workers=1)
+
+
+def test_a_dead_worker_fails_only_its_own_job():
+    async def scenario(service, client):
+        before = [await client.request_report(title=f'before {number}', delay=0.3) for number in range(2)]
+        await asyncio.sleep(0.1)
+        crash = await client.request_report(title='crash', crash=True)
+        after = [await client.request_report(title=f'after {number}') for number in range(3)]
+        for job in before + after:
+            assert (await client.download(job)).startswith(b'%PDF')
+        with pytest.raises(RuntimeError, match='Worker process died'):
+            await client.download(crash)
+        # The replaced pool keeps serving
+        assert await client.render(title='later') == b'%PDF later'
+        return service.stats()
+
+    stats = run(scenario, workers=3)
+    assert stats['restarts'] >= 1
+    assert (stats['done'], stats['failed']) == (6, 1)
@@ -0,0 +1,47 @@
+# Monte Carlo bands follow the assumptions the report is built from
+import numpy as np
+import pytest
+
+from winners_circle.cli import parse_args
+from winners_circle.simulation import shift_samples, simulate
+
+
+def bands(assumptions=None):
+    return simulate(2_000, assumptions=assumptions, seed=0)
+
+
+def test_default_overrides_leave_the_bands_unchanged():
+    baseline = bands()
+    same = bands({'retention_rate': 0.92, 'annual_fee': 2000})
+    assert (same['members'] == baseline['members']).all()
+    assert (same['revenue'] == baseline['revenue']).all()
+
+
+def test_overridden_driver_moves_the_bands():
+    baseline = bands()
+    low = bands({'retention_rate': 0.5})
+    # Nobody leaves in the launch year, so retention shows from year 2 on
+    assert (low['members'][:, 1:] < baseline['members'][:, 1:]).all()
+    assert (low['members'][:, -1] < 0.6 * baseline['members'][:, -1]).all()
+
+
+def test_shifted_shares_stay_within_zero_and_one():
+    samples = shift_samples({'retention_rate': np.array([0.88, 0.95]), 'accommodation_rate': np.array([250.0, 350.0])},
+                            {'retention_rate': 0.99, 'accommodation_rate': 500})
+    assert samples['retention_rate'].tolist() == pytest.approx([0.95, 1.0])
+    assert samples['accommodation_rate'].tolist() == pytest.approx([450.0, 550.0])
+
+
+def test_unsampled_override_still_applies():
+    baseline = bands()
+    cheaper = bands({'annual_fee': 1000})
+    assert (cheaper['members'] == baseline['members']).all()
+    assert (cheaper['revenue'] < baseline['revenue']).all()
+
+
+@pytest.mark.parametrize('count', ['0', '-5'])
+def test_simulate_needs_at_least_one_scenario(count):
+    with pytest.raises(SystemExit):
+        parse_args(['--simulate', count])
+    with pytest.raises(ValueError):
+        simulate(int(count))
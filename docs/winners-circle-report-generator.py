@@ -1,986 +1,700 @@
+import time
+# Start of module imports, reported by --profile
+IMPORTS_STARTED = time.perf_counter(), time.process_time()
 import os
-import matplotlib.pyplot as plt
-import numpy as np
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import io
+import sys
+import json
+import importlib
+
+import winners_circle
+from winners_circle.cli import build_parser, parse_args
+
+# Parse the command line before the heavy imports below, so --help and usage errors return at once and a
+# --server request is forwarded to the warm server without loading reportlab or NumPy here
+if __name__ == "__main__":
+    args = parse_args()
+    if args.server:
+        from winners_circle.warm_server import request_report
+        try:
+            sys.exit(request_report(args.server, sys.argv[1:]))
+        except OSError as error:
+            print(f"No report server at {args.server} ({error}); rendering here", file=sys.stderr)
+
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak, ListFlowable, ListItem
-from reportlab.pdfgen import canvas
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.linecharts import HorizontalLineChart
-from reportlab.graphics.widgets.markers import makeMarker
-from reportlab.graphics.charts.legends import Legend
-import matplotlib
-import argparse
-matplotlib.use('Agg')  # Use non-interactive backend
-
-# Define colors to match Winners Circle site style
-PRIMARY_COLOR = colors.HexColor('#0284c7')  # primary-600
-DARK_BROWN = colors.HexColor('#5A3E00')
-BACKGROUND_COLOR = colors.HexColor('#D8D1AE')
-SECONDARY_COLOR = colors.HexColor('#0ea5e9')  # primary-500
-ACCENT_COLOR = colors.HexColor('#7dd3fc')  # primary-300
-LIGHT_COLOR = colors.HexColor('#f0f9ff')  # primary-50
-
-# Set up the document
-def create_winners_circle_report(output_filename='Winners_Circle_Analysis.pdf'):
-    doc = SimpleDocTemplate(
-        output_filename,
-        pagesize=letter,
-        rightMargin=0.75*inch,
-        leftMargin=0.75*inch,
-        topMargin=0.75*inch,
-        bottomMargin=0.75*inch
-    )
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Modify existing styles
-    styles['Title'].fontName = 'Helvetica-Bold'
-    styles['Title'].fontSize = 24
-    styles['Title'].textColor = DARK_BROWN
-    styles['Title'].spaceAfter = 24
-    styles['Title'].alignment = TA_CENTER
-    
-    # Customize Subtitle style
-    styles.add(ParagraphStyle(
-        name='WC_Subtitle',
-        parent=styles['Heading2'],
-        fontName='Helvetica',
-        fontSize=18,
-        textColor=PRIMARY_COLOR,
-        spaceAfter=12,
-        alignment=TA_CENTER
-    ))
-    
-    # Modify Heading2 style
-    styles['Heading2'].fontName = 'Helvetica-Bold'
-    styles['Heading2'].fontSize = 16
-    styles['Heading2'].textColor = DARK_BROWN
-    styles['Heading2'].spaceBefore = 12
-    styles['Heading2'].spaceAfter = 8
-    
-    # Modify Heading3 style
-    styles['Heading3'].fontName = 'Helvetica-Bold'
-    styles['Heading3'].fontSize = 14
-    styles['Heading3'].textColor = PRIMARY_COLOR
-    styles['Heading3'].spaceBefore = 10
-    styles['Heading3'].spaceAfter = 6
-    
-    # Modify Normal style
-    styles['Normal'].fontName = 'Helvetica'
-    styles['Normal'].fontSize = 11
-    styles['Normal'].textColor = colors.black
-    styles['Normal'].alignment = TA_JUSTIFY
-    styles['Normal'].spaceBefore = 6
-    styles['Normal'].spaceAfter = 6
-    
-    # Add Emphasis style
-    styles.add(ParagraphStyle(
-        name='Emphasis',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=11,
-        textColor=DARK_BROWN
-    ))
-    
-    # Add Quote style
-    styles.add(ParagraphStyle(
-        name='Quote',
-        parent=styles['Normal'],
-        fontName='Helvetica-Oblique',
-        fontSize=12,
-        textColor=PRIMARY_COLOR,
-        leftIndent=20,
-        rightIndent=20,
-        spaceBefore=12,
-        spaceAfter=12
-    ))
-    
-    # Add Caption style
-    styles.add(ParagraphStyle(
-        name='Caption',
-        parent=styles['Normal'],
-        fontName='Helvetica-Oblique',
-        fontSize=10,
-        textColor=colors.darkgray,
-        alignment=TA_CENTER,
-        spaceBefore=4,
-        spaceAfter=16
-    ))
-    
-    # Title Page
-    elements.append(Paragraph("Winners Circle Club", styles['Title']))
-    elements.append(Paragraph("Comprehensive Analysis Report", styles['WC_Subtitle']))
-    elements.append(Spacer(1, 2*inch))
-    
-    # Create a placeholder for the winery logo image
-    # Uncomment and modify path if you have a logo
-    # logo = Image("path_to_logo.png", width=3*inch, height=1.5*inch)
-    # elements.append(logo)
-    
-    elements.append(Spacer(1, 2*inch))
-    elements.append(Paragraph("Prepared for Milea Estate Vineyard", styles['Normal']))
-    elements.append(Paragraph(f"April 2025", styles['Normal']))
-    
-    elements.append(PageBreak())
-    
-    # Executive Summary
-    elements.append(Paragraph("Executive Summary", styles['Heading2']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club represents Milea Estate Vineyard's strategic move to establish an ultra-premium 
-        membership tier designed to transform the traditional wine club experience into a comprehensive lifestyle 
-        proposition. Based on our detailed analysis, this premium credit-based membership program presents a compelling 
-        opportunity for sustainable revenue growth, enhanced customer loyalty, and strengthened brand positioning.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """Our financial projections indicate that the Winner's Circle Club will contribute significantly to Milea's 
-        growth, with revenue increasing from $159,360 in Year 1 to $699,986 by Year 4. This represents a compelling 
-        return on investment with a payback period of approximately 28 months on the initial capital investment.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """Key highlights of the Winner's Circle Club include:""", 
-        styles['Normal']
-    ))
-    
-    # Key highlights bullet points
-    highlights = ListFlowable(
-        [
-            ListItem(Paragraph("A flexible credit-based model with quarterly fees of $500 ($2,000 annually)", styles['Normal'])),
-            ListItem(Paragraph("Projected growth from 64 members in Year 1 to 281 members by Year 4", styles['Normal'])),
-            ListItem(Paragraph("Enhanced member lifetime value of $8,000 compared to $1,920 for traditional club members", styles['Normal'])),
-            ListItem(Paragraph("Comprehensive redemption options spanning wine purchases, accommodations, and culinary experiences", styles['Normal'])),
-            ListItem(Paragraph("Exclusive access to premium facilities and personalized services", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(highlights)
-    
-    elements.append(Spacer(1, 0.2*inch))
-    elements.append(Paragraph(
-        """This report provides a detailed analysis of the Winner's Circle concept, membership projections, revenue 
-        forecasts, implementation strategy, and supporting financial assumptions.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(PageBreak())
-    
-    # Table of Contents
-    elements.append(Paragraph("Table of Contents", styles['Heading2']))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    toc_data = [
-        ["1. Club Concept and Structure", "4"],
-        ["2. Membership Growth Projections", "7"],
-        ["3. Revenue Analysis", "10"],
-        ["4. Implementation Strategy", "14"],
-        ["5. Financial Assumptions", "17"],
-        ["6. Key Recommendations", "20"],
-        ["Appendix: Detailed Financial Projections", "22"],
-    ]
-    
-    toc_table = Table(toc_data, colWidths=[5*inch, 0.5*inch])
-    toc_table.setStyle(TableStyle([
-        ('TEXTCOLOR', (0, 0), (-1, -1), DARK_BROWN),
-        ('FONT', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
-    
-    elements.append(toc_table)
-    elements.append(PageBreak())
-    
-    # 1. Club Concept and Structure
-    elements.append(Paragraph("1. Club Concept and Structure", styles['Heading2']))
-    
-    elements.append(Paragraph("Core Concept", styles['Heading3']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club introduces a premium tier to Milea Estate's existing membership hierarchy, 
-        sitting above the current Jumper, Grand Prix, and Triple Crown tiers. Unlike traditional allocation-based 
-        wine clubs, the Winner's Circle operates on an innovative credit-based model where members pay $500 quarterly 
-        ($2,000 annually), converted to an equivalent credit balance usable across the entire Milea ecosystem.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """This approach shifts the focus from purely wine acquisition to a comprehensive lifestyle experience that 
-        encompasses fine wine, dining, accommodation, and exclusive events. The credit-based system provides members 
-        with unprecedented flexibility while establishing a steady revenue stream for Milea Estate.""", 
-        styles['Normal']
-    ))
-    
-    # Pull quote
-    elements.append(Paragraph(
-        """The Winner's Circle represents a paradigm shift from traditional wine club models to a comprehensive 
-        lifestyle membership that enhances customer engagement across multiple touchpoints.""", 
-        styles['Quote']
-    ))
-    
-    elements.append(Paragraph("Key Features and Benefits", styles['Heading3']))
-    
-    # Key features as narrative bullet points
-    features = ListFlowable(
-        [
-            ListItem(Paragraph("""<b>Credit-Based Flexibility:</b> Members enjoy complete freedom to allocate their credits 
-            according to their personal preferences, moving beyond traditional predetermined wine allocations to create 
-            a truly customizable experience.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Enhanced Value Proposition:</b> Members receive a substantial 20% discount on all purchases 
-            across the entire Milea ecosystem, including wine acquisitions, culinary experiences, and luxury accommodations. 
-            This comprehensive discount structure significantly enhances the overall value of membership.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Diverse Redemption Options:</b> Credits can be applied to an extensive range of premium 
-            offerings, including limited-release wines, exclusive culinary programs, luxury overnight accommodations, curated 
-            merchandise, and special member-only events.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Exclusive Access:</b> Members enjoy privileged access to premium facilities including 
-            the private club lounge, temperature-controlled wine storage lockers, exclusive recreational facilities, and 
-            extended access hours not available to general visitors.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Premium Brand Positioning:</b> The exclusive nature and comprehensive benefits of the 
-            Winner's Circle Club strengthen Milea's position as the premier luxury wine destination in the Hudson Valley 
-            region.""", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(features)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    elements.append(Paragraph("Differentiation Factors", styles['Heading3']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club stands apart from traditional wine club offerings in several key ways:""", 
-        styles['Normal']
-    ))
-    
-    differentiation = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Lifestyle Focus vs. Product Focus:</b> Expands beyond wine to create a holistic vineyard lifestyle experience", styles['Normal'])),
-            ListItem(Paragraph("<b>Flexibility vs. Allocation:</b> Member-directed spending rather than predetermined allocations", styles['Normal'])),
-            ListItem(Paragraph("<b>Extended Ecosystem:</b> Encompasses accommodations, dining, and events in addition to wine", styles['Normal'])),
-            ListItem(Paragraph("<b>Premium Positioning:</b> Creates a clear luxury tier within the Hudson Valley wine region", styles['Normal'])),
-            ListItem(Paragraph("<b>Value Amplification:</b> Enhanced discounts and benefits increase perceived and actual value", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(differentiation)
-    
-    elements.append(Paragraph("Target Demographics", styles['Heading3']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club is designed to appeal to several distinct demographic segments:""", 
-        styles['Normal']
-    ))
-    
-    # Create pie chart for target segments
+from reportlab.platypus import Paragraph, Spacer, Table, PageBreak
+
+from winners_circle.projections import project, scenario, resolve_assumptions
+from winners_circle.simulation import simulate
+from winners_circle.sweep import parse_grid_axis, run_sweep, tornado
+from winners_circle.theme import (
+    PRIMARY_COLOR, DARK_BROWN, SECONDARY_COLOR, ACCENT_COLOR, FONTS,
+    get_styles, warm_theme, data_table_style, register_brand_fonts, reset_fonts,
+)
+from winners_circle.streaming import build_streaming
+from winners_circle.toc import ReportDocTemplate, TableOfContents, collect_toc_entries
+from winners_circle.chart_cache import get_chart_cache, configure_chart_cache, reset_chart_cache
+from winners_circle.figures import render_chart, render_charts, png_flowable, load_matplotlib
+from winners_circle.output import render_to_buffer, iter_rendered
+from winners_circle.tables import ArrayTable
+from winners_circle.appendix import read_ledger, member_ledger_flowables
+from winners_circle.formatting import currency, count, percent, nice_axis, assumption, assumption_label
+from winners_circle.report_spec import load_plan, DEFAULT_SPEC
+from winners_circle.build_graph import BuildGraph, code_version, configure_build_cache, reset_build_cache
+from winners_circle.profiler import span, start_profiling, stop_profiling
+# NumPy, the reportlab chart classes and the modules of optional features (batches, statements, the ledger
+# store, cohorts, PDF optimization, data exports, the warm server) are imported by the code that uses them
+IMPORTS_FINISHED = time.perf_counter(), time.process_time()
+
+
+# Create pie chart for target segments
+def create_pie_chart(data, labels, slice_colors):
+    from reportlab.graphics.charts.piecharts import Pie
+    from reportlab.graphics.shapes import Drawing
     drawing = Drawing(400, 200)
     pie = Pie()
     pie.x = 150
     pie.y = 50
     pie.width = 150
     pie.height = 150
-    pie.data = [40, 25, 20, 15]
-    pie.labels = ['Affluent Local Residents', 'NYC Weekend Travelers', 'Wine Enthusiasts', 'Corporate Members']
+    pie.data = data
+    pie.labels = labels
+    pie.slices.fontName = FONTS['chart']
     
     pie.slices.strokeWidth = 0.5
-    pie.slices[0].fillColor = PRIMARY_COLOR
-    pie.slices[1].fillColor = SECONDARY_COLOR
-    pie.slices[2].fillColor = ACCENT_COLOR
-    pie.slices[3].fillColor = LIGHT_COLOR
+    for index, color in enumerate(slice_colors):
+        pie.slices[index].fillColor = color
     
     drawing.add(pie)
-    elements.append(drawing)
-    elements.append(Paragraph("Target Member Demographics", styles['Caption']))
-    
-    elements.append(Paragraph(
-        """<b>Affluent Local Residents (40%):</b> High-income professionals within a 30-mile radius seeking regular 
-        access to premium experiences without traveling to NYC or other wine regions.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """<b>NYC Weekend Travelers (25%):</b> Urban dwellers with second homes or frequent weekend trips to Hudson 
-        Valley who want consistent, high-quality experiences during their visits.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """<b>Wine Enthusiasts (20%):</b> Serious collectors and oenophiles attracted by the quality of Milea's wines 
-        and the exclusivity of limited releases and library access.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """<b>Corporate Members (15%):</b> Businesses seeking executive retreats, client entertainment options, and 
-        corporate gifting solutions with a premium, local focus.""", 
-        styles['Normal']
-    ))
-    
-    elements.append(PageBreak())
-    
-    # 2. Membership Growth Projections
-    elements.append(Paragraph("2. Membership Growth Projections", styles['Heading2']))
-    
-    elements.append(Paragraph("Growth Assumptions", styles['Heading3']))
-    elements.append(Paragraph(
-        """Membership growth for the Winner's Circle Club is projected based on two primary sources: 
-        upgrades from existing wine club members and conversions from non-club visitors to the winery.""", 
-        styles['Normal']
-    ))
-    
-    # Create a table for growth assumptions
-    assumption_data = [
-        ["Assumptions", "Year 1", "Year 2", "Year 3", "Year 4"],
-        ["Upgrade of existing club members", "4%\n(24 members)", "2%\n(14 members)", "2%\n(14 members)", "2%\n(14 members)"],
-        ["Conversion of non-club visitors", "0.5%\n(40 members)", "1%\n(80 members)", "1%\n(80 members)", "1%\n(80 members)"],
-        ["Total new members", "64", "94", "94", "94"],
-        ["Cumulative membership", "64", "148", "220", "281"],
-    ]
-    
-    assumption_table = Table(assumption_data)
-    assumption_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('BACKGROUND', (0, 1), (0, -1), LIGHT_COLOR),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    
-    elements.append(assumption_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    elements.append(Paragraph("Membership Growth Chart", styles['Heading3']))
-    
-    # Create bar chart for membership growth
+    return drawing
+
+# Create a bar chart with one bar series per row of `series`
+def create_bar_chart(series, category_names, bar_colors, label_format='%s', bar_label_format=None,
+                     stacked=False, legend_labels=None):
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.shapes import Drawing
     drawing = Drawing(500, 250)
     chart = VerticalBarChart()
     chart.x = 50
     chart.y = 50
     chart.height = 150
     chart.width = 400
-    chart.data = [[80, 190, 285, 370]]
-    chart.categoryAxis.categoryNames = ['Year 1', 'Year 2', 'Year 3', 'Year 4']
+    chart.data = series
+    chart.categoryAxis.categoryNames = category_names
+    for labels in (chart.categoryAxis.labels, chart.valueAxis.labels, chart.barLabels):
+        labels.fontName = FONTS['chart']
     chart.valueAxis.valueMin = 0
-    chart.valueAxis.valueMax = 400
-    chart.valueAxis.valueStep = 100
-    chart.bars[0].fillColor = PRIMARY_COLOR
-    
-    # Set bar labels format
-    chart.barLabelFormat = '%s'
+    top = max(map(sum, zip(*series))) if stacked else max(max(row) for row in series)
+    chart.valueAxis.valueMax, chart.valueAxis.valueStep = nice_axis(top)
+    for index, color in enumerate(bar_colors):
+        chart.bars[index].fillColor = color
+    
+    if stacked:
+        # Explicitly set barLabels to None for stacked chart
+        chart.barLabels = None
+        chart.categoryAxis.style = 'stacked'
+    elif bar_label_format:
+        # Set bar labels format
+        chart.barLabelFormat = bar_label_format
     
     # Custom value axis labels
-    chart.valueAxis.labelTextFormat = '%s'
-    
+    chart.valueAxis.labelTextFormat = label_format
     drawing.add(chart)
-    elements.append(drawing)
-    elements.append(Paragraph("Projected Member Growth by Year", styles['Caption']))
-    
-    elements.append(Paragraph("Membership Composition", styles['Heading3']))
-    elements.append(Paragraph(
-        """The chart below illustrates the projected breakdown between upgrades from existing club members 
-        and new conversions from winery visitors:""", 
-        styles['Normal']
-    ))
     
-    # Create a line chart showing the composition breakdown
+    if legend_labels:
+        legend = Legend()
+        legend.fontName = FONTS['chart']
+        legend.alignment = 'right'
+        legend.x = 400
+        legend.y = 220
+        legend.colorNamePairs = list(zip(bar_colors, legend_labels))
+        drawing.add(legend)
+    return drawing
+
+# Create a line chart with one line per row of `series`
+def create_line_chart(series, category_names, line_colors, markers, legend_labels):
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.linecharts import HorizontalLineChart
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.graphics.widgets.markers import makeMarker
     drawing = Drawing(500, 250)
     chart = HorizontalLineChart()
     chart.x = 50
     chart.y = 50
     chart.height = 150
     chart.width = 400
-    chart.data = [
-        [24, 38, 52, 66],  # Upgrades
-        [40, 110, 168, 215],  # New conversions
-    ]
-    chart.categoryAxis.categoryNames = ['Year 1', 'Year 2', 'Year 3', 'Year 4']
+    chart.data = series
+    chart.categoryAxis.categoryNames = category_names
+    chart.categoryAxis.labels.fontName = chart.valueAxis.labels.fontName = FONTS['chart']
     chart.valueAxis.valueMin = 0
-    chart.valueAxis.valueMax = 250
-    chart.valueAxis.valueStep = 50
-    chart.lines[0].strokeColor = PRIMARY_COLOR
-    chart.lines[0].strokeWidth = 2
-    chart.lines[0].symbol = makeMarker('Circle')
-    chart.lines[1].strokeColor = SECONDARY_COLOR
-    chart.lines[1].strokeWidth = 2
-    chart.lines[1].symbol = makeMarker('FilledSquare')
+    chart.valueAxis.valueMax, chart.valueAxis.valueStep = nice_axis(max(max(row) for row in series))
+    for index, (color, marker) in enumerate(zip(line_colors, markers)):
+        chart.lines[index].strokeColor = color
+        chart.lines[index].strokeWidth = 2
+        chart.lines[index].symbol = makeMarker(marker)
     
     # Add legend
     legend = Legend()
+    legend.fontName = FONTS['chart']
     legend.alignment = 'right'
     legend.x = 400
     legend.y = 220
-    legend.colorNamePairs = [(PRIMARY_COLOR, 'Upgrades from Existing Members'),
-                           (SECONDARY_COLOR, 'New Conversions')]
+    legend.colorNamePairs = list(zip(line_colors, legend_labels))
     drawing.add(chart)
     drawing.add(legend)
-    
-    elements.append(drawing)
-    elements.append(Paragraph("Member Composition by Source", styles['Caption']))
-    
-    elements.append(Paragraph("Retention Strategy", styles['Heading3']))
-    elements.append(Paragraph(
-        """A key factor in the success of the Winner's Circle Club is maintaining high retention rates through 
-        exceptional service and continuous enhancement of the value proposition. We project a 92% annual renewal rate 
-        based on the following retention strategies:""", 
-        styles['Normal']
-    ))
-    
-    retention = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Personalized Experiences:</b> Customized offerings based on member preferences and history", styles['Normal'])),
-            ListItem(Paragraph("<b>Exclusive Access:</b> Regular introduction of new benefits, experiences, and products available only to Winner's Circle members", styles['Normal'])),
-            ListItem(Paragraph("<b>Recognition Program:</b> Tiered recognition within the club based on tenure and spending", styles['Normal'])),
-            ListItem(Paragraph("<b>Community Building:</b> Fostering connections among members through exclusive events and forums", styles['Normal'])),
-            ListItem(Paragraph("<b>Regular Engagement:</b> Consistent, meaningful communications that provide value beyond promotional content", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(retention)
-    
-    elements.append(PageBreak())
-    
-    # 3. Revenue Analysis
-    elements.append(Paragraph("3. Revenue Analysis", styles['Heading2']))
-    
-    elements.append(Paragraph("Revenue Streams", styles['Heading3']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club generates revenue through three primary channels:""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """<b>1. Direct Membership Credits:</b> The core $2,000 annual membership fee converted to usable credits""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """<b>2. Beyond-Credit Purchases:</b> Additional spending beyond the initial credit allocation, estimated at 20% of direct credit value""", 
-        styles['Normal']
-    ))
-    
-    elements.append(Paragraph(
-        """<b>3. Accommodation Revenue:</b> Income from member stays at the Staatsburg House, projected at 10% utilization with a $300 per night average rate""", 
-        styles['Normal']
-    ))
-    
-    # Create a table for revenue projections
-    revenue_data = [
-        ["Year", "Members", "Direct Membership", "Beyond-Credit Purchases", "Accommodation", "Total Revenue"],
-        ["1", "64", "$128,000", "$25,600", "$5,760", "$159,360"],
-        ["2", "148", "$296,000", "$59,360", "$13,356", "$369,516"],
-        ["3", "220", "$440,280", "$88,056", "$19,812", "$548,148"],
-        ["4", "281", "$562,238", "$112,447", "$25,300", "$699,986"],
-    ]
-    
-    revenue_table = Table(revenue_data)
-    revenue_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 1), (0, -1), LIGHT_COLOR),
-        ('BACKGROUND', (-1, 1), (-1, -1), colors.lightgrey),
-    ]))
-    
-    elements.append(revenue_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    elements.append(Paragraph("Revenue Growth Trajectory", styles['Heading3']))
-    
-    # Create a bar chart for revenue growth
+    return drawing
+
+# Create a line chart of member survival curves by quarter since joining
+def create_survival_chart(curves, labels):
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing
+    quarters = max(len(curve) for curve in curves)
     drawing = Drawing(500, 250)
-    chart = VerticalBarChart()
+    chart = LinePlot()
     chart.x = 50
     chart.y = 50
     chart.height = 150
     chart.width = 400
-    chart.data = [[159360, 369516, 548148, 699986]]
-    chart.categoryAxis.categoryNames = ['Year 1', 'Year 2', 'Year 3', 'Year 4']
-    chart.valueAxis.valueMin = 0
-    chart.valueAxis.valueMax = 800000
-    chart.valueAxis.valueStep = 200000
-    chart.bars[0].fillColor = PRIMARY_COLOR
-    
-    # Set bar labels format
-    chart.barLabelFormat = '$%s'
-    
-    # Custom value axis labels
-    chart.valueAxis.labelTextFormat = '$%s'
+    chart.data = [[(quarter, float(value) * 100) for quarter, value in enumerate(curve)] for curve in curves]
+    chart.xValueAxis.labels.fontName = chart.yValueAxis.labels.fontName = FONTS['chart']
+    chart.xValueAxis.valueMin = 0
+    chart.xValueAxis.valueMax = quarters - 1
+    chart.xValueAxis.valueStep = 4
+    chart.xValueAxis.labelTextFormat = 'Q%d'
+    chart.yValueAxis.valueMin = 0
+    chart.yValueAxis.valueMax = 100
+    chart.yValueAxis.valueStep = 25
+    chart.yValueAxis.labelTextFormat = '%d%%'
+    line_colors = [PRIMARY_COLOR, DARK_BROWN, SECONDARY_COLOR, ACCENT_COLOR]
+    for index, color in enumerate(line_colors[:len(curves)]):
+        chart.lines[index].strokeColor = color
+        chart.lines[index].strokeWidth = 2
     
+    legend = Legend()
+    legend.fontName = FONTS['chart']
+    legend.alignment = 'right'
+    legend.x = 400
+    legend.y = 95
+    legend.colorNamePairs = list(zip(line_colors, labels))
     drawing.add(chart)
-    elements.append(drawing)
-    elements.append(Paragraph("Total Projected Revenue by Year", styles['Caption']))
-    
-    elements.append(Paragraph("Revenue Composition", styles['Heading3']))
-    elements.append(Paragraph(
-        """The following chart illustrates the breakdown of revenue streams over the projected four-year period:""", 
-        styles['Normal']
-    ))
-    
-    # Create a stacked bar chart for revenue composition
+    drawing.add(legend)
+    return drawing
+
+# Create a fan chart from P5/P50/P95 bands (rows of `bands`, one column per year)
+def create_fan_chart(bands, label_format='%s', band_label='P5-P95 range'):
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing, Polygon
+    from reportlab.graphics.widgets.markers import makeMarker
+    low, median, high = bands
+    years = len(median)
     drawing = Drawing(500, 250)
-    chart = VerticalBarChart()
+    chart = LinePlot()
     chart.x = 50
     chart.y = 50
     chart.height = 150
     chart.width = 400
     chart.data = [
-        [128000, 296000, 440280, 562238],  # Direct Membership
-        [25600, 59360, 88056, 112447],    # Beyond-Credit
-        [5760, 13356, 19812, 25300]      # Accommodation
+        [(year + 1, float(value)) for year, value in enumerate(median)],
+        [(year + 1, float(value)) for year, value in enumerate(low)],
+        [(year + 1, float(value)) for year, value in enumerate(high)],
     ]
-    chart.categoryAxis.categoryNames = ['Year 1', 'Year 2', 'Year 3', 'Year 4']
-    chart.valueAxis.valueMin = 0
-    chart.valueAxis.valueMax = 800000
-    chart.valueAxis.valueStep = 200000
-    chart.bars[0].fillColor = PRIMARY_COLOR
-    chart.bars[1].fillColor = SECONDARY_COLOR
-    chart.bars[2].fillColor = ACCENT_COLOR
-    
-    # Explicitly set barLabels to None for stacked chart
-    chart.barLabels = None
-    
-    # Add stacked option
-    chart.categoryAxis.style = 'stacked'
-    
-    # Custom value axis labels
-    chart.valueAxis.labelTextFormat = '$%s'
+    chart.xValueAxis.labels.fontName = chart.yValueAxis.labels.fontName = FONTS['chart']
+    chart.xValueAxis.valueMin = 1
+    chart.xValueAxis.valueMax = max(years, 2)
+    chart.xValueAxis.valueStep = 1
+    chart.xValueAxis.labelTextFormat = 'Year %d'
+    chart.yValueAxis.valueMin = 0
+    chart.yValueAxis.valueMax, chart.yValueAxis.valueStep = nice_axis(max(high))
+    chart.yValueAxis.labelTextFormat = label_format
+    chart.lines[0].strokeColor = PRIMARY_COLOR
+    chart.lines[0].strokeWidth = 2
+    chart.lines[0].symbol = makeMarker('FilledCircle')
+    for line in (1, 2):
+        chart.lines[line].strokeColor = SECONDARY_COLOR
+        chart.lines[line].strokeWidth = 0.75
+        chart.lines[line].strokeDashArray = (3, 2)
+    
+    # Shade the band between P5 and P95 behind the lines
+    def point(year, value):
+        x_span = chart.xValueAxis.valueMax - chart.xValueAxis.valueMin
+        return (chart.x + (year - chart.xValueAxis.valueMin) / x_span * chart.width,
+                chart.y + value / chart.yValueAxis.valueMax * chart.height)
+    outline = [point(year + 1, value) for year, value in enumerate(high)]
+    outline += [point(year + 1, value) for year, value in reversed(list(enumerate(low)))]
+    band = Polygon([coordinate for xy in outline for coordinate in xy],
+                   fillColor=ACCENT_COLOR, fillOpacity=0.4, strokeColor=None)
     
-    # Add legend
     legend = Legend()
+    legend.fontName = FONTS['chart']
     legend.alignment = 'right'
     legend.x = 400
     legend.y = 220
-    legend.colorNamePairs = [(PRIMARY_COLOR, 'Direct Membership'),
-                           (SECONDARY_COLOR, 'Beyond-Credit Purchases'),
-                           (ACCENT_COLOR, 'Accommodation')]
+    legend.colorNamePairs = [(PRIMARY_COLOR, 'Median (P50)'), (ACCENT_COLOR, band_label)]
     
+    drawing.add(band)
     drawing.add(chart)
     drawing.add(legend)
-    elements.append(drawing)
-    elements.append(Paragraph("Revenue Composition by Stream", styles['Caption']))
-    
-    elements.append(Paragraph("Financial Impact", styles['Heading3']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club represents a significant financial opportunity for Milea Estate, 
-        with the following key impacts:""", 
-        styles['Normal']
-    ))
-    
-    impact = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Revenue Growth:</b> 339% increase in revenue from Year 1 to Year 4", styles['Normal'])),
-            ListItem(Paragraph("<b>Enhanced Lifetime Value:</b> Member lifetime value increases from $1,920 for traditional club members to $8,000 for Winner's Circle members", styles['Normal'])),
-            ListItem(Paragraph("<b>Revenue Diversification:</b> Creates substantial non-wine revenue streams through accommodations and experiences", styles['Normal'])),
-            ListItem(Paragraph("<b>Return on Investment:</b> Projects a payback period of approximately 28 months on the initial investment", styles['Normal'])),
-            ListItem(Paragraph("<b>Brand Premium Effect:</b> Strengthens premium positioning, potentially increasing pricing power across all products", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(impact)
-    
-    elements.append(PageBreak())
-    
-    # 4. Implementation Strategy
-    elements.append(Paragraph("4. Implementation Strategy", styles['Heading2']))
-    
-    elements.append(Paragraph("Phased Implementation", styles['Heading3']))
-    elements.append(Paragraph(
-        """The Winner's Circle Club will be implemented in three distinct phases to ensure operational readiness, 
-        minimize disruption, and optimize the member experience:""", 
-        styles['Normal']
-    ))
-    
-    # Phase 1: Preparation
-    elements.append(Paragraph("Phase 1: Preparation (Months 1-3)", styles['Heading3']))
-    elements.append(Paragraph(
-        """This initial phase focuses on establishing the operational foundation for the club.""", 
-        styles['Normal']
-    ))
+    return drawing
+
+# Create a tornado chart for one outcome ('roi' or 'payback_month') of a sensitivity run
+def create_tornado_chart(sensitivity, outcome, value_format, cap=None):
+    import numpy as np
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.shapes import Drawing, Line, Rect, String
+    from reportlab.lib import colors
+    format_value = {
+        'percent': lambda value: percent(value, 0),
+        'month': lambda value: f"Month {round(value)}",
+    }[value_format]
+    rows = sensitivity['rows']
+    baseline = sensitivity[f'baseline_{outcome}']
+    
+    def clean(value):
+        return cap if cap is not None and not np.isfinite(value) else float(value)
+    outcomes = [(clean(row[outcome][0]), clean(row[outcome][1])) for row in rows]
+    lowest = min([baseline] + [min(pair) for pair in outcomes])
+    highest = max([baseline] + [max(pair) for pair in outcomes])
+    span = (highest - lowest) or 1
+    
+    row_height = 22
+    left, width = 190, 270
+    drawing = Drawing(500, 70 + row_height * len(rows))
+    top = drawing.height - 30
+    
+    def x(value):
+        return left + (value - lowest) / span * width
+    
+    for i, (row, (low, high)) in enumerate(zip(rows, outcomes)):
+        y = top - (i + 1) * row_height
+        drawing.add(String(left - 8, y + 5, assumption_label(row['name']),
+                           fontName=FONTS['regular'], fontSize=8, textAnchor='end'))
+        drawing.add(String(left - 8, y - 4,
+                           f"{assumption(row['name'], row['low_value'])} to {assumption(row['name'], row['high_value'])}",
+                           fontName=FONTS['regular'], fontSize=7, fillColor=colors.darkgray, textAnchor='end'))
+        for value, color in ((low, ACCENT_COLOR), (high, PRIMARY_COLOR)):
+            start, end = sorted((x(baseline), x(value)))
+            drawing.add(Rect(start, y - 4, max(end - start, 0.5), 14, fillColor=color, strokeColor=None))
+    
+    axis_y = top - (len(rows) + 1) * row_height + 4
+    drawing.add(Line(x(baseline), axis_y, x(baseline), top, strokeColor=DARK_BROWN, strokeWidth=1))
+    for value in (lowest, baseline, highest):
+        drawing.add(String(x(value), axis_y - 12, format_value(value),
+                           fontName=FONTS['regular'], fontSize=8, textAnchor='middle'))
     
-    phase1 = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Infrastructure Planning:</b> Finalize plans for club lounge, wine lockers, and other physical facilities", styles['Normal'])),
-            ListItem(Paragraph("<b>Technology Development:</b> Implement credit tracking system and member portal", styles['Normal'])),
-            ListItem(Paragraph("<b>Staffing:</b> Hire and train dedicated Club Manager to oversee the program", styles['Normal'])),
-            ListItem(Paragraph("<b>Marketing Materials:</b> Develop branding, collateral, and digital assets", styles['Normal'])),
-            ListItem(Paragraph("<b>Membership Structure:</b> Finalize pricing, benefits, and redemption policies", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(phase1)
+    legend = Legend()
+    legend.fontName = FONTS['chart']
+    legend.alignment = 'right'
+    legend.x = 400
+    legend.y = drawing.height - 2
+    legend.colorNamePairs = [(ACCENT_COLOR, 'Low value'), (PRIMARY_COLOR, 'High value')]
+    drawing.add(legend)
+    return drawing
+
+# Create a payback-month heatmap over the first two axes of a sweep.
+# Further axes are reduced to their median and large grids are sampled down to 30x30 cells.
+def create_payback_heatmap(names, axes, payback_month, years, max_cells=30):
+    import numpy as np
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.shapes import Drawing, Rect, String
+    from reportlab.lib import colors
+    payback = np.where(np.isfinite(payback_month), payback_month, np.inf)
+    if payback.ndim == 1:
+        payback = payback[:, None]
+        axes = [axes[0], np.array([np.nan])]
+        names = [names[0], None]
+    else:
+        payback = np.median(payback.reshape(payback.shape[:2] + (-1,)), axis=2)
+        axes = axes[:2]
+        names = names[:2]
+    
+    picks = [np.unique(np.linspace(0, len(axis) - 1, min(len(axis), max_cells)).round().astype(int)) for axis in axes]
+    payback = payback[np.ix_(picks[0], picks[1])]
+    x_values, y_values = axes[0][picks[0]], axes[1][picks[1]]
+    
+    drawing = Drawing(500, 330)
+    left, bottom, width, height = 100, 60, 360, 240
+    cell_w, cell_h = width / len(x_values), height / len(y_values)
+    finite = payback[np.isfinite(payback)]
+    fastest, slowest = (finite.min(), finite.max()) if finite.size else (0, 1)
+    label_cells = len(x_values) * len(y_values) <= 100
+    
+    for i in range(len(x_values)):
+        for j in range(len(y_values)):
+            month = payback[i, j]
+            if np.isfinite(month):
+                fill = colors.linearlyInterpolatedColor(ACCENT_COLOR, DARK_BROWN, fastest, max(slowest, fastest + 1), month)
+            else:
+                fill = colors.lightgrey
+            drawing.add(Rect(left + i * cell_w, bottom + j * cell_h, cell_w, cell_h,
+                             fillColor=fill, strokeColor=colors.white, strokeWidth=0.5))
+            if label_cells:
+                drawing.add(String(left + (i + 0.5) * cell_w, bottom + (j + 0.5) * cell_h - 3,
+                                   str(int(month)) if np.isfinite(month) else '—',
+                                   fontName=FONTS['regular'], fontSize=7, textAnchor='middle',
+                                   fillColor=colors.white if month > (fastest + slowest) / 2 else colors.black))
+    
+    # Label at most six ticks per axis
+    for i in np.unique(np.linspace(0, len(x_values) - 1, min(len(x_values), 6)).round().astype(int)):
+        drawing.add(String(left + (i + 0.5) * cell_w, bottom - 12, assumption(names[0], x_values[i]),
+                           fontName=FONTS['regular'], fontSize=7, textAnchor='middle'))
+    drawing.add(String(left + width / 2, bottom - 28, assumption_label(names[0]),
+                       fontName=FONTS['bold'], fontSize=9, textAnchor='middle'))
+    if names[1] is not None:
+        for j in np.unique(np.linspace(0, len(y_values) - 1, min(len(y_values), 6)).round().astype(int)):
+            drawing.add(String(left - 6, bottom + (j + 0.5) * cell_h - 3, assumption(names[1], y_values[j]),
+                               fontName=FONTS['regular'], fontSize=7, textAnchor='end'))
+        drawing.add(String(left, bottom + height + 10, assumption_label(names[1]),
+                           fontName=FONTS['bold'], fontSize=9, textAnchor='middle'))
     
-    # Phase 2: Soft Launch
-    elements.append(Paragraph("Phase 2: Soft Launch (Months 4-6)", styles['Heading3']))
-    elements.append(Paragraph(
-        """The soft launch phase introduces the club to a limited audience of existing premium members.""", 
-        styles['Normal']
-    ))
+    legend = Legend()
+    legend.fontName = FONTS['chart']
+    legend.alignment = 'right'
+    legend.x = 120
+    legend.y = 12
+    legend.columnMaximum = 1
+    legend.colorNamePairs = [(ACCENT_COLOR, f'Month {int(fastest)}'), (DARK_BROWN, f'Month {int(slowest)}'),
+                             (colors.lightgrey, f'Beyond Year {years}')]
+    drawing.add(legend)
+    return drawing
+
+# Chart builders a report spec can name in its chart blocks
+REPORT_CHARTS = {
+    'pie': create_pie_chart,
+    'bar': create_bar_chart,
+    'line': create_line_chart,
+}
+
+
+# Sections declared in the report spec, compiled once per process
+def report_plan(path=DEFAULT_SPEC):
+    return load_plan(path, REPORT_CHARTS)
+
+
+# Build shared styles and the static report sections up front, e.g. in a batch worker initializer
+def warm_report():
+    warm_theme()
+    report_plan()
+
+
+# Source files and fonts whose change invalidates every memoized build node
+def report_version():
+    package = os.path.dirname(os.path.abspath(winners_circle.__file__))
+    sources = sorted(os.path.join(package, name) for name in os.listdir(package) if name.endswith('.py'))
+    return code_version([os.path.abspath(__file__), DEFAULT_SPEC] + sources) + ''.join(
+        f":{name}" for name in FONTS.values())
+
+
+# Only the named entries of a mapping, so a node depends on exactly what it prints
+def subset(mapping, *names):
+    return {name: mapping[name] for name in names}
+
+
+# The entries of the report context a spec section binds, in a fixed order so node keys are stable
+def section_context(section, context):
+    return subset(context, *sorted(report_plan().bindings(section)))
+
+
+# A simulation or sweep result without its run timings, which would otherwise change every node key
+def without_timings(result):
+    if result is None:
+        return None
+    return {name: value for name, value in result.items() if name not in ('elapsed', 'workers', 'throughput')}
+
+
+def payback_phrase(payback, years):
+    return f"approximately {int(payback)} months" if payback == payback else f"beyond the {years}-year projection period"
+
+
+# Every figure in the report comes from a single projection of the assumptions
+def projection(assumptions, years):
+    return scenario(project(assumptions, months=years * 12))
+
+
+# Member lifetime value over the projection horizon, from retention cohorts (see winners_circle/cohorts.py).
+# Each tier is a node of its own keyed on the assumptions that shape its population. The Winners Circle
+# population is drawn with a quarterly value of 1 and scaled to the member value in cohort_lifetime_values, so
+# a change to the fee or the accommodation assumptions does not draw it again.
+def winners_circle_cohorts(assumptions, years, cohort_members):
+    from winners_circle.cohorts import synthetic_winners_circle, cohort_analysis
+    population = synthetic_winners_circle(assumptions, members=cohort_members, quarters=years * 4, annual_value=4)
+    return cohort_analysis(population, horizon=years * 4)
+
+
+def traditional_cohorts(assumptions, years, cohort_members):
+    from winners_circle.cohorts import synthetic_traditional, cohort_analysis
+    return cohort_analysis(synthetic_traditional(assumptions, members=cohort_members, quarters=years * 4),
+                           horizon=years * 4)
+
+
+# Winners Circle cohorts from the ledger, or None before it holds any grants; ledger_state is the store's
+# (directory, store_id, rows), which identifies its contents because the ledger is append-only
+def ledger_cohorts(ledger_state, years):
+    from winners_circle.cohorts import members_from_ledger, cohort_analysis
+    from winners_circle.ledger_store import LedgerStore
+    members = members_from_ledger(LedgerStore(ledger_state[0]))
+    return cohort_analysis(members, horizon=years * 4) if len(members['join']) else None
+
+
+# Ledger members replace the synthetic Winners Circle members once the ledger has any
+def cohort_lifetime_values(traditional, winners_circle, ledger, member_value):
+    from winners_circle.cohorts import scaled_lifetime_values, merge_cohort_analyses
+    if ledger is not None:
+        return merge_cohort_analyses(traditional, ledger)
+    winners_circle = dict(winners_circle, segments={
+        segment: scaled_lifetime_values(result, member_value / 4)
+        for segment, result in winners_circle['segments'].items()})
+    return merge_cohort_analyses(traditional, winners_circle)
+
+
+# Title Page
+def title_page(club_name, estate):
+    styles = get_styles()
+    elements = []
     
-    phase2 = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Initial Member Recruitment:</b> Target and convert top tier existing members", styles['Normal'])),
-            ListItem(Paragraph("<b>Facilities Completion:</b> Complete club lounge and essential infrastructure", styles['Normal'])),
-            ListItem(Paragraph("<b>Experience Testing:</b> Refinement of member journey and service standards", styles['Normal'])),
-            ListItem(Paragraph("<b>System Optimization:</b> Troubleshoot technology and operational processes", styles['Normal'])),
-            ListItem(Paragraph("<b>Feedback Collection:</b> Gather and implement early member suggestions", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(phase2)
+    elements.append(Paragraph(club_name, styles['Title']))
+    elements.append(Paragraph("Comprehensive Analysis Report", styles['WC_Subtitle']))
+    elements.append(Spacer(1, 2*inch))
     
-    # Phase 3: Full Implementation
-    elements.append(Paragraph("Phase 3: Full Implementation (Months 7-12)", styles['Heading3']))
-    elements.append(Paragraph(
-        """The final phase scales the program to its full operational capacity.""", 
-        styles['Normal']
-    ))
+    # Create a placeholder for the winery logo image
+    # Uncomment and modify path if you have a logo
+    # logo = Image("path_to_logo.png", width=3*inch, height=1.5*inch)
+    # elements.append(logo)
     
-    phase3 = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Full Market Launch:</b> Open general enrollment and implement marketing campaign", styles['Normal'])),
-            ListItem(Paragraph("<b>Complete Infrastructure:</b> Finalize all physical facilities and technology integration", styles['Normal'])),
-            ListItem(Paragraph("<b>Staff Expansion:</b> Add support personnel as membership grows", styles['Normal'])),
-            ListItem(Paragraph("<b>Programming Enhancement:</b> Establish full calendar of member events and experiences", styles['Normal'])),
-            ListItem(Paragraph("<b>Continuous Improvement:</b> Implement feedback mechanisms and refinement processes", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(phase3)
+    elements.append(Spacer(1, 2*inch))
+    elements.append(Paragraph(f"Prepared for {estate}", styles['Normal']))
+    elements.append(Paragraph(f"April 2025", styles['Normal']))
     
-    elements.append(Paragraph("Resource Requirements", styles['Heading3']))
-    elements.append(Paragraph(
-        """Successful implementation of the Winner's Circle Club will require the following key investments:""", 
-        styles['Normal']
-    ))
+    elements.append(PageBreak())
     
-    # Create a table for resource requirements
-    resource_data = [
-        ["Category", "Investment", "Details"],
-        ["Physical Infrastructure", "$175,000", "Club lounge, wine lockers, biometric access"],
-        ["Technology Systems", "$62,500", "Credit platform, member portal, reservations"],
-        ["Staffing", "$85,000", "Club Manager (shared operations)"],
-        ["Operations", "$87,500", "Inventory, service provisions, marketing"],
-        ["Total Investment", "$410,000", "First-year capital and operational expenses"],
-    ]
+    return elements
+
+
+# Executive Summary: headline revenue, membership, payback and lifetime value figures
+def executive_summary(context):
+    return report_plan().render('summary', context)
+
+
+# Table of Contents
+def table_of_contents():
+    styles = get_styles()
+    elements = []
     
-    resource_table = Table(resource_data, colWidths=[2*inch, 1.25*inch, 3.5*inch])
-    resource_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, -1), (-1, -1), LIGHT_COLOR),
-        ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ('WORDWRAP', (0, 0), (-1, -1), True),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-    ]))
-    
-    elements.append(resource_table)
+    elements.append(Paragraph("Table of Contents", styles['Heading2']))
     elements.append(Spacer(1, 0.2*inch))
     
-    elements.append(Paragraph("Implementation Milestones", styles['Heading3']))
-    
-    # Create a timeline visualization
-    timeline_data = [
-        ["Month 1-2", "Infrastructure planning & initial staffing"],
-        ["Month 3", "Technology development & membership structure finalization"],
-        ["Month 4", "Soft launch to select existing members"],
-        ["Month 5-6", "Refinement based on initial member feedback"],
-        ["Month 7-8", "Full market launch & marketing campaign"],
-        ["Month 9-10", "Expansion of programming & experiences"],
-        ["Month 11-12", "Optimization & preparation for Year 2 growth"],
-    ]
-    
-    timeline_table = Table(timeline_data, colWidths=[1.25*inch, 4.75*inch])
-    timeline_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-    ]))
-    
-    elements.append(timeline_table)
-    
+    # Entries and page numbers are filled in from the Heading2 paragraphs that follow (see winners_circle/toc.py)
+    elements.append(TableOfContents())
     elements.append(PageBreak())
     
-    # 5. Financial Assumptions
-    elements.append(Paragraph("5. Financial Assumptions", styles['Heading2']))
+    return elements
+
+
+# 1. Club Concept and Structure: static narrative, pre-built once per process (see winners_circle/specs/report.json)
+def club_concept():
+    return report_plan().render('concept')
+
+
+# 2. Membership Growth Projections: assumption table and charts bound to the projection
+def membership_growth(context):
+    return report_plan().render('growth', context)
+
+
+# 3. Revenue Analysis: revenue streams and growth, and the simulated scenario range when one was run
+def revenue_analysis(years, inputs, model, simulation):
+    import numpy as np
+    styles = get_styles()
+    charts = get_chart_cache()
+    year_labels = [f'Year {year}' for year in range(1, years + 1)]
+    elements = report_plan().render('revenue_streams', inputs)
+
+    # Create a table for revenue projections
+    revenue_data = [["Year", "Members", "Direct Membership", "Beyond-Credit Purchases", "Accommodation", "Total Revenue"]]
+    for year in range(years):
+        revenue_data.append([
+            str(year + 1),
+            count(model['members'][year]),
+            currency(model['direct_revenue'][year]),
+            currency(model['beyond_credit_revenue'][year]),
+            currency(model['accommodation_revenue'][year]),
+            currency(model['revenue'][year]),
+        ])
     
-    elements.append(Paragraph("Core Membership Assumptions", styles['Heading3']))
-    elements.append(Paragraph(
-        """Our financial projections are based on the following core assumptions regarding 
-        membership growth and retention:""", 
-        styles['Normal']
-    ))
+    revenue_table = Table(revenue_data)
+    revenue_table.setStyle(data_table_style(total_column=True))
     
-    # Core membership assumptions as bullet points
-    core_assumptions = ListFlowable(
-        [
-            ListItem(Paragraph("""<b>Initial Upgrade Rate:</b> We project 4% of existing club members will upgrade 
-            during the initial launch phase, driven by targeted promotional efforts and early adopter incentives.""", 
-            styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Ongoing Upgrade Rate:</b> Following the launch period, we expect a sustained 
-            2% annual upgrade rate from existing club members, focusing on the most engaged current members who 
-            demonstrate high utilization of current benefits.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Initial Visitor Conversion:</b> A conservative 0.5% conversion rate of non-club 
-            visitors is projected for Year 1, allowing time for program awareness to build and service standards 
-            to be refined.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Ongoing Visitor Conversion:</b> As program awareness grows and word-of-mouth 
-            referrals increase, we project conversion rates to reach 1% of non-club visitors annually.""", 
-            styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Annual Retention Rate:</b> Based on premium club industry benchmarks, we project 
-            a 92% annual retention rate, supported by high-touch service and continuous value enhancement.""", 
-            styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Growth Potential:</b> No membership cap has been applied as market analysis 
-            indicates the program will not reach saturation within the initial 4-year projection period.""", 
-            styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(core_assumptions)
+    elements.append(revenue_table)
     elements.append(Spacer(1, 0.2*inch))
     
-    elements.append(Paragraph("Revenue Assumptions", styles['Heading3']))
-    elements.append(Paragraph(
-        """Our revenue projections are built upon the following key assumptions:""", 
-        styles['Normal']
-    ))
-    
-    # Revenue assumptions as bullet points
-    revenue_assumptions = ListFlowable(
-        [
-            ListItem(Paragraph("""<b>Annual Membership Fee:</b> Members will be charged $2,000 annually, structured 
-            as quarterly payments of $500 to enhance affordability and cash flow management.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Beyond-Credit Purchases:</b> Members are projected to spend an additional 20% 
-            beyond their membership credits, driven by special events, limited releases, and premium experiences.""", 
-            styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Accommodation Utilization:</b> We project 10% of members will utilize 
-            accommodation benefits, with an average stay of 3 nights at $300 per night.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Pricing Strategy:</b> Taking a conservative approach, no price increases are 
-            projected during the initial 4-year period, though market conditions may present opportunities for 
-            selective increases.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Credit Utilization:</b> We assume 100% credit redemption, with no breakage 
-            benefit factored into financial projections, ensuring conservative revenue estimates.""", 
-            styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(revenue_assumptions)
-    elements.append(Spacer(1, 0.2*inch))
+    elements.append(Paragraph("Revenue Growth Trajectory", styles['Heading3']))
     
-    elements.append(Paragraph("Cost Assumptions", styles['Heading3']))
-    elements.append(Paragraph(
-        """Our cost and investment projections are based on the following key assumptions:""", 
-        styles['Normal']
+    # Create a bar chart for revenue growth
+    elements.append(charts.drawing(
+        create_bar_chart,
+        [[round(value) for value in model['revenue']]],
+        year_labels,
+        [PRIMARY_COLOR],
+        label_format='$%s',
+        bar_label_format='$%s',
     ))
+    elements.append(Paragraph("Total Projected Revenue by Year", styles['Caption']))
     
-    # Cost assumptions as bullet points
-    cost_assumptions = ListFlowable(
-        [
-            ListItem(Paragraph("""<b>Club Management:</b> A dedicated Club Manager position will be created with 
-            an annual salary of $85,000, with responsibilities shared across Milea Estate and Hudson Valley 
-            Vineyards to optimize resource utilization.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Staffing Efficiency:</b> The program is designed to operate without requiring 
-            additional full-time employees beyond the Club Manager, leveraging the existing operational team 
-            through enhanced training and systematic processes.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Physical Infrastructure:</b> A one-time capital investment of $175,000 will 
-            be required for facilities development, including the club lounge, wine storage lockers, and member 
-            access systems.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Technology Investment:</b> An initial investment of $62,500 will be allocated 
-            for technology systems, including the credit management platform, member portal, and integrated 
-            reservation systems.""", styles['Normal'])),
-            
-            ListItem(Paragraph("""<b>Ongoing Operations:</b> Annual operating costs of $87,500 are projected for 
-            marketing initiatives, facility maintenance, program materials, and ongoing member services.""", 
-            styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(cost_assumptions)
-    
-    elements.append(PageBreak())
-    
-    # 6. Key Recommendations
-    elements.append(Paragraph("6. Key Recommendations", styles['Heading2']))
+    # Scenario range from the Monte Carlo simulation, when one was run
+    if simulation is not None:
+        low_pct, mid_pct, high_pct = simulation['percentiles']
+        band_label = f"P{low_pct}-P{high_pct} range"
+        elements.append(PageBreak())
+        elements.append(Paragraph("Scenario Range", styles['Heading3']))
+        elements.append(Paragraph(
+            f"""The projections above follow a single set of assumptions. To gauge their uncertainty we simulated
+            {count(simulation['scenarios'])} scenarios, sampling upgrade and conversion rates, retention, Staatsburg
+            House utilization and nightly rate, and cost escalation from ranges around the baseline values. The charts
+            below show the median path together with the P{low_pct} to P{high_pct} band.""",
+            styles['Normal']
+        ))
+        elements.append(charts.drawing(create_fan_chart, simulation['members'], band_label=band_label))
+        elements.append(Paragraph("Simulated Membership by Year", styles['Caption']))
+        elements.append(charts.drawing(create_fan_chart, simulation['revenue'], label_format='$%s', band_label=band_label))
+        elements.append(Paragraph("Simulated Total Revenue by Year", styles['Caption']))
+        
+        def month_text(month):
+            return f"Month {int(month)}" if np.isfinite(month) else "Not reached"
+        scenario_data = [
+            ["Measure", f"P{low_pct}", f"P{mid_pct}", f"P{high_pct}"],
+            [f"Members (Year {years})"] + [count(value) for value in simulation['members'][:, -1]],
+            [f"Revenue (Year {years})"] + [currency(value) for value in simulation['revenue'][:, -1]],
+            ["Payback"] + [month_text(month) for month in simulation['payback_month']],
+        ]
+        scenario_table = Table(scenario_data)
+        scenario_table.setStyle(data_table_style('RIGHT'))
+        elements.append(scenario_table)
+        elements.append(Paragraph(
+            f"""{percent(simulation['payback_probability'])} of simulated scenarios recover the initial investment
+            within the {years}-year projection period.""",
+            styles['Normal']
+        ))
+        elements.append(PageBreak())
     
+    elements.append(Paragraph("Revenue Composition", styles['Heading3']))
     elements.append(Paragraph(
-        """Based on our comprehensive analysis, we recommend the following key actions to ensure 
-        the success of the Winner's Circle Club:""", 
+        f"""The following chart illustrates the breakdown of revenue streams over the projected {years}-year period:""",
         styles['Normal']
     ))
     
-    elements.append(Paragraph("Strategic Recommendations", styles['Heading3']))
-    
-    strategic = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Proceed with Implementation:</b> The financial projections and strategic benefits justify moving forward with the Winner's Circle concept", styles['Normal'])),
-            ListItem(Paragraph("<b>Phased Approach:</b> Adopt the proposed three-phase implementation to minimize disruption and optimize the member experience", styles['Normal'])),
-            ListItem(Paragraph("<b>Exclusive Positioning:</b> Maintain strict exclusivity to preserve the premium nature of the club", styles['Normal'])),
-            ListItem(Paragraph("<b>Infrastructure Investment:</b> Prioritize physical space enhancements to create tangible value for members", styles['Normal'])),
-            ListItem(Paragraph("<b>Dedicated Leadership:</b> Ensure the Club Manager position is filled with a hospitality professional who understands both wine and luxury service", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(strategic)
-    
-    elements.append(Paragraph("Operational Recommendations", styles['Heading3']))
-    
-    operational = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Technology First:</b> Prioritize the credit management system to ensure seamless tracking and redemption", styles['Normal'])),
-            ListItem(Paragraph("<b>Experience Mapping:</b> Create detailed service blueprints for all touchpoints in the member journey", styles['Normal'])),
-            ListItem(Paragraph("<b>Staff Training:</b> Implement comprehensive training for all team members who will interact with Winner's Circle members", styles['Normal'])),
-            ListItem(Paragraph("<b>Feedback Mechanisms:</b> Establish formal and informal channels for member input throughout the implementation", styles['Normal'])),
-            ListItem(Paragraph("<b>Metric Tracking:</b> Develop KPI dashboard to monitor critical success factors in real-time", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(operational)
-    
-    elements.append(Paragraph("Marketing Recommendations", styles['Heading3']))
-    
-    marketing = ListFlowable(
-        [
-            ListItem(Paragraph("<b>Targeted Approach:</b> Focus initial marketing efforts on existing premium club members and high-value visitors", styles['Normal'])),
-            ListItem(Paragraph("<b>Exclusivity Messaging:</b> Emphasize limited availability and exclusive access in all communications", styles['Normal'])),
-            ListItem(Paragraph("<b>Experience Showcase:</b> Create compelling visual content highlighting the unique aspects of membership", styles['Normal'])),
-            ListItem(Paragraph("<b>Referral Program:</b> Implement member incentives for successful referrals to accelerate growth", styles['Normal'])),
-            ListItem(Paragraph("<b>Digital Integration:</b> Ensure a seamless online presence with easy application process", styles['Normal'])),
-        ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(marketing)
-    
-    elements.append(Paragraph("Risk Mitigation", styles['Heading3']))
-    
-    risks = ListFlowable(
+    # Create a stacked bar chart for revenue composition
+    elements.append(charts.drawing(
+        create_bar_chart,
         [
-            ListItem(Paragraph("<b>Economic Sensitivity Plan:</b> Develop contingency strategies for potential economic downturns", styles['Normal'])),
-            ListItem(Paragraph("<b>Scalable Infrastructure:</b> Design systems and spaces that can adjust to varying membership levels", styles['Normal'])),
-            ListItem(Paragraph("<b>Value Enhancement:</b> Continuously evolve benefits to maintain perceived value", styles['Normal'])),
-            ListItem(Paragraph("<b>Competitive Monitoring:</b> Establish systems to track similar offerings that may emerge in the region", styles['Normal'])),
-            ListItem(Paragraph("<b>Financial Buffers:</b> Maintain conservative financial projections with appropriate reserves", styles['Normal'])),
+            [round(value) for value in model['direct_revenue']],  # Direct Membership
+            [round(value) for value in model['beyond_credit_revenue']],  # Beyond-Credit
+            [round(value) for value in model['accommodation_revenue']],  # Accommodation
         ],
-        bulletType='bullet',
-        leftIndent=20
-    )
-    elements.append(risks)
-    
-    elements.append(PageBreak())
-    
-    # Conclusion
-    elements.append(Paragraph("Conclusion", styles['Heading2']))
-    
-    elements.append(Paragraph(
-        """The Winner's Circle Club represents a strategic opportunity for Milea Estate to elevate its brand 
-        positioning, substantially increase revenue, and create deeper relationships with its most valuable 
-        customers. By transitioning from a traditional wine club model to a comprehensive lifestyle membership, 
-        Milea can differentiate itself within the competitive Hudson Valley wine region while substantially 
-        increasing the lifetime value of each member.""", 
-        styles['Normal']
+        year_labels,
+        [PRIMARY_COLOR, SECONDARY_COLOR, ACCENT_COLOR],
+        label_format='$%s',
+        stacked=True,
+        legend_labels=['Direct Membership', 'Beyond-Credit Purchases', 'Accommodation'],
     ))
+    elements.append(Paragraph("Revenue Composition by Stream", styles['Caption']))
     
-    elements.append(Paragraph(
-        """Our financial analysis indicates strong revenue potential, with projected growth from $159,360 in Year 1 
-        to $699,986 by Year 4. The investment requirements are significant but justified by the estimated 28-month 
-        payback period and the strategic brand enhancement that will result.""", 
-        styles['Normal']
-    ))
+    return elements
+
+
+# 3. Revenue Analysis: member lifetime value by tier and acquisition channel
+def member_lifetime_value(years, cohorts):
+    from winners_circle.cohorts import LTV_PERCENTILES, WINNERS_CIRCLE, TRADITIONAL
+    styles = get_styles()
+    charts = get_chart_cache()
+    member_ltv = cohorts['segments'][(WINNERS_CIRCLE, None)]
+    traditional_ltv = cohorts['segments'][(TRADITIONAL, None)]
+    elements = []
     
+    elements.append(Paragraph("Member Lifetime Value", styles['Heading3']))
     elements.append(Paragraph(
-        """Through careful implementation following the phased approach outlined in this report, Milea Estate can 
-        minimize operational disruption while creating an exceptional premium experience for members. The Winner's 
-        Circle Club has the potential to transform Milea's business model while setting a new standard for wine 
-        country experiences in the Hudson Valley region.""", 
+        f"""Lifetime value is estimated from member cohorts grouped by join quarter. Each segment's survival curve
+        (the share of members still active each quarter after joining) is measured over the {years}-year horizon and
+        extended with a fitted quarterly retention rate where cohorts are not yet fully observed. Winner's Circle
+        members retain at an effective {percent(member_ltv['annual_retention'])} a year against
+        {percent(traditional_ltv['annual_retention'])} for traditional club members, and their expected {years}-year
+        value is {currency(member_ltv['expected_ltv'])}, {member_ltv['expected_ltv'] / traditional_ltv['expected_ltv']:.1f}
+        times the {currency(traditional_ltv['expected_ltv'])} of a traditional member.""",
         styles['Normal']
     ))
     
-    elements.append(Spacer(1, 0.5*inch))
+    ltv_data = [["Segment", "Members", "Annual Retention", "Expected LTV", "P10", "Median", "P90"]]
+    for (tier, channel), segment in cohorts['segments'].items():
+        ltv_data.append([
+            f"{tier}: {channel}" if channel else tier,
+            count(segment['members']),
+            percent(segment['annual_retention']),
+            currency(segment['expected_ltv']),
+        ] + [currency(segment['percentiles'][q]) for q in LTV_PERCENTILES])
+    ltv_table = Table(ltv_data)
+    ltv_table.setStyle(data_table_style('RIGHT', header_font_size=9))
+    elements.append(ltv_table)
+    elements.append(Spacer(1, 0.1*inch))
+    
+    elements.append(charts.drawing(
+        create_survival_chart,
+        [member_ltv['survival'], traditional_ltv['survival']],
+        [WINNERS_CIRCLE, TRADITIONAL],
+    ))
+    elements.append(Paragraph("Member Survival by Quarter Since Joining", styles['Caption']))
     
-    elements.append(PageBreak())
+    return elements
+
+
+# 3. Revenue Analysis: financial impact of the revenue growth, lifetime value and payback
+def financial_impact(context):
+    return report_plan().render('impact', context)
+
+
+# 4. Implementation Strategy: static phases, resource and milestone tables
+def implementation_strategy():
+    return report_plan().render('implementation')
+
+
+# 5. Financial Assumptions: membership, revenue and cost assumptions bound to the resolved inputs
+def financial_assumptions(context):
+    return report_plan().render('assumptions', context)
+
+
+# 6. Key Recommendations: static strategic, operational, marketing and risk lists
+def key_recommendations():
+    return report_plan().render('recommendations')
+
+
+# Conclusion: closing narrative bound to the revenue range and payback
+def conclusion(context):
+    return report_plan().render('conclusion', context)
+
+
+# Appendix - Financial details
+def financial_appendix(years, beyond_credit_rate, model):
+    styles = get_styles()
+    year_labels = [f'Year {year}' for year in range(1, years + 1)]
+    payback = model['payback_month']
+    payback_text = payback_phrase(payback, years)
+    payback_year = int(payback - 1) // 12 + 1 if payback == payback else None
+    elements = []
     
-    # Appendix - Financial details
     elements.append(Paragraph("Appendix: Detailed Financial Projections", styles['Heading2']))
     
     elements.append(Paragraph("Detailed Membership Growth Projections", styles['Heading3']))
     
     # Create a detailed membership projection table
-    detailed_members = [
-        ["Year", "Starting Members", "Upgrades", "New Conversions", "Attritions", "Net New", "Ending Total"],
-        ["1", "0", "24", "40", "0", "64", "64"],
-        ["2", "64", "14", "80", "5", "89", "153"],
-        ["3", "153", "14", "80", "12", "82", "235"],
-        ["4", "235", "14", "80", "19", "75", "310"],
-    ]
+    detailed_members = [["Year", "Starting Members", "Upgrades", "New Conversions", "Attritions", "Net New", "Ending Total"]]
+    for year in range(years):
+        detailed_members.append([str(year + 1)] + [
+            count(model[name][year])
+            for name in ('starting_members', 'upgrades', 'conversions', 'attrition', 'net_new', 'members')
+        ])
     
     members_table = Table(detailed_members)
-    members_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 1), (0, -1), LIGHT_COLOR),
-    ]))
+    members_table.setStyle(data_table_style())
     
     elements.append(members_table)
     elements.append(Spacer(1, 0.2*inch))
@@ -988,29 +702,25 @@ def create_winners_circle_report(output_filename='Winners_Circle_Analysis.pdf'):
     elements.append(Paragraph("Detailed Revenue Projections", styles['Heading3']))
     
     # Create a detailed revenue table
-    detailed_revenue = [
-        ["Year", "Members", "Direct Membership", "Beyond-Credit (20%)", "Accommodation", "Total Revenue", "YoY Growth"],
-        ["1", "64", "$128,000", "$25,600", "$5,760", "$159,360", "—"],
-        ["2", "153", "$306,000", "$61,200", "$13,770", "$380,970", "139.1%"],
-        ["3", "235", "$470,000", "$94,000", "$21,150", "$585,150", "53.6%"],
-        ["4", "310", "$620,000", "$124,000", "$27,900", "$771,900", "31.9%"],
-        ["Total", "—", "$1,524,000", "$304,800", "$68,580", "$1,897,380", "—"],
-    ]
+    detailed_revenue = [["Year", "Members", "Direct Membership", f"Beyond-Credit ({percent(beyond_credit_rate)})", "Accommodation", "Total Revenue", "YoY Growth"]]
+    for year in range(years):
+        growth = percent(model['revenue'][year] / model['revenue'][year - 1] - 1) if year else "—"
+        detailed_revenue.append([
+            str(year + 1),
+            count(model['members'][year]),
+            currency(model['direct_revenue'][year]),
+            currency(model['beyond_credit_revenue'][year]),
+            currency(model['accommodation_revenue'][year]),
+            currency(model['revenue'][year]),
+            growth,
+        ])
+    detailed_revenue.append(["Total", "—"] + [
+        currency(model[name].sum())
+        for name in ('direct_revenue', 'beyond_credit_revenue', 'accommodation_revenue', 'revenue')
+    ] + ["—"])
     
     revenue_detail_table = Table(detailed_revenue)
-    revenue_detail_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 1), (0, -1), LIGHT_COLOR),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),
-    ]))
+    revenue_detail_table.setStyle(data_table_style('RIGHT', total_row=True))
     
     elements.append(revenue_detail_table)
     elements.append(Spacer(1, 0.2*inch))
@@ -1019,74 +729,536 @@ def create_winners_circle_report(output_filename='Winners_Circle_Analysis.pdf'):
     
     # Create an ROI analysis table
     roi_data = [
-        ["Category", "Year 1", "Year 2", "Year 3", "Year 4", "Total"],
-        ["Revenue", "$159,360", "$380,970", "$585,150", "$771,900", "$1,897,380"],
-        ["Initial Investment", "$(410,000)", "—", "—", "—", "$(410,000)"],
-        ["Ongoing Costs", "$(87,500)", "$(90,125)", "$(92,829)", "$(95,613)", "$(366,067)"],
-        ["Net Cash Flow", "$(338,140)", "$290,845", "$492,321", "$676,287", "$1,121,313"],
-        ["Cumulative Cash Flow", "$(338,140)", "$(47,295)", "$445,026", "$1,121,313", "—"],
+        ["Category"] + year_labels + ["Total"],
+        ["Revenue"] + [currency(value) for value in model['revenue']] + [currency(model['revenue'].sum())],
+        ["Initial Investment"] + [currency(-value) if value else "—" for value in model['investment']] + [currency(-model['investment'].sum())],
+        ["Ongoing Costs"] + [currency(-value) for value in model['operating_costs']] + [currency(-model['operating_costs'].sum())],
+        ["Net Cash Flow"] + [currency(value) for value in model['net_cash_flow']] + [currency(model['net_cash_flow'].sum())],
+        ["Cumulative Cash Flow"] + [currency(value) for value in model['cumulative_cash_flow']] + ["—"],
     ]
     
     roi_table = Table(roi_data)
-    roi_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 1), (0, -1), LIGHT_COLOR),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('FONT', (0, -1), (-1, -1), 'Helvetica-Bold'),
-    ]))
+    roi_table.setStyle(data_table_style('RIGHT', total_row=True))
     
     elements.append(roi_table)
     elements.append(Spacer(1, 0.2*inch))
     
     elements.append(Paragraph(
-        """ROI Analysis Summary: The Winner's Circle Club is projected to reach a positive cumulative cash flow 
-        in Year 3, with a payback period of approximately 28 months from initial investment. By Year 4, the 
-        cumulative cash flow reaches $1,121,313, representing a robust return on the initial investment.""", 
+        (f"""ROI Analysis Summary: The Winner's Circle Club is projected to reach a positive cumulative cash flow
+        in Year {payback_year}, with a payback period of {payback_text} from initial investment. """
+         if payback_year else
+         f"""ROI Analysis Summary: The Winner's Circle Club is not projected to reach a positive cumulative cash flow
+        within the {years}-year projection period. """) +
+        f"""By Year {years}, the cumulative cash flow reaches {currency(model['cumulative_cash_flow'][-1])}.""",
         styles['Normal']
     ))
     
-    # Build the document
-    doc.build(elements)
+    return elements
+
+
+# Appendix: Winner's Circle cohort retention by join quarter, at each anniversary
+def cohort_retention(years, matrix):
+    import numpy as np
+    styles = get_styles()
+    elements = []
     
-    print(f"Report successfully generated: {output_filename}")
+    elements.append(Paragraph("Cohort Retention by Join Quarter", styles['Heading3']))
+    anniversaries = [4 * year for year in range(1, years)]
+    cohort_data = [["Join Quarter", "Cohort Size"] + [f"After {year // 4} Year{'s' if year > 4 else ''}" for year in anniversaries]]
+    retention = matrix['retention']
+    for quarter, size in enumerate(matrix['cohort_size']):
+        shares = [retention[quarter][age] if age < retention.shape[1] else np.nan for age in anniversaries]
+        cohort_data.append([f"Year {quarter // 4 + 1} Q{quarter % 4 + 1}", count(size)] +
+                           [percent(share) if share == share else "—" for share in shares])
+    cohort_table = Table(cohort_data, repeatRows=1)
+    cohort_table.setStyle(data_table_style())
+    elements.append(cohort_table)
+    
+    return elements
+
+
+# Month-by-month projection, drawn from the projection arrays as a page-splitting table
+def monthly_detail_section(years, model, chart_workers):
+    import numpy as np
+    styles = get_styles()
+    charts = get_chart_cache()
+    elements = []
+    
+    elements.append(PageBreak())
+    elements.append(Paragraph("Monthly Projection Detail", styles['Heading3']))
+    months = np.arange(1, years * 12 + 1)
+    monthly_net = model['monthly_revenue'] - model['monthly_costs']
+    
+    # Monthly charts are drawn with matplotlib (on chart_workers processes) and embedded from memory
+    primary, secondary = ('#' + color.hexval()[2:] for color in (PRIMARY_COLOR, SECONDARY_COLOR))
+    monthly_operating = model['monthly_costs'].copy()
+    monthly_operating[0] -= model['investment'][0]
+    month_ticks = list(range(0, years * 12 + 1, 6))
+    monthly_charts = render_charts([
+        {
+            'x': months,
+            'series': [
+                {'y': model['monthly_revenue'], 'color': primary, 'label': 'Revenue'},
+                {'y': monthly_operating, 'color': secondary, 'label': 'Operating Costs', 'linestyle': '--'},
+            ],
+            'title': 'Monthly Revenue and Operating Costs',
+            'xlabel': 'Month',
+            'xticks': month_ticks,
+            'y_format': 'dollars',
+            'size': (8, 3.5),
+        },
+        {
+            'x': months,
+            'series': [{'y': model['monthly_cumulative_cash_flow'], 'color': primary}],
+            'title': 'Cumulative Cash Flow',
+            'xlabel': 'Month',
+            'xticks': month_ticks,
+            'y_format': 'dollars',
+            'zero_line': True,
+            'size': (8, 3.5),
+        },
+    ], workers=chart_workers, cache=charts)['images']
+    for image in monthly_charts:
+        elements.append(png_flowable(image, 6.5*inch))
+    elements.append(Spacer(1, 0.2*inch))
+    elements.append(ArrayTable(
+        ["Month", "Year", "Members", "Revenue", "Costs", "Net Cash Flow", "Cumulative Cash Flow"],
+        [months, (months - 1) // 12 + 1, model['monthly_members'], model['monthly_revenue'],
+         model['monthly_costs'], monthly_net, model['monthly_cumulative_cash_flow']],
+        formats=[str, str, count, currency, currency, currency, currency],
+        col_widths=[0.6*inch, 0.6*inch, 0.9*inch, 1.05*inch, 1.05*inch, 1.15*inch, 1.45*inch],
+        total_row=["Total", "—", "—", currency(model['monthly_revenue'].sum()),
+                   currency(model['monthly_costs'].sum()), currency(monthly_net.sum()), "—"],
+    ))
+    
+    return elements
+
+
+# Sensitivity and grid sweep results
+def sensitivity_appendix(years, sensitivity, sweep):
+    styles = get_styles()
+    charts = get_chart_cache()
+    elements = []
+    
+    elements.append(PageBreak())
+    elements.append(Paragraph("Appendix: Sensitivity Analysis", styles['Heading2']))
+    
+    if sensitivity is not None:
+        elements.append(Paragraph("Key Driver Sensitivity", styles['Heading3']))
+        elements.append(Paragraph(
+            f"""Each driver below is moved to the low and high end of its plausible range while every other
+            assumption stays at its baseline. Bars show the resulting change in Year {years} return on investment
+            (cumulative cash flow relative to the initial investment) and in the payback month.""",
+            styles['Normal']
+        ))
+        elements.append(charts.drawing(create_tornado_chart, sensitivity, 'roi', 'percent'))
+        elements.append(Paragraph(f"Year {years} ROI Sensitivity by Driver", styles['Caption']))
+        elements.append(charts.drawing(create_tornado_chart, sensitivity, 'payback_month', 'month', cap=years * 12))
+        elements.append(Paragraph(
+            f"Payback Month Sensitivity by Driver (scenarios beyond Year {years} shown at month {years * 12})",
+            styles['Caption']
+        ))
+    
+    if sweep is not None:
+        elements.append(Paragraph("Payback Period Grid", styles['Heading3']))
+        elements.append(Paragraph(
+            f"""The grid below shows the payback month across {count(sweep['points'])} combinations of
+            {' and '.join(assumption_label(name).lower() for name in sweep['names'])}.""",
+            styles['Normal']
+        ))
+        elements.append(charts.drawing(create_payback_heatmap, sweep['names'], sweep['axes'], sweep['payback_month'], years))
+        elements.append(Paragraph("Payback Month by Assumption Pair", styles['Caption']))
+    
+    return elements
+
+
+# Quarterly member activity, aggregated from a columnar ledger store; ledger_state is as for cohort_lifetime_values
+def member_activity(ledger_state, annual_fee):
+    from winners_circle.aggregates import IncrementalAggregates
+    from winners_circle.ledger_store import LedgerStore
+    styles = get_styles()
+    store = LedgerStore(ledger_state[0])
+    elements = []
+    
+    # Quarterly activity, balances and yearly actuals come from incremental aggregates kept next to the store,
+    # which fold in only the rows appended since the last report (see winners_circle/aggregates.py)
+    aggregates = IncrementalAggregates(store)
+    aggregates.refresh()
+    quarterly = aggregates.by_quarter()
+    balances = aggregates.by_member()
+    staatsburg = quarterly['categories'].index('Staatsburg House') if 'Staatsburg House' in quarterly['categories'] else None
+    elements.append(PageBreak())
+    elements.append(Paragraph("Appendix: Member Activity", styles['Heading2']))
+    outstanding = balances['balance'][balances['balance'] > 0]
+    elements.append(Paragraph(
+        f"""The member ledger holds {count(store.rows)} transactions for {count(len(balances['member_ids']))} members.
+        {count(len(outstanding))} members carry unredeemed credit totalling {currency(outstanding.sum())}
+        (an average of {currency(outstanding.mean() if len(outstanding) else 0)} each).""",
+        styles['Normal']
+    ))
+    activity_data = [["Quarter", "Active Members", "Credits Granted", "Credits Redeemed", "Redemption Rate", "Staatsburg House"]]
+    for index, quarter in enumerate(quarterly['quarters']):
+        granted = quarterly['granted'][index]
+        redeemed = quarterly['redeemed'][index]
+        activity_data.append([
+            quarter,
+            count(quarterly['active_members'][index]),
+            currency(granted),
+            currency(redeemed),
+            percent(redeemed / granted) if granted else "—",
+            currency(quarterly['redeemed_by_category'][index][staatsburg]) if staatsburg is not None else "—",
+        ])
+    activity_data.append(["Total", "—", currency(quarterly['granted'].sum()), currency(quarterly['redeemed'].sum()),
+                          percent(quarterly['redeemed'].sum() / quarterly['granted'].sum()) if quarterly['granted'].sum() else "—",
+                          currency(quarterly['redeemed_by_category'][:, staatsburg].sum()) if staatsburg is not None else "—"])
+    activity_table = Table(activity_data, repeatRows=1)
+    activity_table.setStyle(data_table_style('RIGHT', total_row=True, header_font_size=9))
+    elements.append(activity_table)
+    
+    actuals = aggregates.actuals()
+    if actuals['years']:
+        elements.append(Paragraph("Membership by Year (Actuals)", styles['Heading3']))
+        actual_members = [["Year", "Starting Members", "New Members", "Attritions", "Net New", "Ending Total"]]
+        for index, year in enumerate(actuals['years']):
+            actual_members.append([str(year)] + [
+                count(actuals[name][index])
+                for name in ('starting_members', 'new_members', 'attrition', 'net_new', 'members')
+            ])
+        actual_members_table = Table(actual_members)
+        actual_members_table.setStyle(data_table_style())
+        elements.append(actual_members_table)
+        elements.append(Spacer(1, 0.2*inch))
+        
+        elements.append(Paragraph("Revenue by Year (Actuals)", styles['Heading3']))
+        actual_revenue = [["Year", "Members", "Direct Membership", "Credits Redeemed", "Beyond-Credit", "Accommodation"]]
+        for index, year in enumerate(actuals['years']):
+            actual_revenue.append([
+                str(year),
+                count(actuals['members'][index]),
+                currency(actuals['members'][index] * annual_fee),
+                currency(actuals['credits_redeemed'][index]),
+                currency(actuals['beyond_credit_spend'][index]),
+                currency(actuals['accommodation_revenue'][index]),
+            ])
+        actual_revenue_table = Table(actual_revenue)
+        actual_revenue_table.setStyle(data_table_style('RIGHT'))
+        elements.append(actual_revenue_table)
+        elements.append(Spacer(1, 0.2*inch))
+        
+        elements.append(Paragraph("Cohort Retention (Actuals)", styles['Heading3']))
+        retention_data = [["Cohort", "Members"] + [str(year) for year in actuals['years']]]
+        for index, year in enumerate(actuals['years']):
+            if not actuals['cohort_size'][index]:
+                continue
+            retention_data.append([str(year), count(actuals['cohort_size'][index])] + [
+                percent(share, 0) if later >= index else "—"
+                for later, share in enumerate(actuals['cohort_retention'][index])
+            ])
+        retention_table = Table(retention_data)
+        retention_table.setStyle(data_table_style())
+        elements.append(retention_table)
+    
+    return elements
+
+
+def create_winners_circle_report(output_filename='Winners_Circle_Analysis.pdf', assumptions=None, years=4,
+                                 simulation=None, sensitivity=None, sweep=None,
+                                 club_name='Winners Circle Club', estate='Milea Estate Vineyard', ledger=None,
+                                 monthly_detail=False, chart_workers=1, ledger_store=None, cohort_members=100_000,
+                                 build_graph=None, compression_level=None, exports=None):
+    # Sections are memoized nodes keyed by their inputs (see winners_circle/build_graph.py)
+    from winners_circle.cohorts import (annual_member_value, WINNERS_CIRCLE, TRADITIONAL, WINNERS_CIRCLE_ASSUMPTIONS,
+                                        VALUE_ASSUMPTIONS, TRADITIONAL_ASSUMPTIONS)
+    from winners_circle.ledger_store import LedgerStore
+    graph = build_graph if build_graph is not None else BuildGraph(version=report_version())
+    resolved = resolve_assumptions(assumptions)
+    inputs = {name: float(values[0]) for name, values in resolved.items()}
+    model = graph.node('projection', projection, resolved, years)
+    store = LedgerStore(ledger_store) if isinstance(ledger_store, str) else ledger_store
+    ledger_state = (store.directory, store.store_id, store.rows) if store is not None else None
+    ledger_members = None
+    if ledger_state is not None:
+        ledger_members = graph.node('ledger_cohorts', ledger_cohorts, ledger_state, years)
+    winners_circle_members = None
+    if ledger_members is None:
+        winners_circle_members = graph.node('winners_circle_cohorts', winners_circle_cohorts,
+                                            subset(resolved, *WINNERS_CIRCLE_ASSUMPTIONS), years, cohort_members)
+    traditional_members = graph.node('traditional_cohorts', traditional_cohorts,
+                                     subset(resolved, *TRADITIONAL_ASSUMPTIONS), years, cohort_members)
+    cohorts = graph.node('cohorts', cohort_lifetime_values, traditional_members, winners_circle_members,
+                         ledger_members, annual_member_value(subset(resolved, *VALUE_ASSUMPTIONS)))
+    member_ltv = cohorts['segments'][(WINNERS_CIRCLE, None)]
+    traditional_ltv = cohorts['segments'][(TRADITIONAL, None)]
+    payback = model['payback_month']
+    
+    # JSON, XLSX and data shard exports are written from the same projection as the PDF (see winners_circle/exports.py)
+    if exports:
+        from winners_circle.exports import write_exports
+        with span('export', 'phase'):
+            exported = write_exports(exports, model, inputs, years, without_timings(simulation))
+        if 'shards' in exported:
+            shards = exported['shards']
+            print(f"Data shards in {exports['shards']}: {len(shards['written'])} written, "
+                  f"{len(shards['unchanged'])} unchanged")
+    
+    # Set up the document; output_filename may be a path or any writable file-like object.
+    # With a compression level the PDF is written uncompressed into memory, then deduplicated and
+    # recompressed on its way to output_filename (see winners_circle/optimize.py)
+    target = io.BytesIO() if compression_level is not None else output_filename
+    doc = ReportDocTemplate(
+        target,
+        pagesize=letter,
+        rightMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        topMargin=0.75*inch,
+        bottomMargin=0.75*inch,
+        pageCompression=0 if compression_level is not None else None
+    )
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    styles = get_styles()
+    
+    # Values the spec sections bind (see winners_circle/specs/report.json)
+    context = {
+        **inputs,
+        'years': years,
+        'year_labels': [f'Year {year}' for year in range(1, years + 1)],
+        'quarterly_fee': inputs['annual_fee'] / 4,
+        'upgrade_rate': [inputs['initial_upgrade_rate']] + [inputs['ongoing_upgrade_rate']] * (years - 1),
+        'conversion_rate': [inputs['initial_conversion_rate']] + [inputs['ongoing_conversion_rate']] * (years - 1),
+        'upgrades': model['upgrades'],
+        'conversions': model['conversions'],
+        'new_members': model['new_members'],
+        'members': model['members'],
+        'member_counts': [round(n) for n in model['members']],
+        'cumulative_upgrades': [round(n) for n in model['upgrades'].cumsum()],
+        'cumulative_conversions': [round(n) for n in model['conversions'].cumsum()],
+        'first_members': model['members'][0],
+        'final_members': model['members'][-1],
+        'first_revenue': model['revenue'][0],
+        'final_revenue': model['revenue'][-1],
+        'revenue_growth': model['revenue'][-1] / model['revenue'][0] - 1,
+        'payback': payback_phrase(payback, years),
+        'member_ltv': member_ltv['expected_ltv'],
+        'traditional_ltv': traditional_ltv['expected_ltv'],
+    }
+    
+    elements += graph.node('title_page', title_page, club_name, estate)
+    elements += graph.node('executive_summary', executive_summary, section_context('summary', context))
+    elements += graph.node('table_of_contents', table_of_contents)
+    elements += graph.node('club_concept', club_concept)
+    elements += graph.node('membership_growth', membership_growth, section_context('growth', context))
+    elements += graph.node('revenue_analysis', revenue_analysis, years,
+                           subset(inputs, 'annual_fee', 'beyond_credit_rate', 'accommodation_utilization',
+                                  'accommodation_rate'),
+                           subset(model, 'members', 'direct_revenue', 'beyond_credit_revenue',
+                                  'accommodation_revenue', 'revenue'),
+                           without_timings(simulation))
+    elements += graph.node('member_lifetime_value', member_lifetime_value, years, cohorts)
+    elements += graph.node('financial_impact', financial_impact, section_context('impact', context))
+    elements += graph.node('implementation_strategy', implementation_strategy)
+    elements += graph.node('financial_assumptions', financial_assumptions, section_context('assumptions', context))
+    elements += graph.node('key_recommendations', key_recommendations)
+    elements += graph.node('conclusion', conclusion, section_context('conclusion', context))
+    elements += graph.node('financial_appendix', financial_appendix, years, inputs['beyond_credit_rate'], model)
+    elements += graph.node('cohort_retention', cohort_retention, years,
+                           cohorts['retention_matrices'][WINNERS_CIRCLE])
+    if monthly_detail:
+        elements += graph.node('monthly_detail', monthly_detail_section, years, model, chart_workers)
+    if sensitivity is not None or sweep is not None:
+        elements += graph.node('sensitivity_appendix', sensitivity_appendix, years, sensitivity,
+                               without_timings(sweep))
+    if store is not None:
+        elements += graph.node('member_activity', member_activity, ledger_state, inputs['annual_fee'])
+    
+    # Member credit ledgers are generated lazily while the document is laid out
+    appendix = ()
+    if ledger is not None:
+        elements += report_plan().render('ledger')
+        appendix = member_ledger_flowables(ledger, styles)
+    
+    # Build the document
+    collect_toc_entries(elements)
+    build_streaming(doc, elements, appendix)
+    if compression_level is not None:
+        from winners_circle.optimize import optimize_pdf, write_pdf
+        with span('optimize', 'phase'):
+            write_pdf(output_filename, optimize_pdf(target.getbuffer(), compression_level)[0])
+    
+    if isinstance(output_filename, str):
+        print(f"Report successfully generated: {output_filename}")
     return output_filename
 
-# Create line chart for revenue growth
-def prepare_revenue_chart():
-    years = [1, 2, 3, 4]
-    revenue = [159360, 380970, 585150, 771900]
-    
-    plt.figure(figsize=(8, 5))
-    plt.plot(years, revenue, marker='o', linestyle='-', color='#0284c7', linewidth=2, markersize=8)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.title('Projected Revenue Growth', fontsize=14, fontweight='bold')
-    plt.xlabel('Year', fontsize=12)
-    plt.ylabel('Revenue ($)', fontsize=12)
-    plt.xticks(years)
-    
-    # Format y-axis to show dollars
-    from matplotlib.ticker import FuncFormatter
-    def dollars(x, pos):
-        return f'${x:,.0f}'
-    plt.gca().yaxis.set_major_formatter(FuncFormatter(dollars))
-    
-    plt.tight_layout()
-    plt.savefig('revenue_growth.png', dpi=300, bbox_inches='tight')
-    return 'revenue_growth.png'
+# Render the report into memory (or into a caller's file-like object) and return a memoryview of the PDF
+def render_report(buffer=None, **options):
+    return render_to_buffer(create_winners_circle_report, buffer, **options)
+
+# Render the report into memory and yield it in chunks, e.g. for a streaming HTTP response
+def iter_report(chunk_size=64 * 1024, **options):
+    return iter_rendered(create_winners_circle_report, chunk_size, **options)
+
+# Chart spec for the revenue growth line chart (see winners_circle/figures.py)
+def revenue_chart_spec(revenue, output_format='png'):
+    years = list(range(1, len(revenue) + 1))
+    return {
+        'kind': 'line',
+        'x': years,
+        'series': [{'y': [round(value) for value in revenue], 'color': '#0284c7', 'marker': 'o'}],
+        'title': 'Projected Revenue Growth',
+        'xlabel': 'Year',
+        'ylabel': 'Revenue ($)',
+        'xticks': years,
+        'y_format': 'dollars',
+        'format': output_format,
+        'dpi': 300,
+    }
+
+# Create line chart for revenue growth, returned as in-memory PNG (or SVG) bytes
+def prepare_revenue_chart(revenue=(159360, 380970, 585150, 771900), output_format='png'):
+    return get_chart_cache().image(render_chart, revenue_chart_spec(revenue, output_format))
+
+# Imported by the features that use them, and by a warm server before it forks
+OPTIONAL_MODULES = ('winners_circle.batch', 'winners_circle.statements', 'winners_circle.ledger_store',
+                    'winners_circle.aggregates', 'winners_circle.cohorts', 'winners_circle.optimize',
+                    'winners_circle.exports')
+
+# Load everything a report needs, then render one so fonts, charts and sections are cached before forking
+def warm_server():
+    warm_report()
+    load_matplotlib()
+    for module in OPTIONAL_MODULES:
+        importlib.import_module(module)
+    render_report()
+
+# Command-line entry point; the warm server runs it for every request
+def main(args):
+    # Profile the report build, starting from the module imports
+    profiler = None
+    if args.profile:
+        profiler = start_profiling(trace_allocations=not args.profile_no_memory, origin=IMPORTS_STARTED[0])
+        profiler.record('imports', 'phase', IMPORTS_STARTED[0], IMPORTS_FINISHED[0],
+                        cpu_ms=round((IMPORTS_FINISHED[1] - IMPORTS_STARTED[1]) * 1000, 3))
+    
+    # Reset as well as configure: a warm server worker keeps the caches and fonts of its previous request
+    if args.chart_cache:
+        configure_chart_cache(args.chart_cache)
+    else:
+        reset_chart_cache()
+    if args.build_cache:
+        configure_build_cache(args.build_cache)
+    else:
+        reset_build_cache()
+    if args.brand_font:
+        register_brand_fonts(*args.brand_font)
+    else:
+        reset_fonts()
+    
+    if args.batch:
+        from winners_circle.batch import load_manifest, run_batch
+        jobs = load_manifest(args.batch)
+        if args.compress_level is not None:
+            for job in jobs:
+                job.setdefault('compression_level', args.compress_level)
+        batch = run_batch(create_winners_circle_report, jobs,
+                          workers=args.workers, memory_limit_mb=args.max_worker_memory, warmup=warm_report)
+        for result in batch['results']:
+            if not result['ok']:
+                print(f"FAILED {result['output']}:\n{result['error']}", file=sys.stderr)
+        total = len(batch['results'])
+        print(f"Batch finished: {batch['succeeded']} of {total} reports generated, {batch['failed']} failed, "
+              f"in {batch['elapsed']:.2f}s ({total / batch['elapsed']:.1f} reports/s)")
+        sys.exit(1 if batch['failed'] else 0)
+    
+    if args.statements:
+        from winners_circle.statements import render_statements
+        output = sys.stdout.buffer if args.statements_output == '-' else args.statements_output
+        run = render_statements(read_ledger(args.statements), output, workers=args.workers,
+                                compression_level=args.compress_level)
+        print(f"Rendered {run['statements']:,} statements on {run['workers']} workers in {run['elapsed']:.2f}s "
+              f"({run['throughput']:.0f} statements/s, {run['bytes'] / max(run['statements'], 1):,.0f} bytes each)",
+              file=sys.stderr if output is sys.stdout.buffer else sys.stdout)
+        sys.exit(0)
+    
+    if args.import_ledger:
+        from winners_circle.ledger_store import LedgerStore
+        store = LedgerStore.create(args.ledger_store)
+        before = store.rows
+        store.append_rows(read_ledger(args.import_ledger))
+        print(f"Imported {store.rows - before:,} transactions into {args.ledger_store} ({store.rows:,} total)")
+    
+    if args.verify_aggregates:
+        from winners_circle.aggregates import IncrementalAggregates, verify as verify_aggregates
+        from winners_circle.ledger_store import LedgerStore
+        aggregates = IncrementalAggregates(LedgerStore(args.ledger_store))
+        new_rows = aggregates.refresh()
+        mismatched = verify_aggregates(aggregates)
+        print(f"Folded {new_rows:,} new rows up to watermark {aggregates.watermark:,}; "
+              + ("incremental aggregates match a full recompute" if not mismatched
+                 else "MISMATCH in " + ", ".join(mismatched)))
+        sys.exit(1 if mismatched else 0)
+    
+    assumptions = None
+    if args.assumptions:
+        with open(args.assumptions) as f:
+            assumptions = json.load(f)
+    
+    simulation = None
+    if args.simulate is not None:
+        with span('simulate', 'phase'):
+            simulation = simulate(args.simulate, years=args.years, assumptions=assumptions, seed=args.seed)
+        print(f"Simulated {simulation['scenarios']:,} scenarios in {simulation['elapsed']:.2f}s")
+    
+    sensitivity = sweep = None
+    if args.sweep:
+        try:
+            grid = [parse_grid_axis(axis) for axis in args.sweep]
+        except ValueError as error:
+            build_parser().error(f"argument --sweep: {error}")
+        with span('sweep', 'phase'):
+            sweep = run_sweep(grid, assumptions=assumptions, years=args.years, workers=args.workers)
+            sensitivity = tornado(assumptions, years=args.years)
+        print(f"Swept {sweep['points']:,} points on {sweep['workers']} workers in {sweep['elapsed']:.2f}s "
+              f"({sweep['throughput']:,.0f} points/s)")
+    
+    exports = {name: path for name, path in (('json', args.export_json), ('xlsx', args.export_xlsx),
+                                             ('shards', args.export_shards)) if path}
+    graph = BuildGraph(version=report_version())
+    started = time.perf_counter()
+    with span('report', 'phase'):
+        output_pdf = create_winners_circle_report(args.output, assumptions=assumptions, years=args.years,
+                                                  simulation=simulation, sensitivity=sensitivity, sweep=sweep,
+                                                  ledger=read_ledger(args.ledger) if args.ledger else None,
+                                                  monthly_detail=args.monthly, chart_workers=args.workers,
+                                                  ledger_store=args.ledger_store, build_graph=graph,
+                                                  compression_level=args.compress_level, exports=exports)
+    elapsed = time.perf_counter() - started
+    print(f"PDF report generated: {output_pdf}")
+    for name in ('json', 'xlsx'):
+        if name in exports:
+            print(f"{name.upper()} export written: {exports[name]} ({os.path.getsize(exports[name]):,} bytes)")
+    from winners_circle.optimize import page_count
+    with open(output_pdf, 'rb') as f:
+        pages = page_count(f.read())
+    size = os.path.getsize(output_pdf)
+    print(f"{pages} pages, {size:,} bytes ({size / pages:,.0f} bytes/page), built in {elapsed:.2f}s")
+    print(graph.summary())
+    if args.chart_cache:
+        stats = get_chart_cache().stats()
+        print(f"Chart cache: {stats['hits']} memory hits, {stats['disk_hits']} disk hits, {stats['misses']} misses")
+    if profiler is not None:
+        stop_profiling()
+        profiler.write(args.profile)
+        print(f"Profile written to {args.profile} ({len(profiler.events)} spans); open it in chrome://tracing or "
+              f"ui.perfetto.dev")
+        for name, ms in profiler.totals('phase'):
+            print(f"  {name:<10} {ms:8.1f} ms")
 
 # If run as main script
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Generate Winners Circle Analysis Report')
-    parser.add_argument('--output', type=str, default='Winners_Circle_Analysis.pdf',
-                      help='Output PDF filename')
-    args = parser.parse_args()
-    
-    output_pdf = create_winners_circle_report(args.output)
-    print(f"PDF report generated: {output_pdf}")
\ No newline at end of file
+    if args.serve:
+        from winners_circle.warm_server import serve
+        serve(args.serve, lambda argv: main(parse_args(argv)), workers=args.workers or os.cpu_count() or 1,
+              warmup=warm_server)
+    else:
+        main(args)
\ No newline at end of file
@@ -0,0 +1 @@
+# Supporting modules for the Winners Circle report generator
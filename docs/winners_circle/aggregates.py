@@ -0,0 +1,262 @@
+# Incremental ledger aggregates
+#
+# Reports need yearly actuals from the ledger store (members per year, new
+# members and attrition, credits granted and redeemed, beyond-credit spend,
+# accommodation revenue and cohort retention), quarterly activity and every
+# member's balance. Rather than rescanning every transaction for each
+# report, IncrementalAggregates keeps partials next to the store: sums per
+# (year, member), (year, category), (quarter, category) and (member,
+# category), transaction counts per member, and which members had any
+# transaction in each quarter. With them it keeps a watermark: the number of
+# ledger rows already folded in, and the id of the store they came from.
+# refresh() folds only the rows appended since the watermark, so it costs
+# O(new rows); saved partials of another store (one rebuilt in the same
+# directory, whatever its length) are discarded.
+#
+# Every partial is a plain sum or, for quarterly activity, a logical or, so a
+# late-arriving correction (a row dated in an earlier period, usually with a
+# negative amount reversing a grant or a redemption) is folded into the
+# period it belongs to exactly as a full recompute would. Derived figures
+# (member counts, retention, spend beyond the credit, balances) are computed
+# from the partials at query time, in O(members x years) regardless of ledger
+# length. actuals(), by_quarter() and by_member() answer the report's
+# queries; the last two match LedgerStore.by_quarter() and by_member().
+# verify() checks the incremental state against a full recompute.
+import os
+
+import numpy as np
+
+from winners_circle.ledger_store import GRANT, quarter_label
+
+STATE_FILE = 'aggregates.npz'
+STATE_VERSION = 2
+ACCOMMODATION_CATEGORY = 'Staatsburg House'
+# Partial name -> (what its rows are, what its columns are, dtype)
+PARTIALS = {
+    'granted': ('year', 'member', np.int64),
+    'redeemed': ('year', 'member', np.int64),
+    'by_category': ('year', 'category', np.int64),
+    'quarter_granted': ('quarter', None, np.int64),
+    'quarter_by_category': ('quarter', 'category', np.int64),
+    'quarter_active': ('quarter', 'member', bool),
+    'member_transactions': ('member', None, np.int64),
+    'member_by_category': ('member', 'category', np.int64),
+}
+
+
+class IncrementalAggregates:
+    def __init__(self, store, persist=True):
+        self.store = store
+        self.persist = persist
+        self._reset()
+        if persist:
+            self._load()
+
+    def _reset(self):
+        self.watermark = 0
+        self.first_year = None
+        for name, (_, columns, dtype) in PARTIALS.items():
+            setattr(self, name, np.zeros((0, 0) if columns else 0, dtype=dtype))
+
+    @property
+    def path(self):
+        return os.path.join(self.store.directory, STATE_FILE)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path) as state:
+            if ('store_id' not in state.files or str(state['store_id']) != self.store.store_id
+                    or 'version' not in state.files or int(state['version']) != STATE_VERSION):
+                return
+            self.watermark = int(state['watermark'])
+            self.first_year = int(state['first_year']) if state['first_year'] >= 0 else None
+            for name in PARTIALS:
+                setattr(self, name, state[name])
+        # A store cut back below the watermark no longer holds the rows folded in
+        if self.watermark > self.store.rows:
+            self._reset()
+
+    def save(self):
+        tmp = self.path + '.tmp.npz'
+        np.savez(tmp, version=STATE_VERSION, store_id=self.store.store_id, watermark=self.watermark,
+                 first_year=-1 if self.first_year is None else self.first_year,
+                 **{name: getattr(self, name) for name in PARTIALS})
+        os.replace(tmp, self.path)
+
+    # Grow the partial arrays to cover years [first, last] and every member and category in the store
+    def _resize(self, first, last):
+        if self.first_year is None:
+            self.first_year = first
+        first = min(first, self.first_year)
+        last = max(last, self.first_year + self.granted.shape[0] - 1)
+        shape = {'year': last - first + 1, 'quarter': (last - first + 1) * 4,
+                 'member': len(self.store.member_ids), 'category': len(self.store.categories)}
+        shift = {'year': self.first_year - first, 'quarter': (self.first_year - first) * 4, 'member': 0}
+
+        for name, (rows, columns, dtype) in PARTIALS.items():
+            array = getattr(self, name)
+            result = np.zeros((shape[rows], shape[columns]) if columns else shape[rows], dtype=dtype)
+            start = shift[rows]
+            if columns:
+                result[start:start + array.shape[0], :array.shape[1]] = array
+            else:
+                result[start:start + array.shape[0]] = array
+            setattr(self, name, result)
+        self.first_year = first
+
+    # Fold ledger rows [start, stop) into the partials
+    def _fold(self, start, stop):
+        for member, day, kind, category, cents in self.store._chunks(
+                ('member', 'day', 'kind', 'category', 'amount_cents'), start, stop):
+            month = day.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+            year = month // 12 + 1970
+            self._resize(int(year.min()), int(year.max()))
+            members = self.granted.shape[1]
+            categories = self.by_category.shape[1]
+            years = self.granted.shape[0]
+            quarters = years * 4
+            member = member.astype(np.int64)
+            offset = year - self.first_year
+            quarter = month // 3 - (self.first_year - 1970) * 4
+            is_grant = kind == GRANT
+            redemption = ~is_grant
+
+            def total(cells, weights, size):
+                return np.bincount(cells, weights=weights, minlength=size).astype(np.int64)
+
+            cells = offset * members + member
+            self.granted += total(cells[is_grant], cents[is_grant], years * members).reshape(years, members)
+            self.redeemed += total(cells[redemption], cents[redemption], years * members).reshape(years, members)
+            cells = offset[redemption] * categories + category[redemption]
+            self.by_category += total(cells, cents[redemption], years * categories).reshape(years, categories)
+
+            self.quarter_granted += total(quarter[is_grant], cents[is_grant], quarters)
+            cells = quarter[redemption] * categories + category[redemption]
+            self.quarter_by_category += total(cells, cents[redemption],
+                                              quarters * categories).reshape(quarters, categories)
+            self.quarter_active[quarter, member] = True
+
+            self.member_transactions += np.bincount(member, minlength=members)
+            cells = member[redemption] * categories + category[redemption]
+            self.member_by_category += total(cells, cents[redemption],
+                                             members * categories).reshape(members, categories)
+
+    # Fold in everything appended since the watermark; returns the number of new rows
+    def refresh(self):
+        rows = self.store.rows
+        new_rows = rows - self.watermark
+        if new_rows > 0:
+            self._fold(self.watermark, rows)
+            self.watermark = rows
+            if self.persist:
+                self.save()
+        return new_rows
+
+    # Yearly actuals for the detailed membership and revenue tables
+    def actuals(self):
+        if self.first_year is None:
+            return {'years': [], 'members': np.zeros(0, dtype=np.int64)}
+        # A member counts in a year when their net credit grants for that year are positive
+        active = self.granted > 0
+        members = active.sum(axis=1)
+        previous = np.vstack([np.zeros((1, active.shape[1]), dtype=bool), active[:-1]])
+        seen_before = np.logical_or.accumulate(previous, axis=0)
+        new_members = (active & ~seen_before).sum(axis=1)
+        retained = (active & previous).sum(axis=1)
+        attrition = (previous & ~active).sum(axis=1)
+        starting_members = previous.sum(axis=1)
+
+        # Cohort retention: share of each first-year cohort still active in later years
+        first_active = np.where(active.any(axis=0), active.argmax(axis=0), -1)
+        years = active.shape[0]
+        cohort_size = np.bincount(first_active[first_active >= 0], minlength=years)
+        cohort_active = np.zeros((years, years), dtype=np.int64)
+        for cohort in range(years):
+            cohort_active[cohort] = active[:, first_active == cohort].sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            retention = np.where(cohort_size[:, None] > 0, cohort_active / cohort_size[:, None], np.nan)
+
+        categories = self.store.categories
+        accommodation = (self.by_category[:, categories.index(ACCOMMODATION_CATEGORY)]
+                         if ACCOMMODATION_CATEGORY in categories else np.zeros(years, dtype=np.int64))
+        return {
+            'years': list(range(self.first_year, self.first_year + years)),
+            'starting_members': starting_members,
+            'new_members': new_members,
+            'retained': retained,
+            'attrition': attrition,
+            'net_new': members - starting_members,
+            'members': members,
+            'credits_granted': self.granted.sum(axis=1) / 100,
+            'credits_redeemed': self.redeemed.sum(axis=1) / 100,
+            'beyond_credit_spend': np.maximum(self.redeemed - self.granted, 0).sum(axis=1) / 100,
+            'accommodation_revenue': accommodation / 100,
+            'redeemed_by_category': self.by_category / 100,
+            'cohort_size': cohort_size,
+            'cohort_retention': retention,
+        }
+
+    # Per-quarter totals, as LedgerStore.by_quarter(): every quarter with a transaction, in order
+    def by_quarter(self):
+        present = np.flatnonzero(self.quarter_active.any(axis=1))
+        origin = (self.first_year - 1970) * 4 if len(present) else 0
+        by_category = np.zeros((len(present), len(self.store.categories)), dtype=np.int64)
+        by_category[:, :self.quarter_by_category.shape[1]] = self.quarter_by_category[present]
+        redeemed_by_category = by_category / 100
+        return {
+            'quarters': [quarter_label(origin + int(index)) for index in present],
+            'categories': self.store.categories,
+            'active_members': self.quarter_active[present].sum(axis=1).astype(np.int64),
+            'granted': self.quarter_granted[present] / 100,
+            'redeemed': redeemed_by_category.sum(axis=1),
+            'redeemed_by_category': redeemed_by_category,
+        }
+
+    # Per-member totals, as LedgerStore.by_member(): credits granted and redeemed, balance, transactions,
+    # redemptions by category (zero for members registered after the last refresh)
+    def by_member(self):
+        members = len(self.store.member_ids)
+        granted = np.zeros(members, dtype=np.int64)
+        granted[:self.granted.shape[1]] = self.granted.sum(axis=0)
+        transactions = np.zeros(members, dtype=np.int64)
+        transactions[:len(self.member_transactions)] = self.member_transactions
+        by_category = np.zeros((members, len(self.store.categories)), dtype=np.int64)
+        by_category[:self.member_by_category.shape[0], :self.member_by_category.shape[1]] = self.member_by_category
+        redeemed = by_category.sum(axis=1)
+        return {
+            'member_ids': self.store.member_ids,
+            'categories': self.store.categories,
+            'granted': granted / 100,
+            'redeemed': redeemed / 100,
+            'balance': (granted - redeemed) / 100,
+            'transactions': transactions,
+            'redeemed_by_category': by_category / 100,
+        }
+
+
+# Aggregates computed from scratch over the whole store
+def full_recompute(store):
+    aggregates = IncrementalAggregates(store, persist=False)
+    aggregates.refresh()
+    return aggregates
+
+
+def _mismatched(prefix, actual, expected):
+    mismatched = []
+    for name, value in expected.items():
+        found, value = np.asarray(actual[name]), np.asarray(value)
+        # NaN only means "no cohort" in float fields; labels and ids compare as they are
+        equal_nan = found.dtype.kind == 'f' and value.dtype.kind == 'f'
+        if not np.array_equal(found, value, equal_nan=equal_nan):
+            mismatched.append(prefix + name)
+    return mismatched
+
+
+# Compare incremental actuals with a full recompute, and quarterly and member totals with a scan of the
+# store; returns a list of mismatched fields
+def verify(aggregates):
+    store = aggregates.store
+    return (_mismatched('', aggregates.actuals(), full_recompute(store).actuals())
+            + _mismatched('by_quarter.', aggregates.by_quarter(), store.by_quarter())
+            + _mismatched('by_member.', aggregates.by_member(), store.by_member()))
@@ -0,0 +1,95 @@
+# Member credit ledger appendix
+#
+# A ledger is an iterable of rows (member_id, date, kind, category, amount),
+# sorted by member, with one row per credit grant or redemption. Rows are
+# turned into flowables lazily so the appendix can be streamed into a
+# document of any length (see winners_circle/streaming.py).
+import csv
+import random
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Table
+
+from winners_circle.formatting import currency
+from winners_circle.theme import data_table_style
+
+LEDGER_FIELDS = ('member_id', 'date', 'kind', 'category', 'amount')
+REDEMPTION_CATEGORIES = ('Wine', 'Dining', 'Staatsburg House', 'Events', 'Merchandise')
+LEDGER_HEADER = ["Date", "Transaction", "Category", "Amount", "Balance"]
+LEDGER_COL_WIDTHS = [1.1*inch, 1.2*inch, 1.6*inch, 1.1*inch, 1.1*inch]
+
+
+# Stream rows from a CSV file with LEDGER_FIELDS columns
+def read_ledger_csv(path):
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            row['amount'] = float(row['amount'])
+            yield row
+
+
+# Stream rows from a Parquet file with LEDGER_FIELDS columns (requires pyarrow)
+def read_ledger_parquet(path, batch_size=65_536):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet ledgers requires pyarrow (pip install pyarrow)") from None
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=list(LEDGER_FIELDS)):
+        for row in batch.to_pylist():
+            row['date'] = str(row['date'])
+            row['amount'] = float(row['amount'])
+            yield row
+
+
+# Stream ledger rows from a .csv or .parquet file
+def read_ledger(path):
+    if path.lower().endswith(('.parquet', '.pq')):
+        return read_ledger_parquet(path)
+    return read_ledger_csv(path)
+
+
+# Generate a plausible ledger: a $500 grant each quarter followed by a few redemptions
+def synthetic_ledger_rows(rows, rows_per_member=100, seed=0, start=date(2025, 4, 1)):
+    rng = random.Random(seed)
+    produced = 0
+    member = 0
+    while produced < rows:
+        member += 1
+        member_id = f"WC{member:06d}"
+        day = start + timedelta(days=rng.randrange(90))
+        balance = 0.0
+        for index in range(min(rows_per_member, rows - produced)):
+            if index % 4 == 0:
+                kind, category, amount = 'grant', 'Quarterly credit', 500.0
+            else:
+                kind, category = 'redemption', rng.choice(REDEMPTION_CATEGORIES)
+                amount = round(min(balance, rng.uniform(40, 260)), 2)
+            balance += amount if kind == 'grant' else -amount
+            yield {'member_id': member_id, 'date': day.isoformat(), 'kind': kind,
+                   'category': category, 'amount': amount}
+            day += timedelta(days=rng.randrange(5, 30))
+        produced += min(rows_per_member, rows - produced)
+
+
+def _ledger_table(rows):
+    return Table(rows, colWidths=LEDGER_COL_WIDTHS, repeatRows=1, style=data_table_style('RIGHT'))
+
+
+# Yield a heading and running-balance tables for each member, rows_per_table rows at a time
+def member_ledger_flowables(ledger, styles, rows_per_table=40):
+    for member_id, entries in groupby(ledger, key=itemgetter('member_id')):
+        yield Paragraph(f"Member {member_id}", styles['Heading3'])
+        balance = 0.0
+        rows = [LEDGER_HEADER]
+        for entry in entries:
+            amount = entry['amount'] if entry['kind'] == 'grant' else -entry['amount']
+            balance += amount
+            rows.append([entry['date'], entry['kind'].capitalize(), entry['category'],
+                         currency(amount, 2), currency(balance, 2)])
+            if len(rows) > rows_per_table:
+                yield _ledger_table(rows)
+                rows = [LEDGER_HEADER]
+        if len(rows) > 1:
+            yield _ledger_table(rows)
@@ -0,0 +1,116 @@
+# Batch report generation on a pool of warm worker processes
+#
+# A manifest lists report configs; each config becomes keyword arguments for the
+# render function. Workers are started once, preload fonts, and render many
+# reports each. A failing report is recorded and the batch carries on. If a
+# worker dies outright (for example by exceeding its memory cap), the reports
+# it took down are retried one at a time in a fresh process so that only the
+# culprit is reported as failed.
+import json
+import os
+import resource
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+# Read a manifest: either a list of configs or {"defaults": {...}, "reports": [...]}
+def load_manifest(path):
+    with open(path) as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {'reports': manifest}
+    defaults = manifest.get('defaults', {})
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    jobs = []
+    for number, report in enumerate(manifest['reports'], start=1):
+        job = dict(defaults)
+        job.update(report)
+        if 'output' not in job:
+            raise ValueError(f"Report {number} in {path} has no 'output'")
+        # Assumptions may be inline or a path to a JSON file next to the manifest
+        if isinstance(job.get('assumptions'), str):
+            with open(os.path.join(base_dir, job['assumptions'])) as f:
+                job['assumptions'] = json.load(f)
+        jobs.append(job)
+    return jobs
+
+
+def preload_fonts():
+    from reportlab.pdfbase import pdfmetrics
+    from winners_circle.theme import FONTS
+    for name in set(FONTS.values()):
+        pdfmetrics.getFont(name)
+
+
+def _init_worker(memory_limit_mb, warmup):
+    if memory_limit_mb:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    preload_fonts()
+    if warmup is not None:
+        warmup()
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _render_job(render, job):
+    started = time.perf_counter()
+    options = dict(job)
+    output = options.pop('output')
+    try:
+        render(output, **options)
+        error = None
+    except Exception:
+        error = traceback.format_exc(limit=3)
+    return {
+        'output': output,
+        'ok': error is None,
+        'error': error,
+        'elapsed': time.perf_counter() - started,
+        'worker': os.getpid(),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def _crashed(job, error):
+    return {'output': job['output'], 'ok': False, 'error': error, 'elapsed': 0.0,
+            'worker': None, 'peak_rss_mb': None}
+
+
+# Render every job and return one result per job, in manifest order
+def run_batch(render, jobs, workers=None, memory_limit_mb=None, warmup=None):
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(jobs)
+    crashed = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(memory_limit_mb, warmup)) as executor:
+        futures = {executor.submit(_render_job, render, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                crashed.append(index)
+
+    for index in sorted(crashed):
+        with ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                 initargs=(memory_limit_mb, warmup)) as executor:
+            try:
+                results[index] = executor.submit(_render_job, render, jobs[index]).result()
+            except BrokenProcessPool as error:
+                results[index] = _crashed(jobs[index], f"Worker process died: {error}")
+
+    return {
+        'results': results,
+        'succeeded': sum(result['ok'] for result in results),
+        'failed': sum(not result['ok'] for result in results),
+        'elapsed': time.perf_counter() - started,
+    }
@@ -0,0 +1,122 @@
+# Memoized build graph for incremental report rebuilds
+#
+# A report build is a DAG of nodes: the projection and the cohort analysis
+# feed the sections that print them, and every section produces a list of
+# flowables. A node is identified by its name, the source of the function
+# that computes it, the graph's code version and a hash of its inputs.
+# Inputs that are themselves outputs of earlier nodes contribute that node's
+# key rather than their contents, so keys chain as in a Merkle tree: when one
+# assumption changes, only the nodes whose inputs actually differ are
+# computed again and everything else is looked up.
+#
+# Outputs are kept in a ChartCache: an in-memory LRU holding the objects
+# themselves and, when a directory is configured, an on-disk tier shared by
+# later runs, which is the only place they are pickled. Platypus annotates
+# flowables while laying them out, so a build that reuses a list of
+# flowables lays out shallow copies of them (as ChartCache.drawing does for
+# charts); other outputs are shared and must not be modified. graph.recomputed
+# and graph.reused list what happened, in build order.
+import copy
+import hashlib
+import os
+import time
+
+from winners_circle.chart_cache import ChartCache, chart_key
+from winners_circle.profiler import span
+
+BUILD_CACHE_ENV = 'WINNERS_CIRCLE_BUILD_CACHE'
+
+_file_hashes = {}
+
+
+# Hash of the given source files, so editing the report code or its spec invalidates every node
+def code_version(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key not in _file_hashes:
+            with open(path, 'rb') as f:
+                _file_hashes[key] = hashlib.sha256(f.read()).hexdigest()
+        digest.update(_file_hashes[key].encode())
+    return digest.hexdigest()
+
+
+class BuildGraph:
+    def __init__(self, cache=None, version=''):
+        self.cache = cache if cache is not None else get_build_cache()
+        self.version = version
+        self.recomputed = []
+        self.reused = []
+        self.seconds = {}
+        # Keys of node outputs seen in this build, by object identity; the outputs are kept alive
+        self._keys = {}
+        self._outputs = []
+
+    def _input(self, value):
+        key = self._keys.get(id(value))
+        return ('node', key) if key is not None else value
+
+    def key(self, name, function, args, kwargs):
+        return chart_key(function, [self.version, name] + [self._input(value) for value in args],
+                         {option: self._input(value) for option, value in kwargs.items()})
+
+    # Return function(*args, **kwargs), computing it only when no output is cached for these inputs
+    def node(self, name, function, *args, **kwargs):
+        started = time.perf_counter()
+        with span(name, 'node') as note:
+            key = self.key(name, function, args, kwargs)
+            found, value = self.cache.lookup(key)
+            if found:
+                if isinstance(value, list):
+                    value = [copy.copy(item) for item in value]
+                self.reused.append(name)
+            else:
+                value = function(*args, **kwargs)
+                self.cache.store(key, value)
+                self.recomputed.append(name)
+            if note is not None:
+                note['cached'] = found
+        self.seconds[name] = time.perf_counter() - started
+        if isinstance(value, (dict, list)):
+            self._keys[id(value)] = key
+            self._outputs.append(value)
+        return value
+
+    def summary(self):
+        total = len(self.recomputed) + len(self.reused)
+        line = f"Recomputed {len(self.recomputed)} of {total} nodes"
+        if self.recomputed:
+            line += ": " + ", ".join(self.recomputed)
+        return line
+
+
+_default_cache = None
+# The directory WINNERS_CIRCLE_BUILD_CACHE named when the process started
+_startup_directory = os.environ.get(BUILD_CACHE_ENV) or None
+
+
+# The process-wide node store; its directory comes from WINNERS_CIRCLE_BUILD_CACHE when set
+def get_build_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ChartCache(directory=os.environ.get(BUILD_CACHE_ENV) or None)
+    return _default_cache
+
+
+def configure_build_cache(directory=None, max_items=256):
+    global _default_cache
+    if directory:
+        os.environ[BUILD_CACHE_ENV] = directory
+    else:
+        # Worker processes read the variable, so they must not go on using an earlier directory
+        os.environ.pop(BUILD_CACHE_ENV, None)
+    _default_cache = ChartCache(max_items=max_items, directory=directory)
+    return _default_cache
+
+
+# Go back to the cache the process started with, keeping its entries when it is still the one in use;
+# a warm server worker would otherwise keep the --build-cache directory of its previous request
+def reset_build_cache():
+    if _default_cache is not None and _default_cache.directory != _startup_directory:
+        configure_build_cache(_startup_directory)
@@ -0,0 +1,268 @@
+# Content-addressed cache for rendered charts
+#
+# A chart is identified by a hash of the function that builds it, every
+# argument passed to it (series data, axis settings, labels, colours) and the
+# theme palette and fonts. The function is identified by the source of the
+# whole module defining it and of every winners_circle module, so editing a
+# helper such as nice_axis or a formatting function invalidates the charts
+# drawn with it. Rendered charts live in an in-memory LRU tier and, when a
+# cache directory is configured, in an on-disk tier shared by later runs and
+# by batch worker processes. The disk tier is pruned to max_disk_bytes and
+# max_disk_age when it is opened and every PRUNE_EVERY stores, removing the
+# least recently used entries first (a disk hit refreshes an entry's mtime).
+#
+# reportlab Drawings are flattened to primitive shapes, split into chrome and
+# mark layers (see winners_circle/chart_forms.py), before caching, so a cache
+# hit skips all chart layout work; each caller receives its own shallow copy
+# because platypus annotates flowables while laying them out.
+import copy
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from reportlab.lib.colors import Color
+
+from winners_circle import theme
+from winners_circle.chart_forms import layer_drawing
+from winners_circle.profiler import span
+
+CACHE_VERSION = 3
+CACHE_DIR_ENV = 'WINNERS_CIRCLE_CHART_CACHE'
+MAX_DISK_BYTES = 512 * 1024 * 1024
+MAX_DISK_AGE = 30 * 24 * 3600
+PRUNE_EVERY = 256
+PALETTE = (theme.PRIMARY_COLOR, theme.DARK_BROWN, theme.BACKGROUND_COLOR,
+           theme.SECONDARY_COLOR, theme.ACCENT_COLOR, theme.LIGHT_COLOR)
+
+
+def _feed(digest, value):
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f"nd{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    elif isinstance(value, Color):
+        digest.update(f"color{value.rgba()}".encode())
+    elif isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _feed(digest, item)
+        digest.update(b']')
+    elif value is None or isinstance(value, (bool, int, float, str, bytes, np.generic)):
+        digest.update(f"{type(value).__name__}:{value!r}".encode())
+    else:
+        raise TypeError(f"Cannot derive a chart cache key from {type(value).__name__}")
+
+
+_source_hashes = {}
+_package_hash = None
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# Hash of every module in the winners_circle package, which holds the theme and the chart helpers
+def _package_source_hash():
+    global _package_hash
+    if _package_hash is None:
+        package = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(package)):
+            if name.endswith('.py'):
+                digest.update(f"{name}:{_file_hash(os.path.join(package, name))}".encode())
+        _package_hash = digest.hexdigest()
+    return _package_hash
+
+
+# Hash of the module defining function (falling back to its own source) and of the package
+def _source_hash(function):
+    if function not in _source_hashes:
+        try:
+            module = _file_hash(inspect.getsourcefile(function))
+        except (OSError, TypeError):
+            module = hashlib.sha256(inspect.getsource(function).encode()).hexdigest()
+        _source_hashes[function] = f"{module}:{_package_source_hash()}"
+    return _source_hashes[function]
+
+
+def chart_key(function, args, kwargs):
+    digest = hashlib.sha256()
+    _feed(digest, (CACHE_VERSION, function.__qualname__, _source_hash(function), PALETTE, theme.FONTS))
+    _feed(digest, list(args))
+    _feed(digest, kwargs)
+    return digest.hexdigest()
+
+
+class ChartCache:
+    def __init__(self, max_items=256, directory=None, max_disk_bytes=MAX_DISK_BYTES, max_disk_age=MAX_DISK_AGE):
+        self.max_items = max_items
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_age = max_disk_age
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.prune()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.pickle')
+
+    def lookup(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return True, self._memory[key]
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+                # Mark the entry as recently used for prune()
+                os.utime(path)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._remember(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def store(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so concurrent workers never read a partial entry
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            with self._lock:
+                self._stores += 1
+                due = self._stores % PRUNE_EVERY == 0
+            if due:
+                self.prune()
+
+    # Remove disk entries older than max_disk_age, then the least recently used until max_disk_bytes fit;
+    # returns how many were removed. Other processes may prune the same directory, so vanished files are skipped
+    def prune(self):
+        if not self.directory:
+            return 0
+        entries = []
+        for shard in os.listdir(self.directory):
+            folder = os.path.join(self.directory, shard)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if not name.endswith('.pickle'):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        oldest = time.time() - self.max_disk_age if self.max_disk_age is not None else None
+        removed = 0
+        for mtime, size, path in entries:
+            expired = oldest is not None and mtime < oldest
+            if not expired and (self.max_disk_bytes is None or total <= self.max_disk_bytes):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self.evicted += removed
+        return removed
+
+    # Return the Drawing built by function(*args, **kwargs), rendering it only on a miss
+    def drawing(self, function, *args, **kwargs):
+        key = chart_key(function, args, kwargs)
+        found, value = self.lookup(key)
+        if not found:
+            with span(function.__name__, 'chart'):
+                value = layer_drawing(function(*args, **kwargs))
+            self.store(key, value)
+        return copy.copy(value)
+
+    # Return the bytes (e.g. a PNG) produced by function(*args, **kwargs)
+    def image(self, function, *args, **kwargs):
+        key = chart_key(function, args, kwargs)
+        found, value = self.lookup(key)
+        if not found:
+            with span(function.__name__, 'chart'):
+                value = function(*args, **kwargs)
+            self.store(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'entries': len(self._memory), 'evicted': self.evicted}
+
+
+_default_cache = None
+# The directory WINNERS_CIRCLE_CHART_CACHE named when the process started
+_startup_directory = os.environ.get(CACHE_DIR_ENV) or None
+
+
+# The process-wide cache; its directory comes from WINNERS_CIRCLE_CHART_CACHE when set
+def get_chart_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ChartCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+    return _default_cache
+
+
+def configure_chart_cache(directory=None, max_items=256, max_disk_bytes=MAX_DISK_BYTES, max_disk_age=MAX_DISK_AGE):
+    global _default_cache
+    if directory:
+        os.environ[CACHE_DIR_ENV] = directory
+    else:
+        # Worker processes read the variable, so they must not go on using an earlier directory
+        os.environ.pop(CACHE_DIR_ENV, None)
+    _default_cache = ChartCache(max_items=max_items, directory=directory, max_disk_bytes=max_disk_bytes,
+                                max_disk_age=max_disk_age)
+    return _default_cache
+
+
+# Go back to the cache the process started with, keeping its entries when it is still the one in use;
+# a warm server worker would otherwise keep the --chart-cache directory of its previous request
+def reset_chart_cache():
+    if _default_cache is not None and _default_cache.directory != _startup_directory:
+        configure_chart_cache(_startup_directory)
@@ -0,0 +1,176 @@
+# Chart chrome serialized once and drawn as PDF form XObjects where it repeats
+#
+# A chart's chrome (background, gridlines, axes, legend) depends only on its
+# axis ranges, category names and legend entries, which repeat from chart to
+# chart and report to report, while its marks (bars, bar labels, lines and
+# markers) change with the data. layer_drawing() flattens a chart Drawing
+# into a ChartDrawing: a sequence of chrome and mark layers, in drawing order,
+# each chrome layer named by a digest of its shapes. Layers and names are
+# worked out once per chart and kept in the chart cache, so batch workers and
+# later runs reuse them too.
+#
+# Drawing a chrome layer replays PDF operators serialized the first time this
+# process drew it, in any document (only the font resource names are mapped
+# to the current document); marks are drawn from their shapes every time. The
+# first use of a chrome layer in a document is drawn inline; from the second
+# use on it becomes a form defined once and referenced with one `Do`
+# operator, so a chart repeated with different data stores its axes, grid and
+# legend once while a chart used once costs no more than before.
+#
+# Charts with a makeBars or makeLines method (reportlab bar and line charts)
+# are split by drawing them with that method captured: whatever the chart
+# draws before its marks (background, grid) and after them (bar charts draw
+# their axes over the bars) become separate chrome layers, so shapes stack
+# exactly as before. Legends are chrome; every other shape counts as marks.
+import hashlib
+import pickle
+import re
+import threading
+from collections import OrderedDict
+
+from reportlab.graphics import renderPDF
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.shapes import Drawing, Group, UserNode
+from reportlab.lib.attrmap import AttrMap, AttrMapValue
+from reportlab.pdfbase import pdfmetrics
+
+MARK_METHODS = ('makeBars', 'makeLines')
+# Forms clip to their bounding box; shape bounds leave out stroke widths and font descents
+FORM_PADDING = 12
+SERIALIZED_ITEMS = 512
+
+_FONT = re.compile(r'(/F\d+)( [\d.]+ Tf)')
+# Operators naming page resources other than fonts, which are not mapped between documents
+_RESOURCE = re.compile(r'/[^\s/]+\s+(?:gs|Do|sh|cs|CS)\b')
+
+
+# Replace widgets with the primitive shapes they draw
+def flatten_drawing(node):
+    while isinstance(node, UserNode):
+        node = node.provideNode()
+    if not isinstance(node, Group):
+        return node
+    flat = Drawing(node.width, node.height) if isinstance(node, Drawing) else Group()
+    flat.__dict__.update({name: value for name, value in node.__dict__.items() if name != 'contents'})
+    flat.contents = [flatten_drawing(child) for child in node.contents]
+    return flat
+
+
+# (chrome before the marks, marks, chrome after them) of a bar or line chart, or None for other shapes
+def split_chart(chart):
+    method = next((name for name in MARK_METHODS if hasattr(chart, name)), None)
+    if method is None:
+        return None
+    placeholder = Group()
+    marks = []
+
+    def capture():
+        marks.append(getattr(type(chart), method)(chart))
+        return placeholder
+    # An instance attribute set directly, since widgets only accept their declared attributes
+    chart.__dict__[method] = capture
+    try:
+        drawn = chart.draw()
+    finally:
+        del chart.__dict__[method]
+    index = next(index for index, child in enumerate(drawn.contents) if child is placeholder)
+    return drawn.contents[:index], marks, drawn.contents[index + 1:]
+
+
+# Serialized chrome by form name: (PDF operators, {internal font name: font name}), least recently used first
+_serialized = OrderedDict()
+_serialized_lock = threading.Lock()
+
+
+def _remember(name, canv, code):
+    text = '\n'.join(code)
+    fonts = {internal: font for font, internal in canv._doc.fontMapping.items()}
+    used = {internal: fonts[internal] for internal, _ in _FONT.findall(text)}
+    # Embedded TrueType text is encoded for each document's font subsets
+    if _RESOURCE.search(text) or any(pdfmetrics.getFont(font)._dynamicFont for font in used.values()):
+        return
+    with _serialized_lock:
+        _serialized[name] = (list(code), used)
+        if len(_serialized) > SERIALIZED_ITEMS:
+            _serialized.popitem(last=False)
+
+
+def _draw_chrome(name, layer, canv):
+    with _serialized_lock:
+        entry = _serialized.get(name)
+        if entry is not None:
+            _serialized.move_to_end(name)
+    if entry is None:
+        start = len(canv._code)
+        renderPDF.draw(layer, canv, 0, 0)
+        _remember(name, canv, canv._code[start:])
+        return
+    code, fonts = entry
+    names = {internal: canv._doc.getInternalFontName(font) for internal, font in fonts.items()}
+    if any(internal != local for internal, local in names.items()):
+        code = [_FONT.sub(lambda match: names[match.group(1)] + match.group(2), line) for line in code]
+    canv._code.extend(code)
+
+
+class ChartDrawing(Drawing):
+    _attrMap = AttrMap(BASE=Drawing, layers=AttrMapValue(None, desc='(form name, bbox, Drawing) per layer'))
+
+    # Layers in drawing order; chrome layers have a form name and bounding box, marks have None
+    def draw(self, showBoundary=None):
+        canv = self.canv
+        drawn = canv.__dict__.setdefault('_chart_chrome', set())
+        for name, bbox, layer in self.layers:
+            if name is None:
+                renderPDF.draw(layer, canv, 0, 0)
+            elif canv.hasForm(name):
+                canv.doForm(name)
+            elif name in drawn:
+                canv.beginForm(name, *bbox)
+                _draw_chrome(name, layer, canv)
+                canv.endForm()
+                canv.doForm(name)
+            else:
+                drawn.add(name)
+                _draw_chrome(name, layer, canv)
+
+
+def _layer(chrome, shapes, width, height):
+    layer = Drawing(width, height, *shapes)
+    bounds = layer.getBounds() if chrome else None
+    if bounds is None:
+        return None, None, layer
+    name = 'chart-' + hashlib.sha256(pickle.dumps(shapes, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()[:16]
+    x1, y1, x2, y2 = bounds
+    return name, (x1 - FORM_PADDING, y1 - FORM_PADDING, x2 + FORM_PADDING, y2 + FORM_PADDING), layer
+
+
+# Flatten a chart Drawing into chrome and mark layers (see above)
+def layer_drawing(drawing):
+    runs = []
+
+    def add(chrome, shapes):
+        shapes = [flatten_drawing(shape) for shape in shapes]
+        if not shapes:
+            return
+        if runs and runs[-1][0] == chrome:
+            runs[-1][1].extend(shapes)
+        else:
+            runs.append((chrome, shapes))
+
+    for child in drawing.contents:
+        parts = split_chart(child) if isinstance(child, UserNode) else None
+        if parts is not None:
+            before, marks, after = parts
+            add(True, before)
+            add(False, marks)
+            add(True, after)
+        else:
+            add(isinstance(child, Legend), [child])
+
+    layered = ChartDrawing(drawing.width, drawing.height)
+    layered.__dict__.update({name: value for name, value in drawing.__dict__.items()
+                             if name not in ('contents', '_attrMap')})
+    layered.layers = [_layer(chrome, shapes, drawing.width, drawing.height) for chrome, shapes in runs]
+    # Still an ordinary Drawing to anything that renders its contents
+    layered.contents = [shape for _, _, layer in layered.layers for shape in layer.contents]
+    return layered
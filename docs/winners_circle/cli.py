@@ -0,0 +1,97 @@
+# Command line of the report generator
+#
+# Kept free of reportlab, NumPy and matplotlib so the generator can parse its
+# arguments before importing them: --help and usage errors return at once,
+# and a --server request can be handed to a warm server (see
+# winners_circle/warm_server.py) without paying for the imports at all.
+import argparse
+
+
+# argparse type for counts that must be at least 1
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Generate Winners Circle Analysis Report')
+    parser.add_argument('--output', type=str, default='Winners_Circle_Analysis.pdf',
+                      help='Output PDF filename')
+    parser.add_argument('--assumptions', type=str,
+                      help='JSON file of assumption overrides (see winners_circle/projections.py)')
+    parser.add_argument('--years', type=positive_int, default=4,
+                      help='Number of projection years to report')
+    parser.add_argument('--simulate', type=positive_int, metavar='N',
+                      help='Add Monte Carlo scenario bands from N sampled scenarios')
+    parser.add_argument('--seed', type=int,
+                      help='Random seed for --simulate')
+    parser.add_argument('--sweep', action='append', metavar='NAME=START:STOP:COUNT',
+                      help='Sweep an assumption over a grid (repeat for more axes; NAME=V1,V2,... also accepted)')
+    parser.add_argument('--workers', type=positive_int,
+                      help='Worker processes for --sweep, --batch, --serve and chart rendering '
+                           '(defaults to the CPU count)')
+    parser.add_argument('--monthly', action='store_true',
+                      help='Append a month-by-month projection table')
+    parser.add_argument('--ledger', type=str, metavar='FILE',
+                      help='Append member credit ledgers from a CSV or Parquet file sorted by member_id '
+                           '(columns: member_id, date, kind, category, amount)')
+    parser.add_argument('--ledger-store', type=str, metavar='DIR',
+                      help='Append quarterly member activity from a columnar ledger store')
+    parser.add_argument('--import-ledger', type=str, metavar='FILE',
+                      help='Append a CSV or Parquet ledger to --ledger-store before reporting')
+    parser.add_argument('--verify-aggregates', action='store_true',
+                      help='Check the incremental aggregates of --ledger-store against a full recompute and exit')
+    parser.add_argument('--statements', type=str, metavar='FILE',
+                      help='Render a statement per member from a CSV or Parquet ledger into a ZIP archive')
+    parser.add_argument('--statements-output', type=str, default='Winners_Circle_Statements.zip',
+                      help='ZIP archive for --statements ("-" writes to stdout)')
+    parser.add_argument('--batch', type=str, metavar='MANIFEST',
+                      help='Render every report listed in a JSON manifest on a worker pool')
+    parser.add_argument('--max-worker-memory', type=int, metavar='MB',
+                      help='Address-space cap per --batch worker process')
+    parser.add_argument('--chart-cache', type=str, metavar='DIR',
+                      help='Keep rendered charts in DIR and reuse them across runs and batch workers')
+    parser.add_argument('--build-cache', type=str, metavar='DIR',
+                      help='Keep built report sections in DIR and rebuild only those whose inputs changed')
+    parser.add_argument('--profile', type=str, metavar='FILE',
+                      help='Write a Chrome trace (JSON) of wall time, CPU time and allocations per phase and section')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                      help='Leave allocation tracing out of --profile, which keeps its timings closer to a normal run')
+    parser.add_argument('--compress-level', type=int, choices=range(10), metavar='0-9',
+                      help='Deduplicate PDF objects and recompress every stream at this zlib level '
+                           '(0 = uncompressed, 9 = smallest); applies to reports, --batch and --statements')
+    parser.add_argument('--export-json', type=str, metavar='FILE',
+                      help='Also write the projection as the JSON data bundle the dashboard loads')
+    parser.add_argument('--export-xlsx', type=str, metavar='FILE',
+                      help='Also write the detailed and monthly projection tables as an XLSX workbook')
+    parser.add_argument('--export-shards', type=str, metavar='DIR',
+                      help='Also write the dashboard data as content-hashed, precompressed JSON shards and a '
+                           'manifest (e.g. public/data); only shards whose numbers changed are rewritten')
+    parser.add_argument('--brand-font', type=str, nargs='+', metavar='TTF',
+                      help='Set text in TrueType brand fonts instead of Helvetica, embedded as subsets: '
+                           'REGULAR [BOLD [ITALIC]]')
+    parser.add_argument('--serve', type=str, metavar='SOCKET',
+                      help='Run a warm report server on a Unix socket: load everything once, then render '
+                           'requests from --server on pre-forked workers')
+    parser.add_argument('--server', type=str, metavar='SOCKET',
+                      help='Send this command to the --serve process on SOCKET instead of starting up '
+                           '(falls back to rendering here when no server answers)')
+    return parser
+
+
+# Parse and check the generator's arguments (sys.argv[1:] by default)
+def parse_args(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.import_ledger and not args.ledger_store:
+        parser.error('--import-ledger requires --ledger-store')
+    if args.verify_aggregates and not args.ledger_store:
+        parser.error('--verify-aggregates requires --ledger-store')
+    if args.brand_font and len(args.brand_font) > 3:
+        parser.error('--brand-font takes at most three files: REGULAR [BOLD [ITALIC]]')
+    return args
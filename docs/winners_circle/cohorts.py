@@ -0,0 +1,298 @@
+# Cohort retention and member lifetime value
+#
+# Members are described column-wise: the quarter they joined, how many
+# quarters they were observed as members, whether they left (rather than
+# still being active when observation ended), their average value per
+# quarter, and labels for tier and acquisition channel. From these arrays
+# the engine builds retention matrices by join quarter, Kaplan-Meier
+# survival curves, a fitted constant quarterly retention used to extend each
+# curve past the observed window, and lifetime-value distributions for every
+# tier and channel. Everything is vectorised with bincount/cumsum, so
+# hundreds of thousands of members take well under a second.
+#
+# Members come from a ledger store (members_from_ledger) or, before real
+# data exists, from a synthetic population drawn from the report's
+# assumptions (synthetic_members).
+import numpy as np
+
+from winners_circle.ledger_store import GRANT
+from winners_circle.projections import project, resolve_assumptions, scenario
+
+WINNERS_CIRCLE = 'Winners Circle'
+TRADITIONAL = 'Traditional Club'
+UPGRADE = 'Upgrade'
+CONVERSION = 'Visitor Conversion'
+CLUB = 'Club Allocation'
+LTV_PERCENTILES = (10, 50, 90)
+# The assumptions that shape the synthetic Winners Circle population: its joiner mix and retention
+WINNERS_CIRCLE_ASSUMPTIONS = (
+    'launch_club_members', 'club_members', 'annual_visitors', 'initial_upgrade_rate', 'ongoing_upgrade_rate',
+    'initial_conversion_rate', 'ongoing_conversion_rate', 'retention_rate',
+)
+# The assumptions that set a Winners Circle member's annual value, which only scales lifetime values
+VALUE_ASSUMPTIONS = (
+    'annual_fee', 'beyond_credit_rate', 'accommodation_utilization', 'accommodation_nights', 'accommodation_rate',
+)
+TRADITIONAL_ASSUMPTIONS = ('traditional_annual_spend', 'traditional_retention_rate')
+# Every assumption synthetic_members reads
+MEMBER_ASSUMPTIONS = WINNERS_CIRCLE_ASSUMPTIONS + VALUE_ASSUMPTIONS + TRADITIONAL_ASSUMPTIONS
+
+
+def _members(join, duration, churned, value, tier, channel):
+    return {
+        'join': np.asarray(join, dtype=np.int64),
+        'duration': np.asarray(duration, dtype=np.int64),
+        'churned': np.asarray(churned, dtype=bool),
+        'value': np.asarray(value, dtype=float),
+        'tier': np.asarray(tier),
+        'channel': np.asarray(channel),
+    }
+
+
+def _concat(*groups):
+    return {name: np.concatenate([group[name] for group in groups]) for name in groups[0]}
+
+
+def _inputs(assumptions):
+    return {name: float(values[0]) for name, values in resolve_assumptions(assumptions).items()}
+
+
+# Annual fee, spend beyond the credit and accommodation revenue of one Winners Circle member
+def annual_member_value(assumptions=None):
+    inputs = _inputs(assumptions)
+    return (inputs['annual_fee'] * (1 + inputs['beyond_credit_rate'])
+            + inputs['accommodation_utilization'] * inputs['accommodation_nights'] * inputs['accommodation_rate'])
+
+
+# Draw both tiers from the projection assumptions, observed for `quarters` quarters
+def synthetic_members(assumptions=None, members=200_000, quarters=16, seed=0, retention_spread=50):
+    return _concat(synthetic_winners_circle(assumptions, members, quarters, seed, retention_spread),
+                   synthetic_traditional(assumptions, members, quarters, seed, retention_spread))
+
+
+# Winners Circle members; annual_value defaults to annual_member_value(assumptions), and a population drawn
+# with annual_value=4 (a quarterly value of 1) can be rescaled with scaled_lifetime_values
+def synthetic_winners_circle(assumptions=None, members=200_000, quarters=16, seed=0, retention_spread=50,
+                             annual_value=None):
+    inputs = _inputs(assumptions)
+    model = scenario(project(assumptions, months=max(12, -(-quarters // 4) * 12), monthly=False))
+    rng = np.random.default_rng(seed)
+    if annual_value is None:
+        annual_value = annual_member_value(assumptions)
+
+    # Joiners follow the projected yearly upgrade/conversion mix, spread evenly within each year
+    upgrades = model['upgrades'][:-(-quarters // 4)]
+    conversions = model['conversions'][:-(-quarters // 4)]
+    weights = np.concatenate([np.repeat(upgrades, 4)[:quarters], np.repeat(conversions, 4)[:quarters]])
+    cells = rng.choice(len(weights), size=members, p=weights / weights.sum())
+    join = cells % quarters
+    channel = np.where(cells < quarters, UPGRADE, CONVERSION)
+    lifetimes = _lifetimes(rng, join, quarters, inputs['retention_rate'], annual_value / 4, retention_spread)
+    return _members(join, *lifetimes, np.full(members, WINNERS_CIRCLE), channel)
+
+
+# Traditional club members join at an even pace and spend the traditional allocation
+def synthetic_traditional(assumptions=None, members=200_000, quarters=16, seed=0, retention_spread=50):
+    inputs = _inputs(assumptions)
+    # A stream of its own, so this tier's draws do not depend on the Winners Circle assumptions
+    rng = np.random.default_rng([seed, 1])
+    join = rng.integers(0, quarters, members)
+    lifetimes = _lifetimes(rng, join, quarters, inputs['traditional_retention_rate'],
+                           inputs['traditional_annual_spend'] / 4, retention_spread)
+    return _members(join, *lifetimes, np.full(members, TRADITIONAL), np.full(members, CLUB))
+
+
+# Mean quarterly retention for members whose retention is Beta(mean * spread, (1 - mean) * spread), such that
+# their expected survival, fitted as fit_retention() fits it over the observed window, gives annual_retention.
+# Survival E[r^t] falls more slowly than mean^t, because the members who stay are the most loyal ones, so the
+# plain annual_retention ** 0.25 would report a higher retention than assumed.
+def calibrated_retention(annual_retention, spread, quarters):
+    # A single quarter shows no survival to fit
+    if quarters < 2:
+        return annual_retention ** 0.25
+    # survival_curve() measures S(0) ... S(quarters - 1): nobody can be seen leaving after the full window
+    t = np.arange(quarters)
+    target = np.log(annual_retention) / 4
+
+    def fitted(mean):
+        # log E[r^t] = sum over k < t of log((a + k) / (a + b + k))
+        log_survival = np.concatenate([[0.0], np.cumsum(np.log((mean * spread + t[:-1]) / (spread + t[:-1])))])
+        return np.sum(t * log_survival) / np.sum(t ** 2)
+
+    low, high = 1e-9, annual_retention ** 0.25
+    for _ in range(50):
+        middle = (low + high) / 2
+        low, high = (middle, high) if fitted(middle) < target else (low, middle)
+    return (low + high) / 2
+
+
+def _lifetimes(rng, join, quarters, annual_retention, quarterly_value, retention_spread):
+    # Each member gets their own quarterly retention, Beta-distributed around a mean calibrated to the assumption
+    mean = calibrated_retention(annual_retention, retention_spread, quarters)
+    retention = rng.beta(mean * retention_spread, (1 - mean) * retention_spread, len(join))
+    lifetime = rng.geometric(1 - retention)
+    observed = quarters - join
+    duration = np.minimum(lifetime, observed)
+    # Leaving after the last observed quarter is not visible yet
+    churned = lifetime < observed
+    value = quarterly_value * rng.lognormal(-0.02, 0.2, len(join))
+    return duration, churned, value
+
+
+# Derive members from a ledger store: first and last quarter with a credit grant, and fees per quarter
+# (no members when the store has no grants)
+def members_from_ledger(store, tier=WINNERS_CIRCLE, channel='Ledger'):
+    members = len(store.member_ids)
+    first = np.full(members, np.iinfo(np.int64).max)
+    last = np.full(members, np.iinfo(np.int64).min)
+    cents = np.zeros(members, dtype=np.int64)
+    end = np.iinfo(np.int64).min
+    for member, day, kind, amount in store._chunks(('member', 'day', 'kind', 'amount_cents')):
+        quarter = day.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) // 3
+        grants = kind == GRANT
+        np.minimum.at(first, member[grants], quarter[grants])
+        np.maximum.at(last, member[grants], quarter[grants])
+        cents += np.bincount(member[grants], weights=amount[grants], minlength=members).astype(np.int64)
+        end = max(end, int(quarter.max()))
+    seen = first <= last
+    # A new store, or one without grants yet, has no members to derive
+    if not seen.any():
+        return _members([], [], [], [], np.full(0, tier), np.full(0, channel))
+    start = first[seen].min()
+    duration = last[seen] - first[seen] + 1
+    # A member with no grant in the final quarter has left
+    churned = last[seen] < end
+    value = cents[seen] / 100 / duration
+    return _members(first[seen] - start, duration, churned, value, np.full(seen.sum(), tier),
+                    np.full(seen.sum(), channel))
+
+
+# Share of each join-quarter cohort still active 0, 1, 2, ... quarters after joining (NaN when not yet observable)
+def retention_matrix(members, quarters=None):
+    join, duration = members['join'], members['duration']
+    quarters = quarters or int((join + duration).max())
+    cohorts = int(join.max()) + 1
+    size = np.bincount(join, minlength=cohorts)
+    # A member is counted at every age below their duration: add +1 at join age 0 and -1 at their duration
+    ends = np.bincount(join * (quarters + 1) + np.minimum(duration, quarters), minlength=cohorts * (quarters + 1))
+    active = size[:, None] - np.cumsum(ends.reshape(cohorts, quarters + 1), axis=1)[:, :quarters]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        matrix = np.where(size[:, None] > 0, active / size[:, None], np.nan)
+    observable = np.arange(quarters)[None, :] < (quarters - np.arange(cohorts))[:, None]
+    return {'cohort_size': size, 'retention': np.where(observable, matrix, np.nan)}
+
+
+# Kaplan-Meier survival S(t) for t = 0, 1, ... quarters since joining
+def survival_curve(duration, churned):
+    # A member still active when observation ended is known to have stayed duration quarters, not to have stayed
+    # past the last of them, so they leave the risk set a quarter before a member who left after that long
+    last = np.where(churned, duration, duration - 1)
+    length = int(last.max()) + 1
+    events = np.bincount(duration[churned], minlength=length)
+    exits = np.bincount(last, minlength=length)
+    at_risk = len(duration) - np.concatenate([[0], np.cumsum(exits)[:-1]])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+    return np.cumprod(1 - hazard)
+
+
+# Fit a constant quarterly retention to a survival curve (log-linear least squares through S(0) = 1)
+def fit_retention(curve):
+    t = np.arange(len(curve))
+    usable = curve > 0
+    slope = np.sum(t[usable] * np.log(curve[usable])) / max(np.sum(t[usable] ** 2), 1)
+    return float(np.exp(slope))
+
+
+# Observed survival, extended with the fitted retention past the observed window
+def extended_survival(curve, retention, horizon):
+    if horizon <= len(curve):
+        return curve[:horizon]
+    tail = curve[-1] * retention ** np.arange(1, horizon - len(curve) + 1)
+    return np.concatenate([curve, tail])
+
+
+# Expected and simulated lifetime value per member over `horizon` quarters
+def lifetime_values(members, horizon=16, seed=0):
+    curve = survival_curve(members['duration'], members['churned'])
+    retention = fit_retention(curve)
+    survival = extended_survival(curve, retention, horizon)
+    expected = members['value'].mean() * survival.sum()
+
+    # Realised LTV: members still active at the end of observation stay on with the fitted retention
+    rng = np.random.default_rng(seed)
+    quarters = members['duration'].astype(float)
+    open_ended = ~members['churned']
+    quarters[open_ended] += rng.geometric(1 - min(retention, 0.999999), open_ended.sum()) - 1
+    ltv = members['value'] * np.minimum(quarters, horizon)
+    return {
+        'members': len(quarters),
+        'quarterly_retention': retention,
+        'annual_retention': retention ** 4,
+        'survival': survival,
+        'expected_ltv': float(expected),
+        'mean_ltv': float(ltv.mean()),
+        'percentiles': dict(zip(LTV_PERCENTILES, np.percentile(ltv, LTV_PERCENTILES))),
+    }
+
+
+# Lifetime values of members drawn with a quarterly value of 1, for members worth quarterly_value;
+# every value is proportional to it, while retention and survival do not depend on it
+def scaled_lifetime_values(result, quarterly_value):
+    return dict(result, expected_ltv=result['expected_ltv'] * quarterly_value,
+                mean_ltv=result['mean_ltv'] * quarterly_value,
+                percentiles={percentile: value * quarterly_value for percentile, value in result['percentiles'].items()})
+
+
+# Sorted distinct labels and an integer code per member. There are only a few labels, so one equality
+# pass per label is far cheaper than np.unique, which hashes or sorts the whole string array
+def _label_codes(labels):
+    found = []
+    masks = []
+    remaining = np.ones(len(labels), dtype=bool)
+    while remaining.any():
+        name = labels[remaining.argmax()]
+        mask = labels == name
+        found.append(name)
+        masks.append(mask)
+        remaining &= ~mask
+    codes = np.zeros(len(labels), dtype=np.intp)
+    order = sorted(range(len(found)), key=lambda index: found[index])
+    for code, index in enumerate(order):
+        codes[masks[index]] = code
+    return np.array([found[index] for index in order]), codes
+
+
+_NUMERIC = ('join', 'duration', 'churned', 'value')
+
+
+# LTV for every tier and every (tier, channel) pair, plus retention matrices by join quarter per tier
+def cohort_analysis(members, horizon=16, seed=0):
+    tiers, tier_codes = _label_codes(members['tier'])
+    channels, channel_codes = _label_codes(members['channel'])
+    segments = {}
+    matrices = {}
+    for code, tier in enumerate(tiers):
+        # Only the numeric columns are selected per segment; copying the label arrays would cost more than the rest
+        in_tier = tier_codes == code
+        tier_members = {name: members[name] if len(tiers) == 1 else members[name][in_tier] for name in _NUMERIC}
+        segments[(str(tier), None)] = lifetime_values(tier_members, horizon, seed)
+        tier_channels = channel_codes[in_tier]
+        present = np.flatnonzero(np.bincount(tier_channels, minlength=len(channels)))
+        if len(present) > 1:
+            for channel in present:
+                selected = tier_channels == channel
+                segments[(str(tier), str(channels[channel]))] = lifetime_values(
+                    {name: values[selected] for name, values in tier_members.items()}, horizon, seed)
+        matrices[str(tier)] = retention_matrix(tier_members)
+    return {'horizon': horizon, 'segments': segments, 'retention_matrices': matrices}
+
+
+# One analysis of several cohort_analysis results over different tiers, with the segments in tier order
+def merge_cohort_analyses(*analyses):
+    segments = {}
+    matrices = {}
+    for analysis in sorted(analyses, key=lambda analysis: min(tier for tier, _ in analysis['segments'])):
+        segments.update(analysis['segments'])
+        matrices.update(analysis['retention_matrices'])
+    return {'horizon': analyses[0]['horizon'], 'segments': segments, 'retention_matrices': matrices}
@@ -0,0 +1,200 @@
+# Data exports of a computed projection: the dashboard's JSON bundle, its shards and an XLSX workbook
+#
+# The report computes one projection (a build graph node) and lays the PDF out
+# from it; write_exports() writes the same in-memory result as a JSON data
+# bundle for the React dashboard and as a workbook of the detailed projection
+# tables, so no figure is computed, or typed in, twice. Targets are paths or
+# binary file-like objects, as for the PDF; the bundle can also be written as
+# content-hashed per-chart shards (see winners_circle/shards.py).
+#
+# The bundle (BUNDLE_VERSION) holds the assumptions, per-year records for
+# membership, revenue and cash flow (one object per year, the shape the
+# dashboard charts take), the monthly projection as columns, and the Monte
+# Carlo bands when the report has them. Money is rounded to cents and member
+# counts to whole members; a payback month beyond the horizon is null. The
+# workbook keeps counts as computed (formatted as whole numbers) and money in
+# cents.
+import json
+
+import numpy as np
+
+from winners_circle.shards import write_shards
+from winners_circle.xlsx import StreamingWorkbook
+
+BUNDLE_VERSION = 1
+EXPORT_FORMATS = ('json', 'xlsx', 'shards')
+
+
+def _money(values):
+    return [round(value, 2) for value in np.asarray(values, dtype=float).tolist()]
+
+
+def _cents(*columns):
+    return [np.round(np.asarray(column, dtype=float), 2) for column in columns]
+
+
+def _counts(values):
+    return [int(round(value)) for value in np.asarray(values, dtype=float).tolist()]
+
+
+def _month(value):
+    return int(value) if value == value and np.isfinite(value) else None
+
+
+def _records(labels, **columns):
+    return [dict(year=label, **{name: values[index] for name, values in columns.items()})
+            for index, label in enumerate(labels)]
+
+
+def _bands(simulation, name, convert):
+    return {f'p{percentile}': convert(values) for percentile, values in zip(simulation['percentiles'], simulation[name])}
+
+
+# The dashboard's data bundle for one projection scenario (see projections.scenario)
+def data_bundle(model, inputs, years, simulation=None):
+    labels = [f'Year {year}' for year in range(1, years + 1)]
+    revenue = np.asarray(model['revenue'], dtype=float)
+    invested = float(model['investment'].sum())
+    months = np.arange(1, len(model['monthly_revenue']) + 1)
+    bundle = {
+        'version': BUNDLE_VERSION,
+        'years': labels,
+        'assumptions': dict(inputs),
+        'membership': _records(
+            labels,
+            starting=_counts(model['starting_members']),
+            upgrades=_counts(model['upgrades']),
+            conversions=_counts(model['conversions']),
+            new_members=_counts(model['new_members']),
+            attrition=_counts(model['attrition']),
+            net_new=_counts(model['net_new']),
+            total=_counts(model['members']),
+            cumulative_upgrades=_counts(model['upgrades'].cumsum()),
+            cumulative_conversions=_counts(model['conversions'].cumsum()),
+        ),
+        'revenue': _records(
+            labels,
+            direct=_money(model['direct_revenue']),
+            beyond_credit=_money(model['beyond_credit_revenue']),
+            accommodation=_money(model['accommodation_revenue']),
+            total=_money(revenue),
+            growth=[None] + [round(value, 4) for value in (revenue[1:] / revenue[:-1] - 1).tolist()],
+        ),
+        'roi': {
+            'payback_month': _month(model['payback_month']),
+            'investment': round(invested, 2),
+            'roi': round(float(model['cumulative_cash_flow'][-1]) / invested, 4) if invested else None,
+            'cash_flow': _records(
+                labels,
+                investment=_money(model['investment']),
+                operating_costs=_money(model['operating_costs']),
+                net_cash_flow=_money(model['net_cash_flow']),
+                cumulative_cash_flow=_money(model['cumulative_cash_flow']),
+            ),
+        },
+        'monthly': {
+            'month': months.tolist(),
+            'members': _counts(model['monthly_members']),
+            'revenue': _money(model['monthly_revenue']),
+            'costs': _money(model['monthly_costs']),
+            'net_cash_flow': _money(model['monthly_revenue'] - model['monthly_costs']),
+            'cumulative_cash_flow': _money(model['monthly_cumulative_cash_flow']),
+        },
+        'scenarios': None,
+    }
+    if simulation is not None:
+        bundle['scenarios'] = {
+            'scenarios': int(simulation['scenarios']),
+            'percentiles': list(simulation['percentiles']),
+            'members': _bands(simulation, 'members', _counts),
+            'revenue': _bands(simulation, 'revenue', _money),
+            'cumulative_cash_flow': _bands(simulation, 'cumulative_cash_flow', _money),
+            'payback_month': {f'p{percentile}': _month(value)
+                              for percentile, value in zip(simulation['percentiles'], simulation['payback_month'])},
+            'payback_probability': round(float(simulation['payback_probability']), 4),
+        }
+    return bundle
+
+
+def write_json(target, bundle):
+    data = json.dumps(bundle, separators=(',', ':')).encode('utf-8')
+    if isinstance(target, str):
+        with open(target, 'wb') as f:
+            f.write(data)
+    else:
+        target.write(data)
+
+
+# The detailed projection tables of the report's appendix, plus the monthly table, as worksheets
+def write_workbook(target, model, inputs, years, simulation=None):
+    labels = [f'Year {year}' for year in range(1, years + 1)]
+    with StreamingWorkbook(target) as book:
+        with book.sheet('Assumptions', widths=[30, 14]) as sheet:
+            sheet.append(['Assumption', 'Value'], 'header')
+            for name, value in inputs.items():
+                sheet.append([name, value])
+
+        with book.sheet('Membership', widths=[10] + [16] * 6) as sheet:
+            sheet.append(['Year', 'Starting Members', 'Upgrades', 'New Conversions', 'Attritions', 'Net New',
+                          'Ending Total'], 'header')
+            sheet.append_columns([labels] + [model[name] for name in (
+                'starting_members', 'upgrades', 'conversions', 'attrition', 'net_new', 'members')],
+                [None] + ['count'] * 6)
+
+        with book.sheet('Revenue', widths=[10, 12] + [18] * 5) as sheet:
+            sheet.append(['Year', 'Members', 'Direct Membership', 'Beyond-Credit', 'Accommodation', 'Total Revenue',
+                          'YoY Growth'], 'header')
+            growth = [None] + (model['revenue'][1:] / model['revenue'][:-1] - 1).tolist()
+            formats = [None, 'count', 'currency', 'currency', 'currency', 'currency', 'percent']
+            sheet.append_columns([labels, model['members']] + _cents(
+                model['direct_revenue'], model['beyond_credit_revenue'], model['accommodation_revenue'],
+                model['revenue']) + [growth], formats)
+            sheet.append(['Total', None] + [model[name].sum() for name in (
+                'direct_revenue', 'beyond_credit_revenue', 'accommodation_revenue', 'revenue')], formats)
+
+        with book.sheet('Cash Flow', widths=[10] + [20] * 5) as sheet:
+            sheet.append(['Year', 'Revenue', 'Initial Investment', 'Ongoing Costs', 'Net Cash Flow',
+                          'Cumulative Cash Flow'], 'header')
+            sheet.append_columns([labels] + _cents(model['revenue'], -model['investment'], -model['operating_costs'],
+                                                   model['net_cash_flow'], model['cumulative_cash_flow']),
+                                 [None] + ['currency'] * 5)
+            sheet.append(['Payback Month', model['payback_month']], [None, 'count'])
+
+        with book.sheet('Monthly', widths=[8, 8, 12] + [18] * 4) as sheet:
+            months = np.arange(1, len(model['monthly_revenue']) + 1)
+            sheet.append(['Month', 'Year', 'Members', 'Revenue', 'Costs', 'Net Cash Flow', 'Cumulative Cash Flow'],
+                         'header')
+            sheet.append_columns([months, (months - 1) // 12 + 1, model['monthly_members']] + _cents(
+                model['monthly_revenue'], model['monthly_costs'], model['monthly_revenue'] - model['monthly_costs'],
+                model['monthly_cumulative_cash_flow']),
+                                 [None, None, 'count'] + ['currency'] * 4)
+
+        if simulation is not None:
+            with book.sheet('Scenarios', widths=[24, 10] + [16] * 3) as sheet:
+                percentiles = [f'P{percentile}' for percentile in simulation['percentiles']]
+                sheet.append(['Measure', 'Year'] + percentiles, 'header')
+                for name, label, format_name in (('members', 'Members', 'count'), ('revenue', 'Revenue', 'currency'),
+                                                 ('cumulative_cash_flow', 'Cumulative Cash Flow', 'currency')):
+                    sheet.append_columns([[label] * years, labels] + _cents(*simulation[name]),
+                                         [None, None] + [format_name] * len(percentiles))
+                sheet.append(['Payback Month', None] + list(simulation['payback_month']),
+                             [None, None] + ['count'] * len(percentiles))
+
+
+# Write each requested format, e.g. {'json': 'data.json', 'xlsx': 'projection.xlsx', 'shards': 'public/data'};
+# returns what write_shards() reports when shards are written
+def write_exports(exports, model, inputs, years, simulation=None):
+    unknown = set(exports) - set(EXPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown export formats: {', '.join(sorted(unknown))}; known: {', '.join(EXPORT_FORMATS)}")
+    results = {}
+    bundle = None
+    if exports.get('json') is not None or exports.get('shards') is not None:
+        bundle = data_bundle(model, inputs, years, simulation)
+    if exports.get('json') is not None:
+        write_json(exports['json'], bundle)
+    if exports.get('xlsx') is not None:
+        write_workbook(exports['xlsx'], model, inputs, years, simulation)
+    if exports.get('shards') is not None:
+        results['shards'] = write_shards(exports['shards'], bundle)
+    return results
@@ -0,0 +1,127 @@
+# Off-thread matplotlib chart rendering
+#
+# Charts are described by plain dict specs and drawn with matplotlib's
+# object-oriented API on a private Figure/FigureCanvasAgg pair, never through
+# the pyplot state machine, so rendering is safe in threads and worker
+# processes and every figure is released once it has been saved. Many specs
+# render concurrently on a process pool and come back as in-memory PNG or SVG
+# bytes; png_flowable() embeds a PNG in the PDF straight from memory.
+#
+# matplotlib takes about half a second to import, and most reports draw no
+# matplotlib chart, so it is only imported by the first chart rendered.
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image
+
+from winners_circle.chart_cache import chart_key
+
+
+def _dollars(value, position):
+    return f'${value:,.0f}' if value >= 0 else f'$({-value:,.0f})'
+
+
+def _count(value, position):
+    return f'{value:,.0f}'
+
+
+AXIS_FORMATS = {'dollars': _dollars, 'count': _count}
+
+
+def _plot_line(axes, spec):
+    for series in spec['series']:
+        axes.plot(spec['x'], series['y'], color=series['color'], label=series.get('label'),
+                  marker=series.get('marker'), markersize=series.get('markersize', 8),
+                  linestyle=series.get('linestyle', '-'), linewidth=series.get('linewidth', 2))
+
+
+def _plot_bar(axes, spec):
+    count = len(spec['series'])
+    width = 0.8 / count
+    for index, series in enumerate(spec['series']):
+        offsets = [x + (index - (count - 1) / 2) * width for x in spec['x']]
+        axes.bar(offsets, series['y'], width=width, color=series['color'], label=series.get('label'))
+
+
+PLOTTERS = {'line': _plot_line, 'bar': _plot_bar}
+
+
+# The matplotlib classes charts are drawn with, imported on first use
+def load_matplotlib():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+    return FigureCanvasAgg, Figure, FuncFormatter
+
+
+# Render one chart spec to PNG or SVG bytes
+def render_chart(spec):
+    FigureCanvasAgg, Figure, FuncFormatter = load_matplotlib()
+    figure = Figure(figsize=spec.get('size', (8, 5)))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    PLOTTERS[spec.get('kind', 'line')](axes, spec)
+
+    if spec.get('zero_line'):
+        axes.axhline(0, color='#5A3E00', linewidth=1)
+    axes.grid(True, linestyle='--', alpha=0.7)
+    axes.set_title(spec.get('title', ''), fontsize=14, fontweight='bold')
+    axes.set_xlabel(spec.get('xlabel', ''), fontsize=12)
+    axes.set_ylabel(spec.get('ylabel', ''), fontsize=12)
+    if 'xticks' in spec:
+        axes.set_xticks(spec['xticks'])
+    if 'y_format' in spec:
+        axes.yaxis.set_major_formatter(FuncFormatter(AXIS_FORMATS[spec['y_format']]))
+    if any(series.get('label') for series in spec['series']):
+        axes.legend()
+
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    output_format = spec.get('format', 'png')
+    figure.savefig(buffer, format=output_format, dpi=spec.get('dpi', 150), bbox_inches='tight',
+                   metadata={'Date': None} if output_format == 'svg' else None)
+    return buffer.getvalue()
+
+
+# Render many chart specs, in order, on a process pool (and through a ChartCache when given)
+def render_charts(specs, workers=None, cache=None):
+    started = time.perf_counter()
+    rendered = [None] * len(specs)
+    keys = [chart_key(render_chart, (spec,), {}) for spec in specs] if cache is not None else None
+
+    pending = []
+    for index, spec in enumerate(specs):
+        if cache is not None:
+            found, value = cache.lookup(keys[index])
+            if found:
+                rendered[index] = value
+                continue
+        pending.append(index)
+
+    workers = min(workers or os.cpu_count() or 1, len(pending) or 1)
+    if workers == 1:
+        images = [render_chart(specs[index]) for index in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            images = list(executor.map(render_chart, [specs[index] for index in pending]))
+
+    for index, image in zip(pending, images):
+        rendered[index] = image
+        if cache is not None:
+            cache.store(keys[index], image)
+
+    return {
+        'images': rendered,
+        'rendered': len(pending),
+        'workers': workers,
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+# An Image flowable drawn from PNG bytes, scaled to the given width
+def png_flowable(data, width):
+    pixels_wide, pixels_high = ImageReader(io.BytesIO(data)).getSize()
+    return Image(io.BytesIO(data), width=width, height=width * pixels_high / pixels_wide)
@@ -0,0 +1,47 @@
+# Number formatting shared by the report tables and narrative
+import math
+
+
+def currency(value, digits=0):
+    amount = round(float(value), digits)
+    text = f"{abs(amount):,.{digits}f}"
+    if amount < 0:
+        return f"$({text})"
+    return f"${text}"
+
+
+def count(value):
+    return f"{round(float(value)):,}"
+
+
+def percent(value, digits=1):
+    text = f"{float(value) * 100:.{digits}f}"
+    if digits:
+        text = text.rstrip('0').rstrip('.')
+    return f"{text}%"
+
+
+# Round a chart's value axis up to a tidy maximum and step
+def nice_axis(max_value, ticks=4):
+    if max_value <= 0:
+        return 1, 1
+    raw = max_value / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    if step == int(step):
+        step = int(step)
+    return step * math.ceil(max_value / step), step
+
+
+# Format an assumption value the way the report quotes it
+def assumption(name, value):
+    if name in ('annual_fee', 'accommodation_rate', 'initial_investment', 'operating_cost',
+                'traditional_annual_spend'):
+        return currency(value)
+    if name.endswith(('_rate', '_utilization', '_escalation')):
+        return percent(value, 2)
+    return count(value)
+
+
+def assumption_label(name):
+    return name.replace('_', ' ').capitalize()
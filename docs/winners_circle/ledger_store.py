@@ -0,0 +1,225 @@
+# Columnar, memory-mapped member ledger store
+#
+# A store is a directory holding one raw binary file per ledger column plus
+# meta.json (row count, column dtypes, member ids and category names, and a
+# store id drawn when the store is created, so state derived from a store can
+# tell it apart from a later store rebuilt in the same directory).
+# Members and categories are stored as small integer codes, dates as days
+# since 1970 and amounts as integer cents, so years of transactions take 18
+# bytes a row and are read through np.memmap without creating a Python
+# object per row. Columns are append-only: new transactions are added to the
+# end of each file and the row count in meta.json is updated last, so it
+# only ever counts complete rows. Each column file is first cut back to that
+# row count, which drops whatever an append interrupted before updating
+# meta.json left behind.
+#
+# Aggregations walk the columns in fixed-size chunks with np.bincount, so
+# memory stays bounded however long the ledger is.
+import json
+import os
+import uuid
+from datetime import date
+
+import numpy as np
+
+from winners_circle.appendix import REDEMPTION_CATEGORIES
+
+GRANT = 0
+REDEMPTION = 1
+KINDS = ('grant', 'redemption')
+GRANT_CATEGORY = 'Quarterly credit'
+COLUMNS = {
+    'member': np.uint32,
+    'day': np.int32,
+    'kind': np.uint8,
+    'category': np.uint8,
+    'amount_cents': np.int64,
+}
+EPOCH = date(1970, 1, 1)
+
+
+def _day_number(text):
+    return (date.fromisoformat(text) - EPOCH).days
+
+
+def quarter_label(quarter):
+    return f"{quarter // 4 + 1970} Q{quarter % 4 + 1}"
+
+
+class LedgerStore:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        self.rows = meta['rows']
+        # Stores created before store ids existed get one the next time meta.json is written
+        self.store_id = meta.get('store_id', '')
+        self.member_ids = meta['member_ids']
+        self.categories = meta['categories']
+        self._member_codes = {member_id: code for code, member_id in enumerate(self.member_ids)}
+        self._category_codes = {name: code for code, name in enumerate(self.categories)}
+
+    # Create an empty store, or open an existing one
+    @classmethod
+    def create(cls, directory, categories=(GRANT_CATEGORY,) + REDEMPTION_CATEGORIES):
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            for name in COLUMNS:
+                open(os.path.join(directory, name + '.bin'), 'wb').close()
+            meta = {'rows': 0, 'columns': {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()},
+                    'member_ids': [], 'categories': list(categories), 'store_id': uuid.uuid4().hex}
+            with open(os.path.join(directory, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+        return cls(directory)
+
+    def _write_meta(self):
+        if not self.store_id:
+            self.store_id = uuid.uuid4().hex
+        meta = {'rows': self.rows, 'columns': {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()},
+                'member_ids': self.member_ids, 'categories': self.categories, 'store_id': self.store_id}
+        tmp = os.path.join(self.directory, 'meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.directory, 'meta.json'))
+
+    def register_members(self, member_ids):
+        for member_id in member_ids:
+            self.member_code(member_id)
+        self._write_meta()
+
+    def member_code(self, member_id):
+        if member_id not in self._member_codes:
+            self._member_codes[member_id] = len(self.member_ids)
+            self.member_ids.append(member_id)
+        return self._member_codes[member_id]
+
+    def category_code(self, name):
+        if name not in self._category_codes:
+            if len(self.categories) > np.iinfo(COLUMNS['category']).max:
+                raise ValueError(f"Too many ledger categories to add {name!r}")
+            self._category_codes[name] = len(self.categories)
+            self.categories.append(name)
+        return self._category_codes[name]
+
+    # Append already-encoded column arrays (member codes, day numbers, kind and category codes, cents)
+    def append_columns(self, member, day, kind, category, amount_cents):
+        arrays = {'member': member, 'day': day, 'kind': kind, 'category': category, 'amount_cents': amount_cents}
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError("Ledger columns must all have the same length")
+        for name, values in arrays.items():
+            with open(os.path.join(self.directory, name + '.bin'), 'r+b') as f:
+                f.truncate(self.rows * np.dtype(COLUMNS[name]).itemsize)
+                f.seek(0, os.SEEK_END)
+                np.asarray(values, dtype=COLUMNS[name]).tofile(f)
+        self.rows += lengths.pop()
+        self._write_meta()
+
+    # Append ledger rows (dicts with LEDGER_FIELDS, e.g. from read_ledger) in chunks
+    def append_rows(self, ledger, chunk_size=1_000_000):
+        columns = {name: [] for name in COLUMNS}
+        for row in ledger:
+            columns['member'].append(self.member_code(row['member_id']))
+            columns['day'].append(_day_number(row['date']))
+            columns['kind'].append(KINDS.index(row['kind']))
+            columns['category'].append(self.category_code(row['category']))
+            columns['amount_cents'].append(round(row['amount'] * 100))
+            if len(columns['member']) >= chunk_size:
+                self.append_columns(**columns)
+                columns = {name: [] for name in COLUMNS}
+        if columns['member']:
+            self.append_columns(**columns)
+
+    def column(self, name):
+        if self.rows == 0:
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.memmap(os.path.join(self.directory, name + '.bin'), dtype=COLUMNS[name], mode='r',
+                         shape=(self.rows,))
+
+    def _chunks(self, names, start=0, stop=None, chunk_size=4_000_000):
+        columns = [self.column(name) for name in names]
+        stop = self.rows if stop is None else stop
+        for offset in range(start, stop, chunk_size):
+            end = min(offset + chunk_size, stop)
+            yield [np.asarray(column[offset:end]) for column in columns]
+
+    # Per-member totals: credits granted and redeemed, balance, transactions, redemptions by category
+    def by_member(self, start=0, stop=None):
+        members = len(self.member_ids)
+        categories = len(self.categories)
+        granted = np.zeros(members, dtype=np.int64)
+        transactions = np.zeros(members, dtype=np.int64)
+        by_category = np.zeros((members, categories), dtype=np.int64)
+        for member, kind, category, cents in self._chunks(('member', 'kind', 'category', 'amount_cents'),
+                                                          start, stop):
+            member = member.astype(np.int64)
+            is_grant = kind == GRANT
+            granted += np.bincount(member[is_grant], weights=cents[is_grant], minlength=members).astype(np.int64)
+            redemption = ~is_grant
+            cells = member[redemption] * categories + category[redemption]
+            flat = np.bincount(cells, weights=cents[redemption], minlength=members * categories)
+            by_category += flat.astype(np.int64).reshape(members, categories)
+            transactions += np.bincount(member, minlength=members)
+        redeemed = by_category.sum(axis=1)
+        return {
+            'member_ids': self.member_ids,
+            'categories': self.categories,
+            'granted': granted / 100,
+            'redeemed': redeemed / 100,
+            'balance': (granted - redeemed) / 100,
+            'transactions': transactions,
+            'redeemed_by_category': by_category / 100,
+        }
+
+    # Per-quarter totals: active members, credits granted and redeemed, redemptions by category
+    def by_quarter(self, start=0, stop=None):
+        members = len(self.member_ids)
+        categories = len(self.categories)
+        totals = {}
+        active = {}
+        for member, day, kind, category, cents in self._chunks(('member', 'day', 'kind', 'category',
+                                                                'amount_cents'), start, stop):
+            quarter = day.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) // 3
+            first = int(quarter.min())
+            span = int(quarter.max()) - first + 1
+            offset = quarter - first
+            is_grant = kind == GRANT
+            granted = np.bincount(offset[is_grant], weights=cents[is_grant], minlength=span)
+            redemption = ~is_grant
+            cells = offset[redemption] * categories + category[redemption]
+            by_category = np.bincount(cells, weights=cents[redemption],
+                                      minlength=span * categories).reshape(span, categories)
+            seen = np.zeros((span, members), dtype=bool)
+            seen[offset, member] = True
+            for index in range(span):
+                key = first + index
+                row = totals.setdefault(key, np.zeros(categories + 1, dtype=np.int64))
+                row[0] += int(granted[index])
+                row[1:] += by_category[index].astype(np.int64)
+                if key in active:
+                    active[key] |= seen[index]
+                else:
+                    active[key] = seen[index].copy()
+
+        quarters = sorted(totals)
+        table = np.array([totals[quarter] for quarter in quarters], dtype=np.int64).reshape(-1, categories + 1)
+        redeemed_by_category = table[:, 1:] / 100
+        return {
+            'quarters': [quarter_label(quarter) for quarter in quarters],
+            'categories': self.categories,
+            'active_members': np.array([int(active[quarter].sum()) for quarter in quarters], dtype=np.int64),
+            'granted': table[:, 0] / 100,
+            'redeemed': redeemed_by_category.sum(axis=1),
+            'redeemed_by_category': redeemed_by_category,
+        }
+
+
+# Vectorised synthetic ledger columns for benchmarks: $500 grants and random redemptions
+def synthetic_columns(rows, members=100_000, seed=0, start=date(2021, 1, 1), days=5 * 365):
+    rng = np.random.default_rng(seed)
+    member = rng.integers(0, members, rows, dtype=np.uint32)
+    day = (rng.integers(0, days, rows) + (start - EPOCH).days).astype(np.int32)
+    kind = (rng.random(rows) >= 0.25).astype(np.uint8)
+    category = np.where(kind == GRANT, 0, rng.integers(1, len(REDEMPTION_CATEGORIES) + 1, rows)).astype(np.uint8)
+    amount_cents = np.where(kind == GRANT, 50_000, rng.integers(4_000, 26_000, rows)).astype(np.int64)
+    return member, day, kind, category, amount_cents
@@ -0,0 +1,202 @@
+# Post-build PDF optimisation: deduplicate objects and recompress streams
+#
+# reportlab compresses page content with a fixed zlib level and stores images
+# ASCII85-encoded on top of Flate, which costs a quarter more bytes than the
+# compressed data itself. When a report is built with pageCompression=0, its
+# streams are written raw and optimize_pdf() finishes the file in one pass:
+#
+#   - identical stream objects (images, form XObjects, content and font file
+#     streams) and identical font dictionaries are merged into one, repeating
+#     until objects that only differed in what they referenced collapse too;
+#   - every stream reportlab wrote with no filter, Flate or ASCII85 + Flate is
+#     decoded and written back with Flate at the requested zlib level (0
+#     leaves streams uncompressed), keeping whichever is smaller;
+#   - objects are renumbered and a fresh cross-reference table is written.
+#
+# reportlab already embeds each image once per document (it names images by a
+# digest of their data) and subsets TrueType fonts to the glyphs used, so
+# what is left to merge are repeats it cannot see, such as the same chart
+# drawn as a form in two places. The parser understands what reportlab writes
+# (a classic xref table, direct stream lengths) and refuses anything else.
+import base64
+import re
+import zlib
+
+DEFAULT_LEVEL = 6
+
+_OBJECT = re.compile(rb'(\d+) 0 obj\s*')
+_STREAM = re.compile(rb'>>\s*stream\r?\n')
+_LENGTH = re.compile(rb'/Length\s+(\d+)\b(?!\s+\d+\s+R)')
+_FILTER = re.compile(rb'\s*/Filter\s*(\[[^\]]*\]|/\w+)')
+_TYPE = re.compile(rb'/Type\s*/(\w+)')
+# A literal string (copied untouched) or an indirect reference
+_REFERENCE = re.compile(rb'(\((?:\\.|[^\\()])*\))|(\d+) 0 R\b', re.S)
+_SUPPORTED_FILTERS = ((), (b'FlateDecode',), (b'ASCII85Decode',), (b'ASCII85Decode', b'FlateDecode'))
+_MERGEABLE_TYPES = (b'Font', b'FontDescriptor')
+
+
+class _Object:
+    __slots__ = ('head', 'stream')
+
+    def __init__(self, head, stream=None):
+        self.head = head
+        self.stream = stream
+
+
+# Split a reportlab PDF into its header, {number: _Object} and trailer dictionary
+def parse_pdf(data):
+    data = bytes(data)
+    match = re.search(rb'startxref\s+(\d+)\s+%%EOF\s*$', data)
+    if not match or not data.startswith(b'xref', int(match.group(1))):
+        raise ValueError("Not a PDF with a classic cross-reference table")
+    xref = int(match.group(1))
+    lines = data[xref:data.index(b'trailer', xref)].split(b'\n')
+    first, count = (int(field) for field in lines[1].split())
+    offsets = {}
+    for number, line in enumerate(lines[2:2 + count], start=first):
+        offset, _, kind = line.split()[:3]
+        if kind == b'n':
+            offsets[number] = int(offset)
+
+    objects = {}
+    for number, offset in offsets.items():
+        header = _OBJECT.match(data, offset)
+        if not header or int(header.group(1)) != number:
+            raise ValueError(f"Object {number} is not at its cross-reference offset")
+        end = data.index(b'endobj', header.end())
+        stream = _STREAM.search(data, header.end(), end)
+        if stream is None:
+            objects[number] = _Object(data[header.end():end].rstrip())
+            continue
+        head = data[header.end():stream.start() + 2]
+        length = _LENGTH.search(head)
+        if length is None:
+            raise ValueError(f"Object {number} has no direct stream /Length")
+        start = stream.end()
+        objects[number] = _Object(head, data[start:start + int(length.group(1))])
+
+    trailer = data[data.index(b'trailer', xref) + len(b'trailer'):match.start()].strip()
+    return data[:min(offsets.values())], objects, trailer
+
+
+def _filters(head):
+    match = _FILTER.search(head)
+    return tuple(re.findall(rb'/(\w+)', match.group(1))) if match else ()
+
+
+# The raw bytes of a stream, or None when its filters are not ones reportlab writes
+def _decoded(head, stream):
+    filters = _filters(head)
+    if filters not in _SUPPORTED_FILTERS or b'/DecodeParms' in head:
+        return None
+    for name in filters:
+        if name == b'ASCII85Decode':
+            stream = base64.a85decode(stream.strip().removesuffix(b'~>'))
+        else:
+            stream = zlib.decompress(stream)
+    return stream
+
+
+def _encoded(head, raw, level):
+    head = _FILTER.sub(b'', head)
+    data, filters = raw, b''
+    if level:
+        compressed = zlib.compress(raw, level)
+        # Tiny streams grow under Flate once the /Filter entry is counted
+        if len(compressed) + 20 < len(raw):
+            data, filters = compressed, b' /Filter /FlateDecode'
+    head = _LENGTH.sub(b'/Length %d' % len(data) + filters, head, count=1)
+    return head, data
+
+
+def _renumber(text, mapping):
+    def replace(match):
+        if match.group(1) is not None:
+            return match.group(1)
+        return b'%d 0 R' % mapping.get(int(match.group(2)), int(match.group(2)))
+    return _REFERENCE.sub(replace, text)
+
+
+def _mergeable(item):
+    if item.stream is not None:
+        return True
+    kind = _TYPE.search(item.head)
+    return kind is not None and kind.group(1) in _MERGEABLE_TYPES
+
+
+# Map every duplicate object number to the first object identical to it
+def _duplicates(objects):
+    mapping = {}
+    while True:
+        seen = {}
+        found = False
+        for number, item in objects.items():
+            if number in mapping or not _mergeable(item):
+                continue
+            key = (_renumber(item.head, mapping), item.stream)
+            if key in seen:
+                mapping[number] = seen[key]
+                found = True
+            else:
+                seen[key] = number
+        if not found:
+            return mapping
+
+
+# Optimise a PDF written by reportlab; returns the new PDF bytes and what was done
+def optimize_pdf(data, level=DEFAULT_LEVEL, dedupe=True):
+    if not 0 <= level <= 9:
+        raise ValueError(f"Compression level must be 0-9, not {level}")
+    header, objects, trailer = parse_pdf(data)
+    duplicates = _duplicates(objects) if dedupe else {}
+    kept = [number for number in objects if number not in duplicates]
+    mapping = {number: new for new, number in enumerate(kept, start=1)}
+    mapping.update({number: mapping[original] for number, original in duplicates.items()})
+
+    output = bytearray(header)
+    offsets = []
+    recompressed = 0
+    for new, number in enumerate(kept, start=1):
+        item = objects[number]
+        head, stream = _renumber(item.head, mapping), item.stream
+        raw = _decoded(head, stream) if stream is not None else None
+        if raw is not None:
+            head, stream = _encoded(head, raw, level)
+            recompressed += 1
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % new + head
+        if stream is not None:
+            output += b'\nstream\n' + stream + b'\nendstream'
+        output += b'\nendobj\n'
+
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(kept) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    trailer = re.sub(rb'/Size\s+\d+', b'/Size %d' % (len(kept) + 1), _renumber(trailer, mapping))
+    output += b'trailer\n' + trailer + b'\nstartxref\n%d\n%%%%EOF\n' % xref
+    return bytes(output), {
+        'objects': len(objects),
+        'merged': len(duplicates),
+        'recompressed': recompressed,
+        'bytes_in': len(data),
+        'bytes': len(output),
+    }
+
+
+# Number of pages in a PDF written by reportlab
+def page_count(data):
+    _, objects, _ = parse_pdf(data)
+    for item in objects.values():
+        kind = _TYPE.search(item.head)
+        if item.stream is None and kind and kind.group(1) == b'Pages' and b'/Parent' not in item.head:
+            return int(re.search(rb'/Count\s+(\d+)', item.head).group(1))
+    raise ValueError("No page tree in PDF")
+
+
+# Write PDF bytes to a path or binary stream
+def write_pdf(target, data):
+    if isinstance(target, str):
+        with open(target, 'wb') as f:
+            f.write(data)
+    else:
+        target.write(data)
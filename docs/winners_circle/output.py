@@ -0,0 +1,33 @@
+# In-memory PDF output
+#
+# reportlab writes a finished PDF to whatever it is given as the filename:
+# a path, or any object with a write() method. These helpers render a report
+# into a BytesIO (or a caller's own file-like object) so a web handler can
+# serve it without a temp-file round trip, and hand the result back as a
+# memoryview over the buffer itself rather than as another bytes copy.
+import io
+
+
+# Render into `buffer` (a fresh BytesIO by default) and return a memoryview of the PDF.
+# For file-like objects without a getbuffer() method (sockets, responses) the PDF is
+# written through and None is returned.
+def render_to_buffer(render, buffer=None, **options):
+    if buffer is None:
+        buffer = io.BytesIO()
+    start = buffer.tell() if hasattr(buffer, 'tell') else 0
+    render(buffer, **options)
+    if not hasattr(buffer, 'getbuffer'):
+        return None
+    return buffer.getbuffer()[start:buffer.tell()]
+
+
+# Yield the PDF as memoryview slices of at most chunk_size bytes; nothing is copied
+def iter_chunks(view, chunk_size=64 * 1024):
+    view = memoryview(view)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+# Render to memory and stream the result in chunks
+def iter_rendered(render, chunk_size=64 * 1024, **options):
+    yield from iter_chunks(render_to_buffer(render, **options), chunk_size)
@@ -0,0 +1,135 @@
+# Opt-in profiler for report builds, written as a Chrome trace
+#
+# Code marks the work it does with span(name, category):
+#
+#   with span('revenue_analysis', 'node'):
+#       ...
+#
+# While no profiler is running span() returns one shared no-op context
+# manager, so instrumented code costs a global lookup and a function call.
+# start_profiling() installs a Profiler that records, for every span, its
+# wall time, the process CPU time spent inside it and, when allocation
+# tracing is on, the memory it left allocated and its peak above the
+# starting point (via tracemalloc, which slows Python code down noticeably).
+# Spans nest per thread.
+#
+# Profiler.write() saves the spans as complete ("X") events in the Chrome
+# trace event format, which chrome://tracing, Perfetto (ui.perfetto.dev) and
+# speedscope show as a timeline / flame graph.
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_NO_SPAN = contextlib.nullcontext()
+_active = None
+
+
+class _Span:
+    def __init__(self, profiler, name, category, args):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+        self.child_peak = 0
+
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        if self.profiler.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.profiler._carry_peak(peak)
+            tracemalloc.reset_peak()
+            self.memory = current
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self.args
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        args = dict(self.args, cpu_ms=round((cpu - self.cpu) * 1000, 3))
+        stack = self.profiler._stack()
+        stack.pop()
+        if self.profiler.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            args['allocated_kb'] = round((current - self.memory) / 1024, 1)
+            args['peak_kb'] = round((peak - self.memory) / 1024, 1)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        self.profiler.record(self.name, self.category, self.wall, wall, **args)
+        return False
+
+
+class Profiler:
+    def __init__(self, trace_allocations=True, origin=None):
+        self.trace_allocations = trace_allocations
+        self.origin = time.perf_counter() if origin is None else origin
+        self.events = []
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    # The peak reached so far belongs to the innermost open span, whose counter is about to be reset
+    def _carry_peak(self, peak):
+        stack = self._stack()
+        if len(stack) > 1:
+            stack[-2].child_peak = max(stack[-2].child_peak, peak)
+
+    def span(self, name, category, args):
+        return _Span(self, name, category, args)
+
+    # Add a span measured elsewhere, from perf_counter() readings
+    def record(self, name, category, started, finished, **args):
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((started - self.origin) * 1e6, 1),
+            'dur': round((finished - started) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def trace(self):
+        return {'traceEvents': sorted(self.events, key=lambda event: event['ts']), 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
+
+    # Total wall milliseconds per span name in a category, largest first
+    def totals(self, category):
+        totals = {}
+        for event in self.events:
+            if event['cat'] == category:
+                totals[event['name']] = totals.get(event['name'], 0) + event['dur'] / 1000
+        return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def span(name, category='report', **args):
+    if _active is None:
+        return _NO_SPAN
+    return _active.span(name, category, args)
+
+
+def start_profiling(trace_allocations=True, origin=None):
+    global _active
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _active = Profiler(trace_allocations, origin)
+    return _active
+
+
+def stop_profiling():
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None and profiler.trace_allocations:
+        tracemalloc.stop()
+    return profiler
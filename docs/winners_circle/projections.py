@@ -0,0 +1,161 @@
+# Projection engine for the Winners Circle Club
+#
+# Computes membership, revenue, costs and cash flow for one or many parameter
+# sets at once. Every assumption may be a scalar or a 1-D array; arrays are
+# broadcast against each other so a single call evaluates a whole batch of
+# scenarios. Annual quantities have shape (scenarios, years) and monthly
+# quantities have shape (scenarios, months).
+import numpy as np
+
+# Baseline assumptions used throughout the report (see "5. Financial Assumptions")
+DEFAULT_ASSUMPTIONS = {
+    'launch_club_members': 600,       # existing club members eligible to upgrade at launch
+    'club_members': 700,              # existing club members eligible to upgrade after Year 1
+    'annual_visitors': 8000,          # non-club winery visitors per year
+    'initial_upgrade_rate': 0.04,
+    'ongoing_upgrade_rate': 0.02,
+    'initial_conversion_rate': 0.005,
+    'ongoing_conversion_rate': 0.01,
+    'retention_rate': 0.92,
+    'annual_fee': 2000,
+    'beyond_credit_rate': 0.20,
+    'accommodation_utilization': 0.10,
+    'accommodation_nights': 3,
+    'accommodation_rate': 300,
+    'initial_investment': 410000,
+    'operating_cost': 87500,
+    'cost_escalation': 0.03,
+    'traditional_annual_spend': 480,  # average annual spend of a traditional (allocation) club member
+    'traditional_retention_rate': 0.80,
+}
+
+ANNUAL_KEYS = (
+    'starting_members', 'upgrades', 'conversions', 'new_members', 'attrition', 'net_new', 'members',
+    'direct_revenue', 'beyond_credit_revenue', 'accommodation_revenue', 'revenue',
+    'investment', 'operating_costs', 'net_cash_flow', 'cumulative_cash_flow',
+)
+
+
+# Merge overrides into the defaults and broadcast every value to shape (n,)
+def resolve_assumptions(assumptions=None):
+    merged = dict(DEFAULT_ASSUMPTIONS)
+    if assumptions:
+        unknown = set(assumptions) - set(DEFAULT_ASSUMPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown assumptions: {', '.join(sorted(unknown))}")
+        merged.update(assumptions)
+
+    names = list(merged)
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(merged[name], dtype=float)) for name in names])
+    if arrays[0].ndim != 1:
+        raise ValueError("Assumptions must be scalars or 1-D arrays")
+    return {name: np.ascontiguousarray(array) for name, array in zip(names, arrays)}
+
+
+# Run the projection for every scenario in one batched pass
+def project(assumptions=None, months=48, monthly=True):
+    if months < 1:
+        raise ValueError("months must be at least 1")
+
+    p = resolve_assumptions(assumptions)
+    n = p['annual_fee'].shape[0]
+    years = -(-months // 12)
+    year_index = np.arange(years)
+    first_year = year_index == 0
+
+    def column(name):
+        return p[name][:, None]
+
+    # Acquisition does not depend on membership, so every year is computed at once
+    upgrade_base = np.where(first_year, column('launch_club_members'), column('club_members'))
+    upgrade_rate = np.where(first_year, column('initial_upgrade_rate'), column('ongoing_upgrade_rate'))
+    conversion_rate = np.where(first_year, column('initial_conversion_rate'), column('ongoing_conversion_rate'))
+    upgrades = np.rint(upgrade_base * upgrade_rate)
+    conversions = np.rint(column('annual_visitors') * conversion_rate)
+    new_members = upgrades + conversions
+
+    # Attrition applies to members carried into each year, which is the only recurrence
+    starting_members = np.empty((n, years))
+    attrition = np.empty((n, years))
+    members = np.empty((n, years))
+    churn = 1.0 - p['retention_rate']
+    carried = np.zeros(n)
+    for year in range(years):
+        starting_members[:, year] = carried
+        attrition[:, year] = np.rint(carried * churn)
+        carried = carried - attrition[:, year] + new_members[:, year]
+        members[:, year] = carried
+
+    direct_revenue = members * column('annual_fee')
+    beyond_credit_revenue = direct_revenue * column('beyond_credit_rate')
+    accommodation_revenue = members * (
+        column('accommodation_utilization') * column('accommodation_nights') * column('accommodation_rate')
+    )
+    revenue = direct_revenue + beyond_credit_revenue + accommodation_revenue
+
+    investment = np.where(first_year, column('initial_investment'), 0.0)
+    operating_costs = column('operating_cost') * (1.0 + column('cost_escalation')) ** year_index
+    net_cash_flow = revenue - investment - operating_costs
+    cumulative_cash_flow = np.cumsum(net_cash_flow, axis=1)
+
+    result = {
+        'starting_members': starting_members,
+        'upgrades': upgrades,
+        'conversions': conversions,
+        'new_members': new_members,
+        'attrition': attrition,
+        'net_new': new_members - attrition,
+        'members': members,
+        'direct_revenue': direct_revenue,
+        'beyond_credit_revenue': beyond_credit_revenue,
+        'accommodation_revenue': accommodation_revenue,
+        'revenue': revenue,
+        'investment': investment,
+        'operating_costs': operating_costs,
+        'net_cash_flow': net_cash_flow,
+        'cumulative_cash_flow': cumulative_cash_flow,
+        'payback_month': payback_month(investment, revenue - operating_costs, cumulative_cash_flow, months),
+    }
+    if monthly:
+        result.update(expand_monthly(result, months))
+    return result
+
+
+# First month (1-based) in which cumulative cash flow turns non-negative, NaN if never.
+# The investment lands in month 1 and operating flows are spread evenly across each year,
+# so the crossing month inside a year follows directly from the annual figures.
+def payback_month(investment, operating_net, cumulative_cash_flow, months):
+    n, years = cumulative_cash_flow.shape
+    reached = cumulative_cash_flow >= 0
+    year = reached.argmax(axis=1)
+    rows = np.arange(n)
+
+    opening = np.where(year > 0, cumulative_cash_flow[rows, year - 1], 0.0) - investment[rows, year]
+    monthly_net = operating_net[rows, year] / 12.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        within = np.ceil(-opening / monthly_net - 1e-9)
+    within = np.clip(np.where(opening >= 0, 1, within), 1, 12)
+
+    month = year * 12 + within
+    return np.where(reached.any(axis=1) & (month <= months), month, np.nan)
+
+
+# Spread annual figures evenly across months for monthly charts and tables
+def expand_monthly(result, months):
+    def spread(name, divisor=12.0):
+        return np.repeat(result[name] / divisor, 12, axis=1)[:, :months]
+
+    monthly_costs = spread('operating_costs')
+    monthly_costs[:, 0] += result['investment'][:, 0]
+    monthly_revenue = spread('revenue')
+    return {
+        'monthly_members': spread('members', 1.0),
+        'monthly_revenue': monthly_revenue,
+        'monthly_costs': monthly_costs,
+        'monthly_cumulative_cash_flow': np.cumsum(monthly_revenue - monthly_costs, axis=1),
+    }
+
+
+# Pull a single scenario out of a batched projection
+def scenario(result, index=0):
+    return {name: values[index] for name, values in result.items()}
@@ -0,0 +1,302 @@
+# Declarative report sections compiled into reusable flowable plans
+#
+# A report spec (JSON, or YAML when PyYAML is installed) names sections, each
+# a list of blocks:
+#
+#   {"heading": "Core Concept"}                      Heading3 unless "style" is given
+#   {"paragraph": "We project {retention_rate:percent} ...", "style": "Normal"}
+#   {"bullets": ["<b>Item:</b> text", ...]}
+#   {"table": {"rows": [[...], ...], "col_widths": [2, 1.25], "style": {"name": "resource"}}}
+#   {"table": {"header": "Assumptions", "columns": "year_labels",
+#              "rows": [{"label": "Total new members", "cell": "{new_members:count}"}], ...}}
+#   {"chart": "bar", "args": [["$member_counts"], "$year_labels", ["$PRIMARY_COLOR"]], "options": {...}}
+#   {"spacer": 0.2}                                  height in inches
+#   {"page_break": true}
+#
+# Text is a str.format template evaluated against the report context; the
+# format spec may name a formatter (currency, count, percent), optionally with
+# its number of digits ({growth:percent.0}), or be a normal format spec. Chart arguments written "$name" are bound to context values or
+# theme colours. Bound table rows are evaluated once per column, with every
+# sequence in the context indexed by the column number.
+#
+# compile_spec() parses every block once. Blocks that reference nothing in the
+# context (the narrative, fixed lists and tables, the target-segment pie
+# chart) are built into flowables at compile time and each render gets cheap
+# copies of them, which also share their paragraphs' line breaks once laid
+# out; only data-bound blocks are evaluated per report. load_plan()
+# keeps one compiled plan per spec file for the life of the process.
+import copy
+import json
+import os
+import string
+
+import numpy as np
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Spacer, Table, PageBreak, ListFlowable, ListItem
+
+from winners_circle import theme
+from winners_circle.chart_cache import get_chart_cache
+from winners_circle.formatting import currency, count, percent
+
+DEFAULT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'specs', 'report.json')
+FORMATTERS = {'currency': currency, 'count': count, 'percent': percent}
+TABLE_STYLES = {
+    'data': theme.data_table_style,
+    'resource': theme.resource_table_style,
+    'timeline': theme.timeline_table_style,
+    'toc': theme.toc_table_style,
+}
+PALETTE = {name: getattr(theme, name) for name in (
+    'PRIMARY_COLOR', 'DARK_BROWN', 'BACKGROUND_COLOR', 'SECONDARY_COLOR', 'ACCENT_COLOR', 'LIGHT_COLOR')}
+
+
+class SpecError(ValueError):
+    pass
+
+
+class _TemplateFormatter(string.Formatter):
+    def format_field(self, value, format_spec):
+        name, _, digits = format_spec.partition('.')
+        if name in FORMATTERS:
+            return FORMATTERS[name](value, int(digits)) if digits else FORMATTERS[name](value)
+        return super().format_field(value, format_spec)
+
+
+_formatter = _TemplateFormatter()
+
+
+def _fields(template):
+    return {field.split('.')[0].split('[')[0]
+            for _, field, _, _ in _formatter.parse(template) if field}
+
+
+def _is_series(value):
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+# The context seen by one column of a bound table: sequences are indexed, scalars pass through
+class _Column(dict):
+    def __init__(self, context, index):
+        super().__init__()
+        self.context = context
+        self.index = index
+
+    def __missing__(self, name):
+        value = self.context[name]
+        return value[self.index] if _is_series(value) else value
+
+
+# A paragraph whose text never changes: its lines are broken once per frame width and shared by all copies
+class _StaticParagraph(Paragraph):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._layouts = {}
+
+    def wrap(self, availWidth, availHeight):
+        if availWidth <= 0:
+            return super().wrap(availWidth, availHeight)
+        if availWidth not in self._layouts:
+            super().wrap(availWidth, availHeight)
+            self._layouts[availWidth] = (self._wrapWidths, self.blPara, self.height)
+        self.width = availWidth
+        self._wrapWidths, self.blPara, self.height = self._layouts[availWidth]
+        return self.width, self.height
+
+
+# Copy a pre-built flowable so layout state never leaks between documents
+def _fresh(flowable):
+    if isinstance(flowable, _PrebuiltList):
+        return flowable.build()
+    return copy.copy(flowable)
+
+
+# Bullet list whose paragraphs are parsed once; each render wraps copies in a new ListFlowable
+class _PrebuiltList:
+    def __init__(self, paragraphs, left_indent):
+        self.paragraphs = paragraphs
+        self.left_indent = left_indent
+
+    def build(self):
+        return ListFlowable([ListItem(copy.copy(paragraph)) for paragraph in self.paragraphs],
+                            bulletType='bullet', bulletFontName=theme.FONTS['regular'], leftIndent=self.left_indent)
+
+
+class _Block:
+    def __init__(self, bindings, build):
+        self.bindings = bindings
+        self.build = build
+        self.prebuilt = None if bindings else build({})
+
+    @property
+    def static(self):
+        return not self.bindings
+
+    def render(self, context):
+        if self.prebuilt is not None:
+            return [_fresh(flowable) for flowable in self.prebuilt]
+        missing = self.bindings - set(context)
+        if missing:
+            raise SpecError(f"Report context is missing {', '.join(sorted(missing))}")
+        return [_fresh(flowable) for flowable in self.build(context)]
+
+
+def _style(name):
+    styles = theme.get_styles()
+    if name not in styles:
+        raise SpecError(f"Unknown paragraph style {name!r}")
+    return styles[name]
+
+
+def _text_block(template, style):
+    style = _style(style)
+    bindings = _fields(template)
+    paragraph = Paragraph if bindings else _StaticParagraph
+    return _Block(bindings, lambda context: [paragraph(_formatter.vformat(template, (), context), style)])
+
+
+def _bullets_block(items, style, left_indent):
+    style = _style(style)
+    bindings = set().union(*map(_fields, items))
+    paragraph = Paragraph if bindings else _StaticParagraph
+
+    def build(context):
+        paragraphs = [paragraph(_formatter.vformat(item, (), context), style) for item in items]
+        return [_PrebuiltList(paragraphs, left_indent)]
+    return _Block(bindings, build)
+
+
+def _table_style(options):
+    options = dict(options or {'name': 'data'})
+    name = options.pop('name', 'data')
+    if name not in TABLE_STYLES:
+        raise SpecError(f"Unknown table style {name!r}")
+    return TABLE_STYLES[name](**options)
+
+
+def _table_block(table):
+    style = _table_style(table.get('style'))
+    col_widths = [width * inch for width in table['col_widths']] if 'col_widths' in table else None
+    rows = table['rows']
+
+    # Fixed rows of literal cells
+    if 'columns' not in table:
+        return _Block(set(), lambda context: [_styled(Table(rows, colWidths=col_widths), style)])
+
+    # One column per entry of a context sequence (e.g. year labels), each row a cell template
+    columns = table['columns']
+    bindings = {columns}.union(*(_fields(row['cell']) for row in rows))
+
+    def build(context):
+        labels = list(context[columns])
+        data = [[table.get('header', '')] + labels]
+        for row in rows:
+            data.append([row['label']] + [_formatter.vformat(row['cell'], (), _Column(context, index))
+                                          for index in range(len(labels))])
+        return [_styled(Table(data, colWidths=col_widths), style)]
+    return _Block(bindings, build)
+
+
+def _styled(table, style):
+    table.setStyle(style)
+    return table
+
+
+def _references(value):
+    if isinstance(value, str):
+        return {value[1:]} if value.startswith('$') and value[1:] not in PALETTE else set()
+    if isinstance(value, list):
+        return set().union(set(), *map(_references, value))
+    if isinstance(value, dict):
+        return set().union(set(), *map(_references, value.values()))
+    return set()
+
+
+def _bind(value, context):
+    if isinstance(value, str) and value.startswith('$'):
+        name = value[1:]
+        return PALETTE[name] if name in PALETTE else context[name]
+    if isinstance(value, list):
+        return [_bind(item, context) for item in value]
+    if isinstance(value, dict):
+        return {key: _bind(item, context) for key, item in value.items()}
+    return value
+
+
+def _chart_block(block, builders):
+    if block['chart'] not in builders:
+        raise SpecError(f"Unknown chart {block['chart']!r}; known: {', '.join(sorted(builders))}")
+    function = builders[block['chart']]
+    args = block.get('args', [])
+    options = block.get('options', {})
+    bindings = _references(args) | _references(options)
+    return _Block(bindings, lambda context: [get_chart_cache().drawing(function, *_bind(args, context),
+                                                                       **_bind(options, context))])
+
+
+def _compile_block(block, builders):
+    if 'heading' in block:
+        return _text_block(block['heading'], block.get('style', 'Heading3'))
+    if 'paragraph' in block:
+        return _text_block(block['paragraph'], block.get('style', 'Normal'))
+    if 'bullets' in block:
+        return _bullets_block(block['bullets'], block.get('style', 'Normal'), block.get('left_indent', 20))
+    if 'table' in block:
+        return _table_block(block['table'])
+    if 'chart' in block:
+        return _chart_block(block, builders)
+    if 'spacer' in block:
+        return _Block(set(), lambda context: [Spacer(1, block['spacer'] * inch)])
+    if 'page_break' in block:
+        return _Block(set(), lambda context: [PageBreak()])
+    raise SpecError(f"Unknown report block with keys {', '.join(sorted(block))}")
+
+
+class ReportPlan:
+    def __init__(self, sections):
+        self.sections = sections
+
+    # Names every data-bound block of a section needs from the context
+    def bindings(self, section):
+        return set().union(set(), *(block.bindings for block in self.sections[section]))
+
+    def stats(self):
+        blocks = [block for section in self.sections.values() for block in section]
+        static = sum(block.static for block in blocks)
+        return {'sections': len(self.sections), 'blocks': len(blocks), 'static': static,
+                'bound': len(blocks) - static}
+
+    # Flowables for one section: copies of the pre-built static blocks, bound blocks evaluated against context
+    def render(self, section, context=None):
+        if section not in self.sections:
+            raise SpecError(f"Unknown report section {section!r}")
+        context = context or {}
+        return [flowable for block in self.sections[section] for flowable in block.render(context)]
+
+
+def compile_spec(spec, builders=None):
+    builders = builders or {}
+    return ReportPlan({name: [_compile_block(block, builders) for block in blocks]
+                       for name, blocks in spec['sections'].items()})
+
+
+def load_spec(path):
+    with open(path) as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Reading a YAML report spec requires PyYAML (pip install pyyaml)") from None
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+_plans = {}
+
+
+# The compiled plan for a spec file, recompiled only when the file or the theme fonts change
+def load_plan(path=DEFAULT_SPEC, builders=None):
+    path = os.path.abspath(path)
+    key = (path, os.stat(path).st_mtime_ns, tuple(theme.FONTS.values()))
+    if key not in _plans:
+        _plans[key] = compile_spec(load_spec(path), builders)
+    return _plans[key]
@@ -0,0 +1,233 @@
+# Asynchronous report-rendering service
+#
+# ReportService accepts render jobs (keyword arguments for the report
+# function) from asyncio code such as a web handler. Jobs wait in a bounded
+# queue; when it is full, submit() either waits for room or, with
+# wait=False, raises asyncio.QueueFull so the caller can shed load. A fixed
+# number of dispatcher tasks hand queued jobs to an executor (by default a
+# pool of warm worker processes, as in batch mode) and each finished job
+# keeps its PDF bytes. A job whose options match one that is already queued or
+# running is not rendered twice: the caller gets the existing job id. If a
+# worker dies (its memory cap, a crash), the service replaces its own pool and
+# retries the jobs the dead worker took down one at a time in a fresh process,
+# as batch mode does, so only the job that kills its worker fails.
+#
+# StubClient drives a service in-process with the same calls a remote client
+# would make, for local testing and the load-test script.
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from winners_circle.batch import _init_worker
+from winners_circle.output import render_to_buffer
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def job_key(options):
+    return hashlib.sha256(json.dumps(options, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _render_bytes(render, options):
+    return bytes(render_to_buffer(render, **options))
+
+
+class Job:
+    def __init__(self, job_id, key, options):
+        self.id = job_id
+        self.key = key
+        self.options = options
+        self.state = QUEUED
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.pdf = None
+        self.done = asyncio.Event()
+
+    def status(self):
+        return {
+            'id': self.id,
+            'state': self.state,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'bytes': len(self.pdf) if self.pdf is not None else None,
+            'error': self.error,
+        }
+
+
+class ReportService:
+    def __init__(self, render, workers=None, max_queue=64, executor=None, keep_jobs=1024,
+                 memory_limit_mb=None, warmup=None):
+        self.render = render
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.keep_jobs = keep_jobs
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._executor_options = (memory_limit_mb, warmup)
+        self._queue = None
+        self._dispatchers = []
+        self._jobs = OrderedDict()
+        self._in_flight = {}
+        self._ids = itertools.count(1)
+        self.deduplicated = 0
+        self.restarts = 0
+
+    def _new_executor(self, workers):
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=self._executor_options)
+
+    async def start(self):
+        if self._executor is None:
+            self._executor = self._new_executor(self.workers)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        return self
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    # Queue a job and return its id; identical in-flight jobs share one id
+    async def submit(self, options, wait=True):
+        key = job_key(options)
+        job = self._in_flight.get(key)
+        if job is not None:
+            self.deduplicated += 1
+            return job.id
+        job = Job(str(next(self._ids)), key, dict(options))
+        # Register before queueing so duplicates arriving while we wait for room are merged too
+        self._in_flight[key] = job
+        self._remember(job)
+        try:
+            if wait:
+                await self._queue.put(job)
+            else:
+                self._queue.put_nowait(job)
+        except BaseException:
+            self._in_flight.pop(key, None)
+            self._jobs.pop(job.id, None)
+            raise
+        return job.id
+
+    def _remember(self, job):
+        self._jobs[job.id] = job
+        # Forget the oldest finished jobs once more than keep_jobs are held
+        while len(self._jobs) > self.keep_jobs:
+            oldest = next(iter(self._jobs.values()))
+            if not oldest.done.is_set():
+                break
+            del self._jobs[oldest.id]
+
+    def status(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id}")
+        return job.status()
+
+    def stats(self):
+        states = [job.state for job in self._jobs.values()]
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'running': states.count(RUNNING),
+            'done': states.count(DONE),
+            'failed': states.count(FAILED),
+            'deduplicated': self.deduplicated,
+            'restarts': self.restarts,
+        }
+
+    # Wait for a job and return its PDF bytes; raises RuntimeError if the render failed
+    async def result(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id}")
+        await job.done.wait()
+        if job.state == FAILED:
+            raise RuntimeError(f"Job {job_id} failed: {job.error}")
+        return job.pdf
+
+    # Replace the pool a worker died in, once however many dispatchers saw it break
+    def _replace_executor(self, broken):
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor(self.workers)
+        self.restarts += 1
+
+    async def _render(self, job):
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, _render_bytes, self.render, job.options)
+        except BrokenProcessPool:
+            # An executor passed in is the caller's to replace
+            if not self._owns_executor:
+                raise
+        self._replace_executor(executor)
+        # Every job on the dead worker's pool lands here; alone in a fresh process, only the culprit dies again
+        isolated = self._new_executor(1)
+        try:
+            return await loop.run_in_executor(isolated, _render_bytes, self.render, job.options)
+        finally:
+            isolated.shutdown(wait=False)
+
+    async def _dispatch(self):
+        while True:
+            job = await self._queue.get()
+            job.state = RUNNING
+            job.started = time.time()
+            try:
+                job.pdf = await self._render(job)
+                job.state = DONE
+            except asyncio.CancelledError:
+                raise
+            except BrokenProcessPool as error:
+                job.state = FAILED
+                job.error = f"Worker process died: {error}"
+            except Exception as error:
+                job.state = FAILED
+                job.error = f"{type(error).__name__}: {error}"
+            finally:
+                job.finished = time.time()
+                self._in_flight.pop(job.key, None)
+                job.done.set()
+                self._queue.task_done()
+
+
+# In-process stand-in for a remote client of the service
+class StubClient:
+    def __init__(self, service):
+        self.service = service
+
+    async def request_report(self, **options):
+        return await self.service.submit(options)
+
+    async def get_status(self, job_id):
+        return self.service.status(job_id)
+
+    async def download(self, job_id):
+        return await self.service.result(job_id)
+
+    async def render(self, **options):
+        return await self.download(await self.request_report(**options))
@@ -0,0 +1,134 @@
+# Content-hashed JSON data shards for the dashboard
+#
+# write_shards() splits the data bundle (see winners_circle/exports.py) into
+# one small JSON file per dashboard chart, named by a digest of its content:
+#
+#   DIR/manifest.json                                   {"shards": {name: {"file": ..., "sha256": ..., ...}}}
+#   DIR/shards/membership-growth.<digest>.json          and .json.gz, .json.br beside it
+#
+# A shard's file name changes exactly when its content does, so a browser or
+# CDN can cache shards forever and only the manifest needs revalidating
+# (netlify.toml serves /data/shards/* as immutable; the generator writes to
+# public/data with --export-shards public/data). Each shard is also stored
+# precompressed: gzip always, and brotli when the brotli package is installed.
+# Regenerating writes only shards whose content is new and leaves the
+# manifest untouched when nothing changed; with prune=True shard files the
+# new manifest no longer lists are removed (by default they stay, for pages
+# still holding the previous manifest). Output is deterministic: the same
+# numbers give byte-identical files.
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+SHARD_VERSION = 1
+SHARDS_DIR = 'shards'
+MANIFEST = 'manifest.json'
+DIGEST_LENGTH = 16
+ENCODINGS = {'gzip': '.gz', 'br': '.br'}
+
+# Shard name -> the part of the data bundle it carries (None when the bundle has no such data)
+SHARDS = {
+    'membership-growth': lambda bundle: {'years': bundle['years'], 'membership': bundle['membership']},
+    'revenue-composition': lambda bundle: {'years': bundle['years'], 'revenue': bundle['revenue']},
+    'roi': lambda bundle: dict(bundle['roi'], years=bundle['years'],
+                               monthly_cumulative_cash_flow=bundle['monthly']['cumulative_cash_flow']),
+    'scenario-bands': lambda bundle: (dict(bundle['scenarios'], years=bundle['years'])
+                                      if bundle['scenarios'] is not None else None),
+}
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+# gzip always; brotli when it is installed
+def available_encodings():
+    return ('gzip', 'br') if _brotli() is not None else ('gzip',)
+
+
+def _compress(encoding, data):
+    if encoding == 'gzip':
+        # mtime=0 keeps the archive identical from run to run
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return _brotli().compress(data, quality=11)
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def _write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    # Readable by the web server, unlike mkstemp's private default
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+# Write the bundle's shards and manifest into directory; returns the shard names written, unchanged and removed
+def write_shards(directory, bundle, encodings=None, prune=False):
+    encodings = available_encodings() if encodings is None else tuple(encodings)
+    unknown = set(encodings) - set(ENCODINGS)
+    if unknown:
+        raise ValueError(f"Unknown shard encodings: {', '.join(sorted(unknown))}; known: {', '.join(ENCODINGS)}")
+    if 'br' in encodings and _brotli() is None:
+        raise ImportError("Brotli shards require the brotli package (pip install brotli)")
+    shard_dir = os.path.join(directory, SHARDS_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    entries = {}
+    written, unchanged = [], []
+    for name, select in SHARDS.items():
+        data = select(bundle)
+        if data is None:
+            continue
+        content = _canonical({'version': SHARD_VERSION, 'shard': name, 'data': data})
+        digest = hashlib.sha256(content).hexdigest()
+        file_name = f'{name}.{digest[:DIGEST_LENGTH]}.json'
+        entry = {'file': f'{SHARDS_DIR}/{file_name}', 'sha256': digest, 'bytes': len(content), 'encodings': {}}
+        new = False
+        variants = [(os.path.join(shard_dir, file_name), None)]
+        variants += [(os.path.join(shard_dir, file_name + ENCODINGS[encoding]), encoding) for encoding in encodings]
+        for path, encoding in variants:
+            # The digest names the content, so an existing file is already right
+            if os.path.exists(path):
+                if encoding is not None:
+                    entry['encodings'][encoding] = {'file': entry['file'] + ENCODINGS[encoding],
+                                                    'bytes': os.path.getsize(path)}
+                continue
+            payload = content if encoding is None else _compress(encoding, content)
+            _write_atomic(path, payload)
+            new = True
+            if encoding is not None:
+                entry['encodings'][encoding] = {'file': entry['file'] + ENCODINGS[encoding], 'bytes': len(payload)}
+        entries[name] = entry
+        (written if new else unchanged).append(name)
+
+    manifest = _canonical({'version': SHARD_VERSION, 'bundle_version': bundle['version'], 'shards': entries})
+    manifest_path = os.path.join(directory, MANIFEST)
+    if _read(manifest_path) != manifest:
+        _write_atomic(manifest_path, manifest)
+
+    removed = []
+    if prune:
+        keep = {os.path.basename(entry['file']) for entry in entries.values()}
+        for file_name in sorted(os.listdir(shard_dir)):
+            if file_name.split('.json')[0] + '.json' not in keep:
+                os.remove(os.path.join(shard_dir, file_name))
+                removed.append(file_name)
+    return {'written': written, 'unchanged': unchanged, 'removed': removed}
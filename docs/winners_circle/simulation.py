@@ -0,0 +1,96 @@
+# Monte Carlo scenario simulator for the Winners Circle projections
+#
+# Samples the club drivers from distributions and pushes every sample through
+# the batched projection engine in fixed-size chunks, so a million scenarios
+# run in seconds with bounded memory. The distributions describe the
+# uncertainty around the default assumptions; an overridden driver has its
+# samples shifted by (override - default), so the bands move with it.
+import time
+
+import numpy as np
+
+from winners_circle.projections import project, DEFAULT_ASSUMPTIONS
+
+# Distributions for the uncertain drivers, centred on the report's baseline values.
+# ('triangular', low, mode, high), ('uniform', low, high) or ('normal', mean, sd)
+DEFAULT_DISTRIBUTIONS = {
+    'initial_upgrade_rate': ('triangular', 0.02, 0.04, 0.06),
+    'ongoing_upgrade_rate': ('triangular', 0.01, 0.02, 0.03),
+    'initial_conversion_rate': ('triangular', 0.0025, 0.005, 0.0075),
+    'ongoing_conversion_rate': ('triangular', 0.005, 0.01, 0.015),
+    'retention_rate': ('uniform', 0.88, 0.95),
+    'accommodation_utilization': ('triangular', 0.05, 0.10, 0.15),
+    'accommodation_rate': ('normal', 300, 30),
+    'cost_escalation': ('uniform', 0.02, 0.05),
+}
+
+# Drivers that are not shares, and so are not kept within [0, 1] after shifting
+UNBOUNDED = ('accommodation_rate',)
+
+PERCENTILES = (5, 50, 95)
+
+
+# Draw n samples for every distributed driver
+def sample_assumptions(distributions, n, rng):
+    samples = {}
+    for name, (kind, *args) in distributions.items():
+        if kind == 'triangular':
+            values = rng.triangular(*args, size=n)
+        elif kind == 'uniform':
+            values = rng.uniform(*args, size=n)
+        elif kind == 'normal':
+            values = rng.normal(*args, size=n)
+        else:
+            raise ValueError(f"Unknown distribution '{kind}' for {name}")
+        samples[name] = np.maximum(values, 0.0)
+    return samples
+
+
+# Move each sampled driver the caller overrides by its distance from the default assumption
+def shift_samples(samples, assumptions):
+    for name, values in samples.items():
+        if name in assumptions:
+            values += float(assumptions[name]) - DEFAULT_ASSUMPTIONS[name]
+            np.clip(values, 0.0, None if name in UNBOUNDED else 1.0, out=values)
+    return samples
+
+
+# Run n sampled scenarios and reduce them to P5/P50/P95 bands
+def simulate(n=1_000_000, years=4, distributions=None, assumptions=None, seed=None, chunk_size=250_000):
+    if n < 1:
+        raise ValueError(f"Simulate at least one scenario, not {n}")
+    started = time.perf_counter()
+    distributions = DEFAULT_DISTRIBUTIONS if distributions is None else distributions
+    assumptions = assumptions or {}
+    rng = np.random.default_rng(seed)
+    months = years * 12
+
+    members = np.empty((n, years))
+    revenue = np.empty((n, years))
+    cumulative_cash_flow = np.empty((n, years))
+    payback = np.empty(n)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = dict(assumptions)
+        chunk.update(shift_samples(sample_assumptions(distributions, stop - start, rng), assumptions))
+        result = project(chunk, months=months, monthly=False)
+        members[start:stop] = result['members']
+        revenue[start:stop] = result['revenue']
+        cumulative_cash_flow[start:stop] = result['cumulative_cash_flow']
+        payback[start:stop] = result['payback_month']
+
+    # Scenarios that never pay back sort above every finite month
+    paid_back = np.isfinite(payback)
+    payback[~paid_back] = np.inf
+
+    return {
+        'scenarios': n,
+        'years': years,
+        'percentiles': PERCENTILES,
+        'members': np.percentile(members, PERCENTILES, axis=0),
+        'revenue': np.percentile(revenue, PERCENTILES, axis=0),
+        'cumulative_cash_flow': np.percentile(cumulative_cash_flow, PERCENTILES, axis=0),
+        'payback_month': np.percentile(payback, PERCENTILES, method='nearest'),
+        'payback_probability': paid_back.mean(),
+        'elapsed': time.perf_counter() - started,
+    }
@@ -0,0 +1,160 @@
+# Per-member credit statements
+#
+# Each member's ledger rows (see winners_circle/appendix.py) become a short
+# statement: a summary of credits granted and redeemed, the closing balance,
+# redemptions by category and the transaction history with a running
+# balance. Statements share the report's pre-built styles and are rendered
+# in memory; render_statements() spreads members over worker processes in
+# chunks and writes the PDFs into a ZIP archive as they arrive, so the
+# archive can be a file or an unseekable stream such as stdout.
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from operator import itemgetter
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+from winners_circle.appendix import LEDGER_HEADER, LEDGER_COL_WIDTHS, REDEMPTION_CATEGORIES
+from winners_circle.batch import preload_fonts
+from winners_circle.formatting import currency, percent
+from winners_circle.optimize import optimize_pdf
+from winners_circle.tables import ArrayTable
+from winners_circle.theme import data_table_style, get_styles
+
+MEMBER_DISCOUNT = 0.20
+
+
+# Group a member-sorted ledger into (member_id, [rows]) pairs
+def iter_members(ledger):
+    for member_id, entries in groupby(ledger, key=itemgetter('member_id')):
+        yield member_id, list(entries)
+
+
+def statement_flowables(member_id, entries, styles, club_name='Winners Circle Club', discount=MEMBER_DISCOUNT):
+    dates, kinds, categories, amounts, balances = [], [], [], [], []
+    granted = redeemed = balance = 0.0
+    by_category = dict.fromkeys(REDEMPTION_CATEGORIES, 0.0)
+    for entry in entries:
+        if entry['kind'] == 'grant':
+            amount = entry['amount']
+            granted += amount
+        else:
+            amount = -entry['amount']
+            redeemed += entry['amount']
+            by_category[entry['category']] = by_category.get(entry['category'], 0.0) + entry['amount']
+        balance += amount
+        dates.append(entry['date'])
+        kinds.append(entry['kind'].capitalize())
+        categories.append(entry['category'])
+        amounts.append(amount)
+        balances.append(balance)
+
+    period = f"{dates[0]} to {dates[-1]}" if dates else "No activity"
+    elements = [
+        Paragraph(f"{club_name} Member Statement", styles['Heading2']),
+        Paragraph(f"Member {member_id} &middot; {period}", styles['Normal']),
+        Spacer(1, 0.1*inch),
+    ]
+
+    summary = Table([
+        ["Credits Granted", "Credits Redeemed", "Closing Balance", f"Member Discount ({percent(discount)})"],
+        [currency(granted, 2), currency(redeemed, 2), currency(balance, 2), currency(redeemed * discount, 2)],
+    ], colWidths=[1.6*inch] * 4, style=data_table_style())
+    elements.append(summary)
+    elements.append(Spacer(1, 0.15*inch))
+
+    elements.append(Paragraph("Redemptions by Category", styles['Heading3']))
+    category_rows = [["Category", "Redeemed", "Share"]]
+    for category, value in by_category.items():
+        category_rows.append([category, currency(value, 2), percent(value / redeemed if redeemed else 0)])
+    elements.append(Table(category_rows, colWidths=[2.2*inch, 1.6*inch, 1.2*inch],
+                          style=data_table_style('RIGHT')))
+    elements.append(Spacer(1, 0.15*inch))
+
+    elements.append(Paragraph("Transaction History", styles['Heading3']))
+    elements.append(ArrayTable(
+        LEDGER_HEADER, [dates, kinds, categories, amounts, balances],
+        formats=[str, str, str, lambda value: currency(value, 2), lambda value: currency(value, 2)],
+        col_widths=LEDGER_COL_WIDTHS,
+        align=['CENTER', 'LEFT', 'LEFT', 'RIGHT', 'RIGHT'],
+    ))
+    return elements
+
+
+# Render one member's statement and return the PDF bytes, optimized at compression_level if one is given
+def render_statement(member_id, entries, club_name='Winners Circle Club', compression_level=None):
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=0.75*inch, leftMargin=0.75*inch,
+                            topMargin=0.75*inch, bottomMargin=0.75*inch,
+                            title=f"{club_name} Statement {member_id}",
+                            pageCompression=0 if compression_level is not None else None)
+    doc.build(statement_flowables(member_id, entries, get_styles(), club_name))
+    if compression_level is not None:
+        return optimize_pdf(buffer.getbuffer(), compression_level)[0]
+    return buffer.getvalue()
+
+
+def _render_chunk(members, club_name, compression_level):
+    return [(member_id, render_statement(member_id, entries, club_name, compression_level))
+            for member_id, entries in members]
+
+
+def _init_statement_worker():
+    preload_fonts()
+    get_styles()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Render a statement per member of the ledger into a ZIP written to `output` (a path or binary stream)
+def render_statements(ledger, output, workers=None, club_name='Winners Circle Club', chunk_size=100,
+                      compression=zipfile.ZIP_STORED, compression_level=None):
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(iter_members(ledger), chunk_size)
+    statements = 0
+    size = 0
+
+    with zipfile.ZipFile(output, 'w', compression=compression) as archive:
+        def write(rendered):
+            nonlocal statements, size
+            for member_id, pdf in rendered:
+                archive.writestr(f"statement-{member_id}.pdf", pdf)
+                statements += 1
+                size += len(pdf)
+
+        if workers == 1:
+            _init_statement_worker()
+            for chunk in chunks:
+                write(_render_chunk(chunk, club_name, compression_level))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_statement_worker) as executor:
+                # Keep a bounded number of chunks in flight so the ledger is never fully in memory
+                pending = []
+                for chunk in chunks:
+                    pending.append(executor.submit(_render_chunk, chunk, club_name, compression_level))
+                    if len(pending) >= workers * 2:
+                        write(pending.pop(0).result())
+                for future in pending:
+                    write(future.result())
+
+    elapsed = time.perf_counter() - started
+    return {
+        'statements': statements,
+        'bytes': size,
+        'workers': workers,
+        'elapsed': elapsed,
+        'throughput': statements / elapsed if elapsed else float('inf'),
+    }
@@ -0,0 +1,43 @@
+# Streaming document builds
+#
+# reportlab's build loop consumes its flowable list from the front, putting
+# split remainders back at the head. FlowableStream is a list that refills
+# itself from an iterator whenever the loop asks how long it is or looks
+# ahead, so a generator of any length can be laid out while only a small
+# window of flowables exists at once. Finished pages are handed to the canvas
+# as soon as they are laid out; reportlab keeps them as compressed page
+# objects until the file is saved.
+from itertools import chain, islice
+
+
+class FlowableStream(list):
+    def __init__(self, flowables, lookahead=64):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+        self._exhausted = False
+
+    def _fill(self, size):
+        missing = size - super().__len__()
+        if missing > 0 and not self._exhausted:
+            before = super().__len__()
+            self.extend(islice(self._source, missing))
+            if super().__len__() - before < missing:
+                self._exhausted = True
+
+    def __len__(self):
+        self._fill(self._lookahead)
+        return super().__len__()
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self._fill(index + 1)
+        elif isinstance(index, slice) or index < 0:
+            self._fill(self._lookahead)
+        return super().__getitem__(index)
+
+
+# Build a document from any iterable of flowables (or several, chained)
+def build_streaming(doc, *flowables, lookahead=64, **build_options):
+    doc.build(FlowableStream(chain(*flowables), lookahead=lookahead), **build_options)
+    return doc
@@ -0,0 +1,133 @@
+# Grid sweeps and one-at-a-time sensitivity for payback period and ROI
+#
+# A sweep is the cartesian product of per-assumption value lists. Work is split
+# into contiguous ranges of the flattened grid; each worker rebuilds its own
+# slice of parameter values from the axes, so only the axes and the results
+# cross process boundaries.
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from winners_circle.projections import DEFAULT_ASSUMPTIONS, project
+from winners_circle.simulation import DEFAULT_DISTRIBUTIONS
+
+
+# Parse "name=start:stop:count" (inclusive linspace) or "name=v1,v2,..." into (name, values)
+def parse_grid_axis(text):
+    name, sep, spec = text.partition('=')
+    name = name.strip()
+    if not sep or not spec:
+        raise ValueError(f"Expected NAME=START:STOP:COUNT or NAME=V1,V2,... but got '{text}'")
+    if name not in DEFAULT_ASSUMPTIONS:
+        raise ValueError(f"Unknown assumption '{name}'; valid names: {', '.join(sorted(DEFAULT_ASSUMPTIONS))}")
+    try:
+        if ':' in spec:
+            start, stop, points = spec.split(':')
+            values = np.linspace(float(start), float(stop), int(points))
+        else:
+            values = np.array([float(value) for value in spec.split(',')])
+    except ValueError:
+        raise ValueError(f"Expected NAME=START:STOP:COUNT or NAME=V1,V2,... with numbers but got '{text}'") from None
+    if not len(values):
+        raise ValueError(f"The grid axis '{text}' has no values")
+    return name, values
+
+
+# Evaluate one contiguous range of the flattened grid
+def _evaluate_range(names, axes, assumptions, months, start, stop):
+    shape = tuple(len(axis) for axis in axes)
+    indices = np.unravel_index(np.arange(start, stop), shape)
+    chunk = dict(assumptions or {})
+    for name, axis, index in zip(names, axes, indices):
+        chunk[name] = axis[index]
+    result = project(chunk, months=months, monthly=False)
+    cumulative = result['cumulative_cash_flow'][:, -1]
+    invested = result['investment'].sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = cumulative / invested
+    return start, result['payback_month'], roi
+
+
+# Run the full grid on a process pool and reshape the results onto the grid
+def run_sweep(grid, assumptions=None, years=4, workers=None, chunk_size=50_000):
+    started = time.perf_counter()
+    names = [name for name, _ in grid]
+    axes = [np.asarray(values, dtype=float) for _, values in grid]
+    shape = tuple(len(axis) for axis in axes)
+    points = int(np.prod(shape))
+    months = years * 12
+    workers = workers or os.cpu_count() or 1
+
+    payback = np.empty(points)
+    roi = np.empty(points)
+    ranges = [(start, min(start + chunk_size, points)) for start in range(0, points, chunk_size)]
+
+    def store(start, chunk_payback, chunk_roi):
+        payback[start:start + len(chunk_payback)] = chunk_payback
+        roi[start:start + len(chunk_roi)] = chunk_roi
+
+    if workers == 1 or len(ranges) == 1:
+        for start, stop in ranges:
+            store(*_evaluate_range(names, axes, assumptions, months, start, stop))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_evaluate_range, names, axes, assumptions, months, start, stop)
+                       for start, stop in ranges]
+            for future in futures:
+                store(*future.result())
+
+    elapsed = time.perf_counter() - started
+    return {
+        'names': names,
+        'axes': axes,
+        'payback_month': payback.reshape(shape),
+        'roi': roi.reshape(shape),
+        'points': points,
+        'workers': workers,
+        'elapsed': elapsed,
+        'throughput': points / elapsed if elapsed else float('inf'),
+    }
+
+
+# Low/high test values for each driver, taken from the simulation ranges
+def default_sensitivity_ranges(distributions=None):
+    ranges = {}
+    for name, (kind, *args) in (distributions or DEFAULT_DISTRIBUTIONS).items():
+        if kind == 'triangular':
+            ranges[name] = (args[0], args[2])
+        elif kind == 'uniform':
+            ranges[name] = (args[0], args[1])
+        elif kind == 'normal':
+            ranges[name] = (args[0] - 2 * args[1], args[0] + 2 * args[1])
+    return ranges
+
+
+# One-at-a-time sensitivity of payback month and ROI, sorted by ROI swing (largest first)
+def tornado(assumptions=None, years=4, ranges=None):
+    ranges = ranges or default_sensitivity_ranges()
+    names = list(ranges)
+    base = dict(DEFAULT_ASSUMPTIONS)
+    base.update(assumptions or {})
+
+    # Row 0 is the baseline, then a low and a high row per driver, all in one batch
+    batch = {name: np.full(1 + 2 * len(names), float(value)) for name, value in base.items()}
+    for i, name in enumerate(names):
+        batch[name][1 + 2 * i], batch[name][2 + 2 * i] = ranges[name]
+    result = project(batch, months=years * 12, monthly=False)
+    roi = result['cumulative_cash_flow'][:, -1] / result['investment'].sum(axis=1)
+    payback = result['payback_month']
+
+    rows = []
+    for i, name in enumerate(names):
+        low, high = 1 + 2 * i, 2 + 2 * i
+        rows.append({
+            'name': name,
+            'low_value': ranges[name][0],
+            'high_value': ranges[name][1],
+            'roi': (roi[low], roi[high]),
+            'payback_month': (payback[low], payback[high]),
+        })
+    rows.sort(key=lambda row: abs(row['roi'][1] - row['roi'][0]), reverse=True)
+    return {'baseline_roi': roi[0], 'baseline_payback_month': payback[0], 'rows': rows}
@@ -0,0 +1,116 @@
+# Large tables drawn straight from NumPy arrays
+#
+# ArrayTable is a flowable for tables with thousands of rows. Cells are only
+# formatted when their row is drawn, every row has the same height so layout
+# is arithmetic, and a split hands each page a view (start/stop) onto the
+# same column arrays. Building, splitting and drawing are therefore linear
+# in the number of rows. The header repeats on every page, body rows are
+# zebra-striped, and an optional total row closes the last page; all of it
+# is drawn directly on the canvas rather than through per-cell TableStyle
+# commands.
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+
+from winners_circle.theme import FONTS, PRIMARY_COLOR, LIGHT_COLOR
+
+
+class ArrayTable(Flowable):
+    def __init__(self, header, columns, formats=None, col_widths=None, align=None, total_row=None,
+                 row_height=15, header_height=20, font_size=8, start=0, stop=None):
+        super().__init__()
+        self.header = list(header)
+        self.columns = columns
+        self.formats = formats or [str] * len(columns)
+        self.col_widths = col_widths
+        self.align = align or ['CENTER'] + ['RIGHT'] * (len(columns) - 1)
+        self.total_row = total_row
+        self.row_height = row_height
+        self.header_height = header_height
+        self.font_size = font_size
+        self.start = start
+        self.stop = len(columns[0]) if stop is None else stop
+
+    def _part(self, start, stop, total_row):
+        return ArrayTable(self.header, self.columns, self.formats, self.col_widths, self.align, total_row,
+                          self.row_height, self.header_height, self.font_size, start, stop)
+
+    def _body_rows(self):
+        return self.stop - self.start + (1 if self.total_row is not None else 0)
+
+    def wrap(self, availWidth, availHeight):
+        if self.col_widths is None:
+            self.col_widths = [availWidth / len(self.columns)] * len(self.columns)
+        self.width = sum(self.col_widths)
+        self.height = self.header_height + self._body_rows() * self.row_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fit = int((availHeight - self.header_height) // self.row_height)
+        rows = self.stop - self.start
+        if fit < 1 or fit >= self._body_rows():
+            return []
+        # Keep at least one data row together with the total row
+        if fit >= rows:
+            fit = rows - 1
+            if fit < 1:
+                return []
+        middle = self.start + fit
+        return [self._part(self.start, middle, None), self._part(middle, self.stop, self.total_row)]
+
+    def _draw_row(self, canv, cells, top, height, font):
+        canv.setFont(font, self.font_size)
+        baseline = top - height / 2 - self.font_size * 0.35
+        x = 0
+        for text, width, align in zip(cells, self.col_widths, self.align):
+            if align == 'RIGHT':
+                canv.drawRightString(x + width - 6, baseline, text)
+            elif align == 'LEFT':
+                canv.drawString(x + 6, baseline, text)
+            else:
+                canv.drawCentredString(x + width / 2, baseline, text)
+            x += width
+
+    def draw(self):
+        canv = self.canv
+        top = self.height
+
+        # Header
+        canv.setFillColor(PRIMARY_COLOR)
+        canv.rect(0, top - self.header_height, self.width, self.header_height, stroke=0, fill=1)
+        canv.setFillColor(colors.white)
+        self._draw_row(canv, self.header, top, self.header_height, FONTS['bold'])
+        top -= self.header_height
+
+        # Zebra stripes first, then the text of every row
+        canv.setFillColor(LIGHT_COLOR)
+        for offset, row in enumerate(range(self.start, self.stop)):
+            if row % 2:
+                canv.rect(0, top - (offset + 1) * self.row_height, self.width, self.row_height, stroke=0, fill=1)
+        canv.setFillColor(colors.black)
+        formats = self.formats
+        for offset, row in enumerate(range(self.start, self.stop)):
+            cells = [format_value(column[row]) for column, format_value in zip(self.columns, formats)]
+            self._draw_row(canv, cells, top - offset * self.row_height, self.row_height, FONTS['regular'])
+        body_bottom = top - (self.stop - self.start) * self.row_height
+
+        if self.total_row is not None:
+            canv.setFillColor(colors.lightgrey)
+            canv.rect(0, body_bottom - self.row_height, self.width, self.row_height, stroke=0, fill=1)
+            canv.setFillColor(colors.black)
+            self._draw_row(canv, self.total_row, body_bottom, self.row_height, FONTS['bold'])
+            body_bottom -= self.row_height
+
+        # Grid: one line per row and per column boundary
+        canv.setStrokeColor(colors.lightgrey)
+        canv.setLineWidth(0.5)
+        y = self.height
+        lines = [(0, y, self.width, y), (0, body_bottom, self.width, body_bottom)]
+        y -= self.header_height
+        while y > body_bottom + 0.01:
+            lines.append((0, y, self.width, y))
+            y -= self.row_height
+        x = 0
+        for width in [0] + self.col_widths:
+            x += width
+            lines.append((x, body_bottom, x, self.height))
+        canv.lines(lines)
@@ -0,0 +1,253 @@
+# Shared colours, paragraph styles and table styles for Winners Circle documents
+#
+# Styles are built once per process and shared by every report and thread.
+# The stylesheet is a read-only mapping and table styles reject new commands;
+# to customise a paragraph style, clone it (styles['Normal'].clone('Mine', ...)).
+#
+# Every style, table and chart takes its faces from FONTS. By default these
+# are the standard Helvetica faces, which viewers supply and PDFs do not
+# embed; register_brand_fonts() swaps in TrueType brand faces, which reportlab
+# embeds as subsets holding only the glyphs a document uses.
+import functools
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+from winners_circle.profiler import span
+
+# Define colors to match Winners Circle site style
+PRIMARY_COLOR = colors.HexColor('#0284c7')  # primary-600
+DARK_BROWN = colors.HexColor('#5A3E00')
+BACKGROUND_COLOR = colors.HexColor('#D8D1AE')
+SECONDARY_COLOR = colors.HexColor('#0ea5e9')  # primary-500
+ACCENT_COLOR = colors.HexColor('#7dd3fc')  # primary-300
+LIGHT_COLOR = colors.HexColor('#f0f9ff')  # primary-50
+
+# Font faces used by the report; see register_brand_fonts(). Chart axis labels and legends keep
+# reportlab's default face unless brand fonts are registered.
+DEFAULT_FONTS = {'regular': 'Helvetica', 'bold': 'Helvetica-Bold', 'italic': 'Helvetica-Oblique',
+                 'chart': 'Times-Roman'}
+FONTS = dict(DEFAULT_FONTS)
+
+
+# A TableStyle whose command list can no longer be extended
+class FrozenTableStyle(TableStyle):
+    def __init__(self, cmds=None, parent=None, **kw):
+        super().__init__(cmds, parent, **kw)
+        self._cmds = tuple(self._cmds)
+
+    def add(self, *cmd):
+        raise TypeError("Shared table styles are read-only; derive a new TableStyle(parent=...) instead")
+
+    def getCommands(self):
+        return list(self._cmds)
+
+
+# Build the report stylesheet from scratch (uncached)
+def build_stylesheet():
+    styles = getSampleStyleSheet()
+
+    # Modify existing styles
+    styles['Title'].fontName = FONTS['bold']
+    styles['Title'].fontSize = 24
+    styles['Title'].textColor = DARK_BROWN
+    styles['Title'].spaceAfter = 24
+    styles['Title'].alignment = TA_CENTER
+
+    # Customize Subtitle style
+    styles.add(ParagraphStyle(
+        name='WC_Subtitle',
+        parent=styles['Heading2'],
+        fontName=FONTS['regular'],
+        fontSize=18,
+        textColor=PRIMARY_COLOR,
+        spaceAfter=12,
+        alignment=TA_CENTER
+    ))
+
+    # Modify Heading2 style
+    styles['Heading2'].fontName = FONTS['bold']
+    styles['Heading2'].fontSize = 16
+    styles['Heading2'].textColor = DARK_BROWN
+    styles['Heading2'].spaceBefore = 12
+    styles['Heading2'].spaceAfter = 8
+
+    # Modify Heading3 style
+    styles['Heading3'].fontName = FONTS['bold']
+    styles['Heading3'].fontSize = 14
+    styles['Heading3'].textColor = PRIMARY_COLOR
+    styles['Heading3'].spaceBefore = 10
+    styles['Heading3'].spaceAfter = 6
+
+    # Modify Normal style
+    styles['Normal'].fontName = FONTS['regular']
+    styles['Normal'].fontSize = 11
+    styles['Normal'].textColor = colors.black
+    styles['Normal'].alignment = TA_JUSTIFY
+    styles['Normal'].spaceBefore = 6
+    styles['Normal'].spaceAfter = 6
+
+    # Add Emphasis style
+    styles.add(ParagraphStyle(
+        name='Emphasis',
+        parent=styles['Normal'],
+        fontName=FONTS['bold'],
+        fontSize=11,
+        textColor=DARK_BROWN
+    ))
+
+    # Add Quote style
+    styles.add(ParagraphStyle(
+        name='Quote',
+        parent=styles['Normal'],
+        fontName=FONTS['italic'],
+        fontSize=12,
+        textColor=PRIMARY_COLOR,
+        leftIndent=20,
+        rightIndent=20,
+        spaceBefore=12,
+        spaceAfter=12
+    ))
+
+    # Add Caption style
+    styles.add(ParagraphStyle(
+        name='Caption',
+        parent=styles['Normal'],
+        fontName=FONTS['italic'],
+        fontSize=10,
+        textColor=colors.darkgray,
+        alignment=TA_CENTER,
+        spaceBefore=4,
+        spaceAfter=16
+    ))
+
+    return styles
+
+
+# The shared stylesheet, as a read-only name -> ParagraphStyle mapping
+@functools.lru_cache(maxsize=None)
+def get_styles():
+    with span('styles', 'phase'):
+        stylesheet = build_stylesheet()
+    return MappingProxyType({name: stylesheet[name] for name in stylesheet.byName})
+
+
+# Header-row table used for every projection table in the report
+@functools.lru_cache(maxsize=None)
+def data_table_style(body_align='CENTER', total_row=False, total_column=False,
+                     header_font_size=None, header_padding=8):
+    commands = [
+        ('FONT', (0, 0), (-1, -1), FONTS['regular']),
+        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONT', (0, 0), (-1, 0), FONTS['bold']),
+    ]
+    if header_font_size:
+        commands.append(('FONTSIZE', (0, 0), (-1, 0), header_font_size))
+    commands += [
+        ('BOTTOMPADDING', (0, 0), (-1, 0), header_padding),
+        ('ALIGN', (1, 1), (-1, -1), body_align),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BACKGROUND', (0, 1), (0, -1), LIGHT_COLOR),
+    ]
+    if total_column:
+        commands.append(('BACKGROUND', (-1, 1), (-1, -1), colors.lightgrey))
+    if total_row:
+        commands += [
+            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+            ('FONT', (0, -1), (-1, -1), FONTS['bold']),
+        ]
+    return FrozenTableStyle(commands)
+
+
+@functools.lru_cache(maxsize=None)
+def toc_table_style():
+    return FrozenTableStyle([
+        ('TEXTCOLOR', (0, 0), (-1, -1), DARK_BROWN),
+        ('FONT', (0, 0), (-1, -1), FONTS['regular']),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+    ])
+
+
+@functools.lru_cache(maxsize=None)
+def resource_table_style():
+    return FrozenTableStyle([
+        ('FONT', (0, 0), (-1, -1), FONTS['regular']),
+        ('BACKGROUND', (0, 0), (-1, 0), PRIMARY_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONT', (0, 0), (-1, 0), FONTS['bold']),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BACKGROUND', (0, -1), (-1, -1), LIGHT_COLOR),
+        ('FONT', (0, -1), (-1, -1), FONTS['bold']),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('WORDWRAP', (0, 0), (-1, -1), True),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ])
+
+
+@functools.lru_cache(maxsize=None)
+def timeline_table_style():
+    return FrozenTableStyle([
+        ('FONT', (0, 0), (-1, -1), FONTS['regular']),
+        ('BACKGROUND', (0, 0), (0, -1), PRIMARY_COLOR),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        ('FONT', (0, 0), (0, -1), FONTS['bold']),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ])
+
+
+# Use TrueType faces (paths to .ttf files) instead of Helvetica; bold and italic default to the regular face.
+# Fonts are registered process-wide; batch and statement workers started afterwards inherit them.
+def register_brand_fonts(regular, bold=None, italic=None, family='Brand'):
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    faces = {'regular': regular, 'bold': bold or regular, 'italic': italic or regular}
+    names = {face: f"{family}-{face.capitalize()}" for face in faces}
+    for face, path in faces.items():
+        pdfmetrics.registerFont(TTFont(names[face], path))
+    # Lets <b> and <i> markup in paragraphs find the brand faces
+    pdfmetrics.registerFontFamily(names['regular'], normal=names['regular'], bold=names['bold'],
+                                  italic=names['italic'], boldItalic=names['bold'])
+    _use_fonts(dict(names, chart=names['regular']))
+
+
+# Go back to the standard Helvetica faces
+def reset_fonts():
+    _use_fonts(DEFAULT_FONTS)
+
+
+def _use_fonts(names):
+    if names == FONTS:
+        return
+    FONTS.update(names)
+    for cached in (get_styles, data_table_style, toc_table_style, resource_table_style, timeline_table_style):
+        cached.cache_clear()
+
+
+# Build every shared style up front, e.g. in a batch worker initializer
+def warm_theme():
+    get_styles()
+    toc_table_style()
+    resource_table_style()
+    timeline_table_style()
+    for body_align in ('CENTER', 'RIGHT'):
+        for total_row in (False, True):
+            data_table_style(body_align, total_row=total_row)
+    data_table_style(total_column=True)
+    data_table_style(header_font_size=11, header_padding=10)
@@ -0,0 +1,179 @@
+# Table of contents, PDF outline and internal links
+#
+# ReportDocTemplate watches Heading2 and Heading3 paragraphs as they are laid
+# out: each becomes a named destination and an outline (bookmark) entry,
+# nested by level, and its page number is recorded.
+#
+# TableOfContents lists the Heading2 paragraphs that follow it in the
+# flowable list (collect_toc_entries() finds them before the build) and links
+# each row to its heading. The page numbers are not known yet when the TOC
+# page is drawn, so each one is drawn as a reference to a PDF form XObject
+# that the document defines after the last page, once every heading has been
+# placed. The TOC's size depends only on its titles, so the page numbers
+# can never move the layout: the usual second pass to settle them is
+# replaced by writing one small form per entry.
+#
+# When profiling (winners_circle/profiler.py), layout time is split into a
+# span per Heading2 chapter, followed by the PDF write.
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Table
+
+from winners_circle.profiler import span
+from winners_circle.theme import DARK_BROWN, FONTS, toc_table_style
+
+HEADING_LEVELS = {'Heading2': 0, 'Heading3': 1}
+TOC_COL_WIDTHS = (5*inch, 0.5*inch)
+TOC_FONT_SIZE = 11
+# toc_table_style sets the font size but keeps the default cell leading
+TOC_LEADING = 12
+
+
+def _heading_level(flowable):
+    if not isinstance(flowable, Paragraph):
+        return None
+    return HEADING_LEVELS.get(flowable.style.name)
+
+
+def _page_form(key):
+    return f"toc-page-{key}"
+
+
+# Page number cell: draws the form that will hold the heading's page number
+class _PageNumber(Flowable):
+    def __init__(self, key):
+        super().__init__()
+        self.key = key
+
+    def wrap(self, availWidth, availHeight):
+        # Same height as a one-line text cell, so rows match a table of plain strings
+        return 0, TOC_LEADING
+
+    def draw(self):
+        self.canv.doForm(_page_form(self.key))
+
+
+class TableOfContents(Flowable):
+    def __init__(self, col_widths=TOC_COL_WIDTHS):
+        super().__init__()
+        self.col_widths = list(col_widths)
+        self.hAlign = 'CENTER'
+        self.entries = []
+        self._table = None
+
+    # Start over, e.g. in a copy of a TOC laid out by an earlier build; the old list is left to that build
+    def clear(self):
+        self.entries = []
+        self._table = None
+
+    def add_entry(self, title, key):
+        self.entries.append((title, key))
+        self._table = None
+
+    def table(self):
+        if self._table is None:
+            rows = [[title, _PageNumber(key)] for title, key in self.entries] or [['', '']]
+            self._table = Table(rows, colWidths=self.col_widths)
+            self._table.setStyle(toc_table_style())
+        return self._table
+
+    def wrap(self, availWidth, availHeight):
+        self.width, self.height = self.table().wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    # A TOC longer than the page continues as plain table pieces, without row links
+    def split(self, availWidth, availHeight):
+        return self.table().split(availWidth, availHeight)
+
+    def draw(self):
+        table = self.table()
+        table.drawOn(self.canv, 0, 0)
+        rows = table._rowpositions
+        for (title, key), top, bottom in zip(self.entries, rows, rows[1:]):
+            self.canv.linkRect('', key, (0, bottom, self.width, top), relative=1, thickness=0)
+
+
+# Give every TableOfContents in flowables an entry per Heading2 paragraph that follows it (and no others)
+def collect_toc_entries(flowables):
+    tocs = []
+    headings = 0
+    for flowable in flowables:
+        if isinstance(flowable, TableOfContents):
+            flowable.clear()
+            tocs.append(flowable)
+        elif tocs and _heading_level(flowable) == 0:
+            key = getattr(flowable, '_toc_key', None) or f"toc-{headings}"
+            flowable._toc_key = key
+            headings += 1
+            for toc in tocs:
+                toc.add_entry(flowable.getPlainText(), key)
+    return tocs
+
+
+class ReportDocTemplate(SimpleDocTemplate):
+    _chapter = None
+
+    def beforeDocument(self):
+        self.heading_pages = {}
+        self._headings = 0
+        self._outline_level = -1
+        self._toc_keys = []
+        self.canv.showOutline()
+
+    def _end_chapter(self):
+        if self._chapter is not None:
+            self._chapter.__exit__(None, None, None)
+            self._chapter = None
+
+    def afterFlowable(self, flowable):
+        level = _heading_level(flowable)
+        if level is None:
+            return
+        key = getattr(flowable, '_toc_key', None)
+        if key is None:
+            key = flowable._toc_key = f"heading-{self._headings}"
+            self._multiBuildEdits((delattr, flowable, '_toc_key'))
+        else:
+            self._toc_keys.append(key)
+        self._headings += 1
+        # The frame's cursor sits below the heading and its spaceAfter
+        top = self.frame._y + flowable.getSpaceAfter() + flowable.height
+        self.canv.bookmarkPage(key, fit='XYZ', top=top)
+        # Outline levels may only deepen one step at a time
+        level = min(level, self._outline_level + 1)
+        self.canv.addOutlineEntry(flowable.getPlainText(), key, level=level, closed=level == 0)
+        self._outline_level = level
+        self.heading_pages[key] = self.page
+        if level == 0:
+            self._end_chapter()
+            self._chapter = span(flowable.getPlainText(), 'layout')
+            self._chapter.__enter__()
+
+    # Define the page number forms the TOC refers to, now that every listed heading is placed
+    def _define_page_numbers(self):
+        for key in self._toc_keys:
+            self.canv.beginForm(_page_form(key), lowerx=0, lowery=-TOC_FONT_SIZE, upperx=TOC_COL_WIDTHS[1],
+                                uppery=TOC_LEADING + TOC_FONT_SIZE)
+            self.canv.setFont(FONTS['regular'], TOC_FONT_SIZE)
+            self.canv.setFillColor(DARK_BROWN)
+            # Baseline of a bottom-aligned one-line cell of the TOC table
+            self.canv.drawString(0, TOC_LEADING - TOC_FONT_SIZE, str(self.heading_pages[key]))
+            self.canv.endForm()
+
+    # Flowables may be laid out again by a later build (the build graph keeps them in memory), so the marks
+    # layout leaves on them (postponement, keepWithNext, heading keys) are recorded as reportlab's multiBuild
+    # does and undone afterwards
+    def build(self, flowables, **options):
+        self._doSave = 0
+        edits = []
+        self._multiBuildEdits = edits.append
+        with span('layout', 'phase'):
+            try:
+                super().build(flowables, **options)
+            finally:
+                self._end_chapter()
+                for edit in reversed(edits):
+                    edit[0](*edit[1:])
+                del self._multiBuildEdits
+        self._define_page_numbers()
+        with span('write', 'phase'):
+            self.canv.save()
@@ -0,0 +1,139 @@
+# Pre-forked warm report server
+#
+# serve() runs a warm-up (imports, styles, fonts, a first report) once, binds
+# a Unix socket and forks a fixed number of workers from that warm process.
+# Each worker accepts connections on the shared socket and answers them one
+# after another. A request is a command line: the worker moves to the
+# client's working directory, runs handle(argv) with stdout and stderr
+# captured, moves back, and sends back the exit code and both outputs. Only
+# the socket's owner may connect. Workers inherit the loaded modules and the
+# warm chart and build caches copy-on-write, so a request pays only for its
+# own rendering. A worker exits after max_requests
+# requests, which bounds memory growth, and the server forks a fresh one
+# from the warm image.
+#
+# request_report() is the client, behind the generator's --server option. It
+# imports nothing heavy, so the client process starts as fast as Python does.
+#
+# Wire format: the request is one JSON line {"argv": [...], "cwd": "..."};
+# the reply is one JSON line {"code": 0, "stdout": n, "stderr": m} followed
+# by n bytes of stdout and m bytes of stderr.
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+
+
+# Run handle(argv) as if it were the whole process: return its exit code and what it printed
+def _run(handle, argv):
+    stdout = io.TextIOWrapper(io.BytesIO(), write_through=True)
+    stderr = io.TextIOWrapper(io.BytesIO(), write_through=True)
+    code = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            handle(argv)
+        except SystemExit as exit:
+            if isinstance(exit.code, int):
+                code = exit.code
+            elif exit.code is not None:
+                print(exit.code, file=sys.stderr)
+                code = 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    return code, stdout.buffer.getvalue(), stderr.buffer.getvalue()
+
+
+def _answer(connection, handle):
+    request = json.loads(connection.makefile('rb').readline())
+    # Back to the server's directory afterwards, so a relative path never resolves against an earlier client's
+    previous = os.getcwd()
+    os.chdir(request['cwd'])
+    try:
+        code, out, err = _run(handle, request['argv'])
+    finally:
+        os.chdir(previous)
+    header = json.dumps({'code': code, 'stdout': len(out), 'stderr': len(err)}).encode() + b'\n'
+    connection.sendall(header + out + err)
+
+
+def _worker(listener, handle, max_requests):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        for _ in range(max_requests):
+            connection, _ = listener.accept()
+            with connection:
+                try:
+                    _answer(connection, handle)
+                except (OSError, ValueError):
+                    # The client went away or sent garbage; serve the next one
+                    continue
+    finally:
+        os._exit(0)
+
+
+def _stop(signum, frame):
+    raise SystemExit(0)
+
+
+# Warm up, then serve requests on a Unix socket from pre-forked workers until interrupted or terminated
+def serve(path, handle, workers=1, warmup=None, max_requests=100):
+    if warmup is not None:
+        warmup()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Bind under a temporary name and rename, so the socket only appears once it accepts connections
+    pending = f"{path}.{os.getpid()}"
+    # Only the owner may connect: a request runs with the server's permissions, in any directory it names
+    umask = os.umask(0o077)
+    try:
+        listener.bind(pending)
+    finally:
+        os.umask(umask)
+    listener.listen(64)
+    os.replace(pending, path)
+    signal.signal(signal.SIGTERM, _stop)
+    print(f"Report server ready on {path} with {workers} workers", flush=True)
+
+    children = set()
+    try:
+        while True:
+            while len(children) < workers:
+                pid = os.fork()
+                if pid == 0:
+                    _worker(listener, handle, max_requests)
+                children.add(pid)
+            pid, _ = os.wait()
+            children.discard(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        for pid in children:
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
+        listener.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+# Run a command line on the server at path, relaying its output; returns the exit code
+def request_report(path, argv, cwd=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        request = {'argv': list(argv), 'cwd': cwd or os.getcwd()}
+        connection.sendall(json.dumps(request).encode() + b'\n')
+        connection.shutdown(socket.SHUT_WR)
+        reply = connection.makefile('rb')
+        header = json.loads(reply.readline())
+        sys.stdout.buffer.write(reply.read(header['stdout']))
+        sys.stdout.flush()
+        sys.stderr.buffer.write(reply.read(header['stderr']))
+        sys.stderr.flush()
+    return header['code']
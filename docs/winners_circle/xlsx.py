@@ -0,0 +1,176 @@
+# Streaming XLSX writer
+#
+# Writes an Office Open XML workbook with nothing but the standard library.
+# Rows go straight into their sheet's deflated ZIP entry as they are
+# appended, with strings stored inline rather than in a shared string table,
+# so memory stays flat however long a sheet grows. One sheet is written at a
+# time; the parts that list the sheets are written when the workbook closes.
+# Cells take a format name from CELL_FORMATS, matching how the report prints
+# counts, currency and percentages.
+import math
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+# Format name -> index into the cellXfs of STYLES
+CELL_FORMATS = {None: 0, 'header': 1, 'count': 2, 'currency': 3, 'percent': 4}
+STYLE_ATTRIBUTES = {name: f' s="{index}"' if index else '' for name, index in CELL_FORMATS.items()}
+FLUSH_ROWS = 512
+MAX_SHEET_NAME = 31
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+STYLES = XML_DECLARATION + f'''<styleSheet xmlns="{MAIN_NS}">
+<numFmts count="2"><numFmt numFmtId="164" formatCode="&quot;$&quot;#,##0;&quot;$&quot;\\(#,##0\\)"/><numFmt numFmtId="165" formatCode="0.0%"/></numFmts>
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="5">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>
+<xf numFmtId="3" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+</cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>'''
+
+
+def column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+# One cell; opening is its start tag up to the closing '>' (reference and style attributes)
+def _cell(opening, value):
+    if type(value) is float or type(value) is int:
+        # Spreadsheets have no NaN or infinity; such cells are left empty
+        return f'{opening}><v>{value!r}</v></c>' if math.isfinite(value) else ''
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return f'{opening} t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+    if isinstance(value, bool):
+        return f'{opening} t="b"><v>{int(value)}</v></c>'
+    return _cell(opening, float(value))
+
+
+class Sheet:
+    def __init__(self, workbook, number, name, widths=None):
+        self.name = name
+        self.rows = 0
+        self._stream = workbook._archive.open(f'xl/worksheets/sheet{number}.xml', 'w', force_zip64=True)
+        self._pending = []
+        self._letters = []
+        columns = ''
+        if widths:
+            columns = '<cols>' + ''.join(f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+                                         for index, width in enumerate(widths, start=1)) + '</cols>'
+        self._write(f'{XML_DECLARATION}<worksheet xmlns="{MAIN_NS}">{columns}<sheetData>')
+
+    def _write(self, text):
+        self._stream.write(text.encode('utf-8'))
+
+    def _flush(self):
+        self._write(''.join(self._pending))
+        self._pending = []
+
+    # Append one row; formats holds a CELL_FORMATS name per column (or one name for every column)
+    def append(self, values, formats=None):
+        self.rows += 1
+        row = self.rows
+        if len(self._letters) < len(values):
+            self._letters = [column_letter(index) for index in range(len(values))]
+        if formats is None or isinstance(formats, str):
+            formats = [formats] * len(values)
+        cells = ''.join([_cell(f'<c r="{letter}{row}"{STYLE_ATTRIBUTES[format_name]}', value)
+                         for letter, value, format_name in zip(self._letters, values, formats)])
+        self._pending.append(f'<row r="{row}">{cells}</row>')
+        if len(self._pending) >= FLUSH_ROWS:
+            self._flush()
+
+    # Append one row per position of equally long columns (lists or NumPy arrays), FLUSH_ROWS at a time
+    def append_columns(self, columns, formats=None):
+        for start in range(0, len(columns[0]), FLUSH_ROWS):
+            chunk = [column[start:start + FLUSH_ROWS] for column in columns]
+            for values in zip(*(column.tolist() if hasattr(column, 'tolist') else column for column in chunk)):
+                self.append(values, formats)
+
+    def close(self):
+        if self._stream is None:
+            return
+        self._flush()
+        self._write('</sheetData></worksheet>')
+        self._stream.close()
+        self._stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StreamingWorkbook:
+    def __init__(self, target, compresslevel=6):
+        self._archive = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self._sheets = []
+
+    # Start the next sheet, closing the previous one; ZIP entries are written one at a time
+    def sheet(self, name, widths=None):
+        name = name[:MAX_SHEET_NAME]
+        if any(sheet.name == name for sheet in self._sheets):
+            raise ValueError(f"Workbook already has a sheet named {name!r}")
+        if self._sheets:
+            self._sheets[-1].close()
+        self._sheets.append(Sheet(self, len(self._sheets) + 1, name, widths))
+        return self._sheets[-1]
+
+    def close(self):
+        if self._archive is None:
+            return
+        if not self._sheets:
+            self.sheet('Sheet1')
+        self._sheets[-1].close()
+        numbers = range(1, len(self._sheets) + 1)
+        self._archive.writestr('[Content_Types].xml', XML_DECLARATION + (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{CONTENT_TYPE}sheet.main+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{CONTENT_TYPE}styles+xml"/>'
+            + ''.join(f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+                      f'ContentType="{CONTENT_TYPE}worksheet+xml"/>' for number in numbers)
+            + '</Types>'))
+        self._archive.writestr('_rels/.rels', XML_DECLARATION + (
+            f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NS}">'
+            f'<Relationship Id="rId1" Type="{RELATIONSHIPS_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'))
+        self._archive.writestr('xl/workbook.xml', XML_DECLARATION + (
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{RELATIONSHIPS_NS}"><sheets>'
+            + ''.join(f'<sheet name={quoteattr(sheet.name)} sheetId="{number}" r:id="rId{number}"/>'
+                      for number, sheet in zip(numbers, self._sheets))
+            + '</sheets></workbook>'))
+        self._archive.writestr('xl/_rels/workbook.xml.rels', XML_DECLARATION + (
+            f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NS}">'
+            + ''.join(f'<Relationship Id="rId{number}" Type="{RELATIONSHIPS_NS}/worksheet" '
+                      f'Target="worksheets/sheet{number}.xml"/>' for number in numbers)
+            + f'<Relationship Id="rId{len(self._sheets) + 1}" Type="{RELATIONSHIPS_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'))
+        self._archive.writestr('xl/styles.xml', STYLES)
+        self._archive.close()
+        self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()